@@ -0,0 +1,512 @@
+"""
+Generates a synthetic root directory with about as many data files as the game has, entirely
+offline, so that cbpickaxe can be benchmarked without a copy of the game.
+
+The root has monster forms (with tape upgrade and evolution sub-resources), moves, items and
+elemental types as ".tres" files, compiled ".scn" animations with their sprite sheets and
+".import" files, and ".translation" files for several locales. The same seed always generates
+the same files.
+
+Example:
+
+    python benchmarks/corpus.py --output_directory /tmp/cbpickaxe_corpus
+"""
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+import argparse
+import hashlib
+import pathlib
+import random
+import shutil
+import sys
+
+import PIL.Image
+
+import godot_writer
+
+SUCCESS = 0
+FAILURE = 1
+
+OFFICIAL_ROOT_NAME = "cassette_beasts"
+MOD_ROOT_NAME = "benchmark_mod"
+
+ELEMENTAL_TYPE_NAMES = [
+    "air",
+    "astral",
+    "beast",
+    "earth",
+    "fire",
+    "glass",
+    "glitter",
+    "ice",
+    "lightning",
+    "metal",
+    "plant",
+    "plastic",
+    "poison",
+    "water",
+]
+
+# Name and number of frames of each animation of a monster
+ANIMATIONS = [("idle", 6), ("attack", 8), ("hurt", 4), ("windup", 4)]
+FRAME_SIZE = 64
+
+NUM_ITEM_ICONS = 50
+
+# Words that translations are made up of, per locale, so that each locale has different lengths
+# and non-ASCII characters like the real translations
+WORDS = {
+    "en": ["swift", "fire", "strike", "tape", "beast", "guard", "blast", "wave"],
+    "de": ["schnell", "Feuer", "Schlag", "Kassette", "Bestie", "Wächter", "Druck"],
+    "ja": ["はやい", "ほのお", "こうげき", "テープ", "けもの", "まもり", "なみ"],
+    "pt_BR": ["rápido", "fogo", "golpe", "fita", "fera", "guarda", "explosão"],
+}
+
+
+@dataclass(frozen=True)
+class CorpusSize:
+    """
+    How many of each kind of file to generate. Defaults are about the size of the game.
+    """
+
+    monster_forms: int = 150
+    moves: int = 500
+    items: int = 700
+    locales: Tuple[str, ...] = ("en", "de", "ja")
+
+    def scaled(self, scale: float) -> "CorpusSize":
+        """
+        Returns a size with the given multiple of each kind of data file.
+        """
+        return CorpusSize(
+            monster_forms=max(1, round(self.monster_forms * scale)),
+            moves=max(1, round(self.moves * scale)),
+            items=max(1, round(self.items * scale)),
+            locales=self.locales,
+        )
+
+
+def main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser()
+
+    parser.add_argument("--output_directory", required=True)
+    parser.add_argument(
+        "--scale",
+        type=float,
+        default=1.0,
+        help="Multiple of the size of the game to generate (ex. 0.1 for a tenth as many files)",
+    )
+    parser.add_argument("--locales", nargs="+", default=list(CorpusSize.locales))
+    parser.add_argument("--seed", type=int, default=0)
+
+    args = parser.parse_args(argv)
+
+    size = CorpusSize(locales=tuple(args.locales)).scaled(args.scale)
+    for locale in size.locales:
+        if locale not in WORDS:
+            print(f"Unsupported locale: {locale}. Supported: {', '.join(WORDS)}")
+            return FAILURE
+
+    generate_corpus(pathlib.Path(args.output_directory), size, args.seed)
+
+    print(
+        f"Generated {size.monster_forms} monster forms, {size.moves} moves and {size.items} items in: {args.output_directory}"
+    )
+
+    return SUCCESS
+
+
+def generate_corpus(directory: pathlib.Path, size: CorpusSize, seed: int = 0) -> None:
+    """
+    Generates the roots of a synthetic corpus of the given size in the given directory, replacing
+    anything that was already there.
+
+    The official root is written to `directory / OFFICIAL_ROOT_NAME` and holds all of the data
+    files. An empty mod root is written to `directory / MOD_ROOT_NAME`, for scripts that need
+    one (ex. `cbpickaxe_generate_docs`).
+    """
+    if directory.exists():
+        shutil.rmtree(directory)
+
+    root = directory / OFFICIAL_ROOT_NAME
+    (directory / MOD_ROOT_NAME).mkdir(parents=True)
+
+    rng = random.Random(seed)
+    messages: Dict[str, str] = {}
+
+    _write_elemental_types(root, rng)
+    move_paths = _write_moves(root, size.moves, rng, messages)
+    _write_monster_forms(root, size.monster_forms, move_paths, rng, messages)
+    _write_items(root, size.items, rng, messages)
+
+    translations_dir = root / "translation"
+    translations_dir.mkdir(parents=True)
+    for locale in size.locales:
+        locale_rng = random.Random(f"{seed}-{locale}")
+        translated = {
+            key: _translate(message, locale, locale_rng)
+            for key, message in messages.items()
+        }
+        (translations_dir / f"game.{locale}.translation").write_bytes(
+            godot_writer.write_translation(translated, locale)
+        )
+
+
+def write_docs_config(
+    directory: pathlib.Path, output_directory: pathlib.Path
+) -> pathlib.Path:
+    """
+    Writes a `cbpickaxe_generate_docs` configuration file that builds pages for everything in the
+    corpus in the given directory, and returns its filepath.
+    """
+    config_filepath = directory / "docs.toml"
+    config_filepath.write_text(
+        f"""output_directory = "{output_directory.as_posix()}"
+
+[roots]
+{OFFICIAL_ROOT_NAME} = "{(directory / OFFICIAL_ROOT_NAME).as_posix()}"
+{MOD_ROOT_NAME} = "{(directory / MOD_ROOT_NAME).as_posix()}"
+
+[monster_forms]
+include_official = true
+
+[moves]
+include_official = true
+
+[items]
+include_official = true
+""",
+        encoding="utf-8",
+    )
+
+    return config_filepath
+
+
+def _write_elemental_types(root: pathlib.Path, rng: random.Random) -> None:
+    types_dir = root / "data" / "elemental_types"
+    types_dir.mkdir(parents=True)
+
+    for name in ELEMENTAL_TYPE_NAMES:
+        palette = ", ".join(_random_color(rng) for _ in range(0, 5))
+        (types_dir / f"{name}.tres").write_text(
+            f"""[gd_resource type="Resource" load_steps=2 format=2]
+
+[ext_resource path="res://data/ElementalType.gd" type="Script" id=1]
+
+[resource]
+script = ExtResource( 1 )
+id = "{name}"
+name = "{name.upper()}_NAME"
+palette = [ {palette} ]
+""",
+            encoding="utf-8",
+        )
+
+
+def _write_moves(
+    root: pathlib.Path, num_moves: int, rng: random.Random, messages: Dict[str, str]
+) -> List[str]:
+    moves_dir = root / "data" / "battle_moves"
+    moves_dir.mkdir(parents=True)
+
+    paths = []
+    for i in range(0, num_moves):
+        name = f"move{i}"
+        elemental_type = rng.choice(ELEMENTAL_TYPE_NAMES)
+        tags = [elemental_type, f"tag{rng.randrange(0, 20)}"]
+        if rng.random() < 0.1:
+            tags.append("any")
+
+        messages[f"MOVE_{i}_NAME"] = f"{_words(rng, 2)} {i}"
+        messages[f"MOVE_{i}_DESCRIPTION"] = _words(rng, 12)
+
+        (moves_dir / f"{name}.tres").write_text(
+            f"""[gd_resource type="Resource" load_steps=5 format=2]
+
+[ext_resource path="res://data/attack_vfx/spit.tres" type="Resource" id=1]
+[ext_resource path="res://data/hit_vfx/hit_elemental.tres" type="Resource" id=2]
+[ext_resource path="res://data/battle_move_scripts/GenericAttack.gd" type="Script" id=3]
+[ext_resource path="res://data/sticker_attribute_profiles/attack.tres" type="Resource" id=4]
+[ext_resource path="res://data/elemental_types/{elemental_type}.tres" type="Resource" id=5]
+
+[resource]
+script = ExtResource( 3 )
+name = "MOVE_{i}_NAME"
+category_name = "MOVE_CATEGORY_{rng.choice(["MELEE", "RANGED", "STATUS"])}"
+description = "MOVE_{i}_DESCRIPTION"
+title_override = ""
+tags = [ {", ".join(f'"{tag}"' for tag in tags)} ]
+priority = {rng.choice([0, 0, 0, 1, -1])}
+cost = {rng.randrange(0, 6)}
+is_debug = false
+is_passive_only = {str(rng.random() < 0.1).lower()}
+power = {rng.randrange(0, 200, 5)}
+physicality = 1
+target_type = {rng.randrange(0, 5)}
+default_target = 3
+elemental_types = [ ExtResource( 5 ) ]
+accuracy = {rng.choice([70, 80, 90, 100, 100])}
+unavoidable = {str(rng.random() < 0.2).lower()}
+crit_rate_numerator = 1
+crit_rate_denominator = 16
+crit_damage_percent = 150
+play_attack_animation = true
+fade_lights_during_attack = false
+windup_animation = "windup"
+attack_animation = "attack"
+windup_sfx_override = [  ]
+attack_vfx = [ ExtResource( 1 ) ]
+play_attack_vfx_against_allies = false
+attack_duration = 0.0
+hit_vfx = [ ExtResource( 2 ) ]
+hit_delay = 0.0
+disable_melee_movement = false
+can_be_copied = {str(rng.random() < 0.9).lower()}
+attribute_profile = ExtResource( 4 )
+camera_state_override = ""
+min_hits = 1
+max_hits = {rng.choice([1, 1, 1, 2, 3])}
+target_status_effects = [  ]
+user_status_effects = [  ]
+status_effects_to_apply = 0
+status_effect_amount = 3
+status_effect_chance = 0
+status_effect_only_for_target_types = [  ]
+target_status_only_if_not_had_turn = false
+destroys_walls = false
+require_target_tag = ""
+""",
+            encoding="utf-8",
+        )
+        paths.append(f"res://data/battle_moves/{name}.tres")
+
+    return paths
+
+
+def _write_monster_forms(
+    root: pathlib.Path,
+    num_monster_forms: int,
+    move_paths: List[str],
+    rng: random.Random,
+    messages: Dict[str, str],
+) -> None:
+    monster_forms_dir = root / "data" / "monster_forms"
+    monster_forms_dir.mkdir(parents=True)
+    sprites_dir = root / "sprites" / "monsters"
+    sprites_dir.mkdir(parents=True)
+    compiled_dir = root / ".import"
+    compiled_dir.mkdir(parents=True)
+
+    for i in range(0, num_monster_forms):
+        name = f"monster{i}"
+        elemental_type = rng.choice(ELEMENTAL_TYPE_NAMES)
+
+        messages[f"MONSTER_{i}_NAME"] = f"{_words(rng, 1).capitalize()} {i}"
+        messages[f"MONSTER_{i}_DESCRIPTION"] = _words(rng, 20)
+        for j in range(0, 3):
+            messages[f"MONSTER_{i}_BIO{j}"] = _words(rng, 40)
+
+        # Every few monsters remaster into the next one, like the game's evolution lines
+        evolves = i % 3 != 2 and i + 1 < num_monster_forms
+        evolution_ext_resource = (
+            f'[ext_resource path="res://data/monster_forms/monster{i + 1}.tres" type="Resource" id=5]\n'
+            if evolves
+            else ""
+        )
+        evolution_sub_resource = (
+            f"""[sub_resource type="Resource" id=6]
+script = ExtResource( 4 )
+resource_name = "{name}_remaster"
+evolved_form = ExtResource( 5 )
+required_tape_grade = 5
+min_hour = 0.0
+max_hour = 24.0
+required_location = ""
+specialization = ""
+is_secret = false
+"""
+            if evolves
+            else ""
+        )
+
+        stickers = rng.sample(move_paths, min(5, len(move_paths)))
+        sticker_ext_resources = "".join(
+            f'[ext_resource path="{path}" type="Resource" id={10 + j}]\n'
+            for j, path in enumerate(stickers)
+        )
+        tape_upgrade_sub_resources = "".join(
+            f"""[sub_resource type="Resource" id={j + 1}]
+resource_name = "grade{j + 1}"
+add_slot = {str(j % 2 == 0).lower()}
+sticker = ExtResource( {10 + j} )
+
+"""
+            for j in range(0, len(stickers))
+        )
+
+        (monster_forms_dir / f"{name}.tres").write_text(
+            f"""[gd_resource type="Resource" load_steps={len(stickers) + 6} format=2]
+
+[ext_resource path="res://data/MonsterForm.gd" type="Script" id=1]
+[ext_resource path="res://data/elemental_types/{elemental_type}.tres" type="Resource" id=2]
+[ext_resource path="res://sfx/monsters/{name}.wav" type="AudioStream" id=3]
+[ext_resource path="res://data/Evolution.gd" type="Script" id=4]
+{evolution_ext_resource}{sticker_ext_resources}
+{tape_upgrade_sub_resources}{evolution_sub_resource}
+[resource]
+script = ExtResource( 1 )
+name = "MONSTER_{i}_NAME"
+swap_colors = [ {", ".join(_random_color(rng) for _ in range(0, 5))} ]
+default_palette = [  ]
+emission_palette = [  ]
+battle_cry = ExtResource( 3 )
+elemental_types = [ ExtResource( 2 ) ]
+exp_yield = {rng.randrange(20, 80)}
+require_dlc = ""
+pronouns = {rng.randrange(0, 3)}
+description = "MONSTER_{i}_DESCRIPTION"
+max_hp = {rng.randrange(60, 160)}
+melee_attack = {rng.randrange(60, 160)}
+melee_defense = {rng.randrange(60, 160)}
+ranged_attack = {rng.randrange(60, 160)}
+ranged_defense = {rng.randrange(60, 160)}
+speed = {rng.randrange(60, 160)}
+accuracy = 100
+evasion = 100
+max_ap = 5
+move_slots = {rng.randrange(2, 5)}
+evolutions = [ {"SubResource( 6 )" if evolves else ""} ]
+bestiary_index = {i}
+move_tags = [ "{elemental_type}", "tag{rng.randrange(0, 20)}", "tag{rng.randrange(0, 20)}" ]
+battle_sprite_path = "res://sprites/monsters/{name}.json"
+tape_upgrades = [ {", ".join(f"SubResource( {j + 1} )" for j in range(0, len(stickers)))} ]
+bestiary_bios = [ {", ".join(f'"MONSTER_{i}_BIO{j}"' for j in range(0, 3))} ]
+""",
+            encoding="utf-8",
+        )
+
+        _write_animation(sprites_dir, compiled_dir, name, rng)
+
+
+def _write_animation(
+    sprites_dir: pathlib.Path,
+    compiled_dir: pathlib.Path,
+    name: str,
+    rng: random.Random,
+) -> None:
+    num_frames = sum(count for _, count in ANIMATIONS)
+
+    # Draw a different blob of color in each frame, so that images are not trivially compressible
+    image = PIL.Image.new("RGBA", (FRAME_SIZE * num_frames, FRAME_SIZE))
+    for i in range(0, num_frames):
+        left = i * FRAME_SIZE + rng.randrange(4, 16)
+        upper = rng.randrange(4, 16)
+        blob = PIL.Image.new(
+            "RGBA",
+            (FRAME_SIZE - 20, FRAME_SIZE - 20),
+            tuple(rng.randrange(0, 256) for _ in range(0, 3)) + (255,),
+        )
+        image.paste(blob, (left, upper))
+    image.save(sprites_dir / f"{name}.png")
+
+    animations: Dict[str, List[godot_writer.FrameBox]] = {}
+    frame = 0
+    for animation_name, count in ANIMATIONS:
+        animations[animation_name] = [
+            (float((frame + j) * FRAME_SIZE), 0.0, float(FRAME_SIZE), float(FRAME_SIZE))
+            for j in range(0, count)
+        ]
+        frame += count
+
+    # The game only ships the compiled version of each animation, with an import file pointing to
+    # it from where the original JSON file would be
+    json_res_path = f"res://sprites/monsters/{name}.json"
+    compiled_filename = (
+        f"{name}.json-{hashlib.md5(json_res_path.encode('utf-8')).hexdigest()}.scn"
+    )
+    (compiled_dir / compiled_filename).write_bytes(
+        godot_writer.write_animation_scn(
+            f"res://sprites/monsters/{name}.png", animations
+        )
+    )
+    (sprites_dir / f"{name}.json.import").write_text(
+        f"""[remap]
+
+importer="aseprite_wizard.plugin.spriteframes"
+type="PackedScene"
+path="res://.import/{compiled_filename}"
+
+[deps]
+
+source_file="{json_res_path}"
+dest_files=[ "res://.import/{compiled_filename}" ]
+
+[params]
+
+""",
+        encoding="utf-8",
+    )
+
+
+def _write_items(
+    root: pathlib.Path, num_items: int, rng: random.Random, messages: Dict[str, str]
+) -> None:
+    items_dir = root / "data" / "items"
+    items_dir.mkdir(parents=True)
+    icons_dir = root / "sprites" / "items"
+    icons_dir.mkdir(parents=True)
+
+    for i in range(0, NUM_ITEM_ICONS):
+        PIL.Image.new(
+            "RGBA", (16, 16), tuple(rng.randrange(0, 256) for _ in range(0, 3)) + (255,)
+        ).save(icons_dir / f"icon{i}.png")
+
+    for i in range(0, num_items):
+        messages[f"ITEM_{i}_NAME"] = f"{_words(rng, 2)} {i}"
+        messages[f"ITEM_{i}_DESCRIPTION"] = _words(rng, 15)
+
+        (items_dir / f"item{i}.tres").write_text(
+            f"""[gd_resource type="Resource" load_steps=3 format=2]
+
+[ext_resource path="res://data/items/Item.gd" type="Script" id=1]
+[ext_resource path="res://sprites/items/icon{rng.randrange(0, NUM_ITEM_ICONS)}.png" type="Texture" id=2]
+
+[resource]
+script = ExtResource( 1 )
+name = "ITEM_{i}_NAME"
+description = "ITEM_{i}_DESCRIPTION"
+category = "{rng.choice(["consumable", "key_item", "sticker", "resource"])}"
+icon = ExtResource( 2 )
+value = {rng.randrange(0, 1000)}
+max_stack = 99
+""",
+            encoding="utf-8",
+        )
+
+
+def _words(rng: random.Random, count: int) -> str:
+    return " ".join(rng.choice(WORDS["en"]) for _ in range(0, count))
+
+
+def _translate(message: str, locale: str, rng: random.Random) -> str:
+    if locale == "en":
+        return message
+
+    # Keep numbers, so that translated names stay unique
+    return " ".join(
+        word if word.isdigit() else rng.choice(WORDS[locale])
+        for word in message.split(" ")
+    )
+
+
+def _random_color(rng: random.Random) -> str:
+    return f"Color( {rng.random():.3f}, {rng.random():.3f}, {rng.random():.3f}, 1 )"
+
+
+def main_without_args() -> int:
+    return main(sys.argv[1:])
+
+
+if __name__ == "__main__":
+    sys.exit(main_without_args())
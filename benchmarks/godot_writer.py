@@ -0,0 +1,513 @@
+"""
+Writes compiled Godot 3 binary resource files (ex. ".scn" and ".translation" files), so that
+benchmarks can generate realistic data files without needing the game or the Godot editor.
+
+Only the parts of the format that cbpickaxe reads are written. Values are converted to variants
+based on their Python type:
+
+* None, bool, int, float, str: NIL, BOOL, INT (or INT64 if it does not fit in 32 bits), REAL
+  and STRING.
+* bytes: RAW_ARRAY.
+* Vector2, Rect2, Vector3, Plane, Quat, AABB, Basis, Transform, Transform2D and Color: VECTOR2,
+  RECT2, VECTOR3, PLANE, QUAT, AABB, MATRIX3, TRANSFORM, MATRIX32 and COLOR.
+* NodePath: NODE_PATH.
+* ExternalResource, ExternalResourceIndex and InternalResourceIndex: OBJECT.
+* Int32Array, RealArray, StringArray, Vector2Array, Vector3Array and ColorArray: INT32_ARRAY,
+  REAL_ARRAY, STRING_ARRAY, VECTOR2_ARRAY, VECTOR3_ARRAY and COLOR_ARRAY.
+* dict and list: DICTIONARY and ARRAY.
+"""
+from dataclasses import dataclass
+from typing import Any, Dict, List, Literal, Mapping, Sequence, Tuple
+
+import io
+import struct
+
+from cbpickaxe.misc_types import (
+    AABB,
+    Basis,
+    Color,
+    Plane,
+    Quat,
+    Rect2,
+    Transform,
+    Transform2D,
+    Vector2,
+    Vector3,
+)
+from cbpickaxe.resource import (
+    ExternalResource,
+    ExternalResourceIndex,
+    InternalResourceIndex,
+    NodePath,
+    OBJECT_EXTERNAL_RESOURCE,
+    OBJECT_EXTERNAL_RESOURCE_INDEX,
+    OBJECT_INTERNAL_RESOURCE,
+    VariantBin,
+)
+
+# Properties of an internal resource, in the order that they are written
+Properties = Sequence[Tuple[str, Any]]
+
+# x, y, width and height of a frame of an animation
+FrameBox = Tuple[float, float, float, float]
+
+# Godot version that the written files claim to be from
+ENGINE_VERSION = (3, 5)
+FORMAT_VERSION = 3
+
+
+@dataclass(frozen=True)
+class Int32Array:
+    values: Sequence[int]
+
+
+@dataclass(frozen=True)
+class RealArray:
+    values: Sequence[float]
+
+
+@dataclass(frozen=True)
+class StringArray:
+    values: Sequence[str]
+
+
+@dataclass(frozen=True)
+class Vector2Array:
+    values: Sequence[Vector2]
+
+
+@dataclass(frozen=True)
+class Vector3Array:
+    values: Sequence[Vector3]
+
+
+@dataclass(frozen=True)
+class ColorArray:
+    values: Sequence[Color]
+
+
+class _VariantWriter:
+    def __init__(
+        self, string_indexes: Dict[str, int], endian: Literal["big", "little"]
+    ) -> None:
+        self.stream = io.BytesIO()
+        self.__string_indexes = string_indexes
+        self.__prefix = "<" if endian == "little" else ">"
+
+    def write_u32(self, value: int) -> None:
+        self.stream.write(struct.pack(self.__prefix + "I", value & 0xFFFFFFFF))
+
+    def write_floats(self, *values: float) -> None:
+        self.stream.write(struct.pack(f"{self.__prefix}{len(values)}f", *values))
+
+    def write_string(self, value: str) -> None:
+        data = value.encode("utf-8") + b"\x00"
+        self.write_u32(len(data))
+        self.stream.write(data)
+
+    def write_string_index(self, value: str) -> None:
+        if value not in self.__string_indexes:
+            # Strings that are not in the string map are stored inline
+            data = value.encode("utf-8") + b"\x00"
+            self.write_u32(0x80000000 | len(data))
+            self.stream.write(data)
+            return
+
+        self.write_u32(self.__string_indexes[value])
+
+    def write_variant(self, value: Any) -> None:
+        if value is None:
+            self.write_u32(VariantBin.VARIANT_NIL.value)
+        elif isinstance(value, bool):
+            self.write_u32(VariantBin.VARIANT_BOOL.value)
+            self.write_u32(1 if value else 0)
+        elif isinstance(value, int) and -(2**31) <= value < 2**31:
+            self.write_u32(VariantBin.VARIANT_INT.value)
+            self.write_u32(value)
+        elif isinstance(value, int):
+            self.write_u32(VariantBin.VARIANT_INT64.value)
+            self.stream.write(struct.pack(self.__prefix + "q", value))
+        elif isinstance(value, float):
+            self.write_u32(VariantBin.VARIANT_REAL.value)
+            self.write_floats(value)
+        elif isinstance(value, str):
+            self.write_u32(VariantBin.VARIANT_STRING.value)
+            self.write_string(value)
+        elif isinstance(value, bytes):
+            self.write_u32(VariantBin.VARIANT_RAW_ARRAY.value)
+            self.write_u32(len(value))
+            self.stream.write(value + b"\x00" * (-len(value) % 4))
+        elif isinstance(value, Vector2):
+            self.write_u32(VariantBin.VARIANT_VECTOR2.value)
+            self.write_floats(value.x, value.y)
+        elif isinstance(value, Rect2):
+            self.write_u32(VariantBin.VARIANT_RECT2.value)
+            self.write_floats(
+                value.position.x, value.position.y, value.size.x, value.size.y
+            )
+        elif isinstance(value, Vector3):
+            self.write_u32(VariantBin.VARIANT_VECTOR3.value)
+            self.write_floats(value.x, value.y, value.z)
+        elif isinstance(value, Plane):
+            self.write_u32(VariantBin.VARIANT_PLANE.value)
+            self.write_floats(value.normal.x, value.normal.y, value.normal.z, value.d)
+        elif isinstance(value, Quat):
+            self.write_u32(VariantBin.VARIANT_QUAT.value)
+            self.write_floats(value.x, value.y, value.z, value.w)
+        elif isinstance(value, AABB):
+            self.write_u32(VariantBin.VARIANT_AABB.value)
+            self.write_floats(
+                value.position.x,
+                value.position.y,
+                value.position.z,
+                value.size.x,
+                value.size.y,
+                value.size.z,
+            )
+        elif isinstance(value, Basis):
+            self.write_u32(VariantBin.VARIANT_MATRIX3.value)
+            self.write_floats(*(c for row in value.rows for c in (row.x, row.y, row.z)))
+        elif isinstance(value, Transform):
+            self.write_u32(VariantBin.VARIANT_TRANSFORM.value)
+            self.write_floats(
+                *(c for row in value.basis.rows for c in (row.x, row.y, row.z)),
+                value.origin.x,
+                value.origin.y,
+                value.origin.z,
+            )
+        elif isinstance(value, Transform2D):
+            self.write_u32(VariantBin.VARIANT_MATRIX32.value)
+            self.write_floats(
+                value.x.x,
+                value.x.y,
+                value.y.x,
+                value.y.y,
+                value.origin.x,
+                value.origin.y,
+            )
+        elif isinstance(value, Color):
+            self.write_u32(VariantBin.VARIANT_COLOR.value)
+            self.write_floats(value.red, value.green, value.blue, value.alpha)
+        elif isinstance(value, NodePath):
+            self.write_u32(VariantBin.VARIANT_NODE_PATH.value)
+            self.stream.write(
+                struct.pack(
+                    self.__prefix + "HH",
+                    len(value.name_parts),
+                    len(value.sub_name_parts) | (0x8000 if value.absolute else 0),
+                )
+            )
+            for part in [*value.name_parts, *value.sub_name_parts]:
+                self.write_string_index(part)
+        elif isinstance(value, ExternalResourceIndex):
+            self.write_u32(VariantBin.VARIANT_OBJECT.value)
+            self.write_u32(OBJECT_EXTERNAL_RESOURCE_INDEX)
+            self.write_u32(value.index)
+        elif isinstance(value, ExternalResource):
+            self.write_u32(VariantBin.VARIANT_OBJECT.value)
+            self.write_u32(OBJECT_EXTERNAL_RESOURCE)
+            self.write_string(value.resource_type)
+            self.write_string(value.path)
+        elif isinstance(value, InternalResourceIndex):
+            self.write_u32(VariantBin.VARIANT_OBJECT.value)
+            self.write_u32(OBJECT_INTERNAL_RESOURCE)
+            self.write_u32(value.index)
+        elif isinstance(value, Int32Array):
+            self.write_u32(VariantBin.VARIANT_INT32_ARRAY.value)
+            self.write_u32(len(value.values))
+            self.stream.write(
+                struct.pack(
+                    f"{self.__prefix}{len(value.values)}I",
+                    *(v & 0xFFFFFFFF for v in value.values),
+                )
+            )
+        elif isinstance(value, RealArray):
+            self.write_u32(VariantBin.VARIANT_REAL_ARRAY.value)
+            self.write_u32(len(value.values))
+            self.write_floats(*value.values)
+        elif isinstance(value, StringArray):
+            self.write_u32(VariantBin.VARIANT_STRING_ARRAY.value)
+            self.write_u32(len(value.values))
+            for string in value.values:
+                self.write_string(string)
+        elif isinstance(value, Vector2Array):
+            self.write_u32(VariantBin.VARIANT_VECTOR2_ARRAY.value)
+            self.write_u32(len(value.values))
+            self.write_floats(*(c for v in value.values for c in (v.x, v.y)))
+        elif isinstance(value, Vector3Array):
+            self.write_u32(VariantBin.VARIANT_VECTOR3_ARRAY.value)
+            self.write_u32(len(value.values))
+            self.write_floats(*(c for v in value.values for c in (v.x, v.y, v.z)))
+        elif isinstance(value, ColorArray):
+            self.write_u32(VariantBin.VARIANT_COLOR_ARRAY.value)
+            self.write_u32(len(value.values))
+            self.write_floats(
+                *(c for v in value.values for c in (v.red, v.green, v.blue, v.alpha))
+            )
+        elif isinstance(value, dict):
+            self.write_u32(VariantBin.VARIANT_DICTIONARY.value)
+            self.write_u32(len(value))
+            for key, entry in value.items():
+                self.write_variant(key)
+                self.write_variant(entry)
+        elif isinstance(value, list):
+            self.write_u32(VariantBin.VARIANT_ARRAY.value)
+            self.write_u32(len(value))
+            for entry in value:
+                self.write_variant(entry)
+        else:
+            raise ValueError(f"Cannot write value of type {type(value).__name__}")
+
+
+def write_resource(
+    resource_type: str,
+    ext_resources: Sequence[Tuple[str, str]],
+    int_resources: Sequence[Tuple[str, Properties]],
+    endian: Literal["big", "little"] = "little",
+) -> bytes:
+    """
+    Returns the contents of a binary resource file with the given external resources (type and
+    res:// path of each) and internal resources (type and properties of each). The last internal
+    resource is the main resource of the file.
+    """
+    string_indexes: Dict[str, int] = {}
+    for _, properties in int_resources:
+        for name, value in properties:
+            string_indexes.setdefault(name, len(string_indexes))
+            for part in _find_node_path_parts(value):
+                string_indexes.setdefault(part, len(string_indexes))
+
+    header = _VariantWriter(string_indexes, endian)
+    header.stream.write(b"RSRC")
+    header.write_u32(1 if endian == "big" else 0)
+    header.write_u32(0)  # Reals are 32-bit
+    header.write_u32(ENGINE_VERSION[0])
+    header.write_u32(ENGINE_VERSION[1])
+    header.write_u32(FORMAT_VERSION)
+    header.write_string(resource_type)
+    header.stream.write(b"\x00" * 8)  # Import metadata offset
+    header.write_u32(0)  # Flags
+    header.stream.write(b"\x00" * 8)  # UID
+    header.stream.write(b"\x00" * 4 * 11)  # Reserved
+
+    header.write_u32(len(string_indexes))
+    for string in string_indexes:
+        header.write_string(string)
+
+    header.write_u32(len(ext_resources))
+    for ext_type, ext_path in ext_resources:
+        header.write_string(ext_type)
+        header.write_string(ext_path)
+
+    bodies = []
+    for int_type, properties in int_resources:
+        body = _VariantWriter(string_indexes, endian)
+        body.write_string(int_type)
+        body.write_u32(len(properties))
+        for name, value in properties:
+            body.write_string_index(name)
+            body.write_variant(value)
+        bodies.append(body.stream.getvalue())
+
+    paths = [f"local://{i + 1}" for i in range(0, len(int_resources) - 1)] + [
+        "local://0"
+    ]
+
+    header.write_u32(len(int_resources))
+
+    # Each entry of the internal resource table is a string followed by a 64-bit offset
+    offset = len(header.stream.getvalue()) + sum(
+        4 + len(path.encode("utf-8")) + 1 + 8 for path in paths
+    )
+    offset_format = ("<" if endian == "little" else ">") + "Q"
+    for path, body_bytes in zip(paths, bodies):
+        header.write_string(path)
+        header.stream.write(struct.pack(offset_format, offset))
+        offset += len(body_bytes)
+
+    return header.stream.getvalue() + b"".join(bodies) + b"RSRC"
+
+
+def write_variants(
+    values: Sequence[Any],
+    endian: Literal["big", "little"] = "little",
+    inline_strings: bool = False,
+) -> Tuple[bytes, List[str]]:
+    """
+    Returns the given values written one after another as variants, without a resource file
+    around them, along with the string map (as read by `ResourceHeader`) that the node paths in
+    them index into.
+
+    If inline_strings is True, then the names of node paths are stored inline instead of in the
+    string map.
+    """
+    string_indexes: Dict[str, int] = {}
+    for value in values:
+        for part in _find_node_path_parts(value) if not inline_strings else []:
+            string_indexes.setdefault(part, len(string_indexes))
+
+    writer = _VariantWriter(string_indexes, endian)
+    for value in values:
+        writer.write_variant(value)
+
+    return writer.stream.getvalue(), [string + "\x00" for string in string_indexes]
+
+
+def write_animation_scn(
+    image_path: str, animations: Mapping[str, List[FrameBox]]
+) -> bytes:
+    """
+    Returns the contents of a compiled ".scn" file of an animated sprite that uses the given
+    sprite sheet, in the form that the Aseprite importer used by the game produces. Each
+    animation is given as the boxes of its frames.
+    """
+    int_resources: List[Tuple[str, Properties]] = [
+        (
+            "Resource",
+            [
+                ("resource_name", "import_info"),
+                ("tags", StringArray(list(animations))),
+                ("data", b"\x01\x02\x03"),
+            ],
+        )
+    ]
+    for name, boxes in animations.items():
+        int_resources.append(
+            (
+                "Animation",
+                [
+                    ("resource_name", name),
+                    ("length", 0.1 * len(boxes)),
+                    ("loop", True),
+                    ("step", 0.1),
+                    ("tracks/0/type", "value"),
+                    ("tracks/0/path", NodePath(["Sprite"], ["region_rect"])),
+                    ("tracks/0/interp", 1),
+                    ("tracks/0/loop_wrap", True),
+                    ("tracks/0/imported", False),
+                    ("tracks/0/enabled", True),
+                    (
+                        "tracks/0/keys",
+                        {
+                            "times": RealArray([0.1 * i for i in range(len(boxes))]),
+                            "transitions": RealArray([1.0] * len(boxes)),
+                            "update": 1,
+                            "values": [
+                                Rect2(Vector2(x, y), Vector2(width, height))
+                                for x, y, width, height in boxes
+                            ],
+                        },
+                    ),
+                    ("tracks/1/type", "value"),
+                    ("tracks/1/path", NodePath(["Sprite"], ["frame"])),
+                    (
+                        "tracks/1/keys",
+                        {
+                            "times": RealArray([0.0]),
+                            "transitions": RealArray([1.0]),
+                            "update": 1,
+                            "values": [0],
+                        },
+                    ),
+                ],
+            )
+        )
+
+    names = ["Sprite", "texture", "region_enabled", "AnimationPlayer"] + [
+        f"anims/{name}" for name in animations
+    ]
+    variants: List[Any] = [ExternalResourceIndex(0), True] + [
+        InternalResourceIndex(i + 1) for i in range(len(animations))
+    ]
+    int_resources.append(
+        (
+            "PackedScene",
+            [
+                (
+                    "_bundled",
+                    {
+                        "names": StringArray(names),
+                        "variants": variants,
+                        "node_count": 2,
+                        "nodes": Int32Array([-1, -1, 0, 0, -1, 2, 0, 1, 1, 1]),
+                        "conn_count": 0,
+                        "conns": Int32Array([]),
+                        "node_paths": [],
+                        "editable_instances": [],
+                        "version": 2,
+                    },
+                )
+            ],
+        )
+    )
+
+    return write_resource("PackedScene", [("Texture", image_path)], int_resources)
+
+
+def write_translation(messages: Mapping[str, str], locale: str) -> bytes:
+    """
+    Returns the contents of a compiled ".translation" file that translates each of the given
+    string ids to the given message, laid out the same way as Godot's compressed translations.
+    Messages are stored uncompressed.
+    """
+    table_size = max(1, len(messages))
+
+    buckets: List[List[Tuple[int, bytes]]] = [[] for _ in range(0, table_size)]
+    for key, message in messages.items():
+        buckets[_hash(0, key) % table_size].append(
+            (_hash(0, key), message.encode("utf-8") + b"\x00")
+        )
+
+    hash_table = []
+    bucket_table: List[int] = []
+    strings = io.BytesIO()
+    for bucket in buckets:
+        if len(bucket) == 0:
+            hash_table.append(0xFFFFFFFF)
+            continue
+
+        hash_table.append(len(bucket_table))
+        bucket_table += [len(bucket), 0]
+        for key_hash, data in bucket:
+            bucket_table += [key_hash, strings.tell(), len(data), len(data)]
+            strings.write(data)
+
+    return write_resource(
+        "PHashTranslation",
+        [],
+        [
+            (
+                "PHashTranslation",
+                [
+                    ("locale", locale),
+                    ("hash_table", Int32Array(hash_table)),
+                    ("bucket_table", Int32Array(bucket_table)),
+                    ("strings", strings.getvalue()),
+                ],
+            )
+        ],
+    )
+
+
+def _hash(d: int, value: str) -> int:
+    # Same hash that Godot's compressed translations use to look up string ids
+    if d == 0:
+        d = 0x1000193
+
+    for b in value.encode("utf-8"):
+        d = ((d * 0x1000193) % 0x100000000) ^ b
+
+    return d
+
+
+def _find_node_path_parts(value: Any) -> List[str]:
+    if isinstance(value, NodePath):
+        return [*value.name_parts, *value.sub_name_parts]
+    elif isinstance(value, dict):
+        return [
+            part for entry in value.values() for part in _find_node_path_parts(entry)
+        ]
+    elif isinstance(value, list):
+        return [part for entry in value for part in _find_node_path_parts(entry)]
+
+    return []
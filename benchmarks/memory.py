@@ -0,0 +1,136 @@
+"""
+Reports how much memory loaded data files take up, in bytes per loaded entity.
+
+Example:
+
+    python benchmarks/memory.py --roots "data/Cassette Beasts"
+"""
+from typing import Any, Callable, Dict, List, Tuple, TypeVar
+
+import argparse
+import gc
+import pathlib
+import sys
+import tracemalloc
+
+import cbpickaxe as cbp
+
+SUCCESS = 0
+FAILURE = 1
+
+T = TypeVar("T")
+
+
+def main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser()
+
+    parser.add_argument("--roots", nargs="+", default=[])
+    parser.add_argument(
+        "--monster_form_paths",
+        nargs="+",
+        default=["res://data/monster_forms/", "res://data/monster_forms_secret/"],
+    )
+    parser.add_argument("--move_paths", nargs="+", default=["res://data/battle_moves/"])
+    parser.add_argument("--item_paths", nargs="+", default=["res://data/items/"])
+    parser.add_argument(
+        "--num_synthetic",
+        type=int,
+        default=100_000,
+        help="Number of each kind of small object (ex. Box) to create when measuring them on their own",
+    )
+
+    args = parser.parse_args(argv)
+
+    tracemalloc.start()
+
+    print(f"{'entity':<12} {'count':>8} {'bytes':>12} {'bytes/entity':>14}")
+
+    n = args.num_synthetic
+    report("Box", *measure(lambda: [cbp.Box(i, i + 1, i + 2, i + 3) for i in range(n)]))
+    report(
+        "Frame",
+        *measure(
+            lambda: [cbp.Frame(cbp.Box(i, i + 1, i + 2, i + 3)) for i in range(n)]
+        ),
+    )
+    report(
+        "Color", *measure(lambda: [cbp.Color(i / n, 0.5, 0.25, 1.0) for i in range(n)])
+    )
+
+    if len(args.roots) == 0:
+        return SUCCESS
+
+    hoylake = cbp.Hoylake()
+    for i, root in enumerate(args.roots):
+        hoylake.load_root(str(i), pathlib.Path(root))
+
+    monster_forms: Dict[str, Tuple[str, cbp.MonsterForm]] = {}
+    for path in args.monster_form_paths:
+        loaded, size = measure(lambda path=path: load_all(hoylake.load_monster_forms, path))  # type: ignore[misc]
+        monster_forms.update(loaded)
+        report("MonsterForm", loaded, size)
+
+    for path in args.move_paths:
+        report("Move", *measure(lambda path=path: load_all(hoylake.load_moves, path)))  # type: ignore[misc]
+
+    for path in args.item_paths:
+        report("Item", *measure(lambda path=path: load_all(hoylake.load_items, path)))  # type: ignore[misc]
+
+    def load_animations() -> List[cbp.Animation]:
+        animations = []
+        for _, monster_form in monster_forms.values():
+            try:
+                animations.append(
+                    hoylake.load_animation(monster_form.battle_sprite_path)
+                )
+            except ValueError:
+                # Animations that are missing from the roots
+                pass
+
+        return animations
+
+    report("Animation", *measure(load_animations))
+
+    return SUCCESS
+
+
+def load_all(load: Callable[[str], Dict[str, T]], path: str) -> Dict[str, T]:
+    try:
+        return load(path)
+    except ValueError:
+        # Directories that are missing from the roots
+        return {}
+
+
+def measure(create: Callable[[], T]) -> Tuple[T, int]:
+    """
+    Runs the given function and returns its result, along with the number of bytes of memory that
+    are still allocated once it finishes (i.e. not counting temporary allocations).
+    """
+    gc.collect()
+    before, _ = tracemalloc.get_traced_memory()
+
+    result = create()
+
+    gc.collect()
+    after, _ = tracemalloc.get_traced_memory()
+
+    return result, after - before
+
+
+def report(name: str, entities: Any, size: int) -> None:
+    count = len(entities)
+    if count == 0:
+        return
+
+    per_entity = size / count
+
+    print(f"{name:<12} {count:>8} {size:>12} {per_entity:>14.1f}")
+
+
+def main_without_args() -> int:
+    return main(sys.argv[1:])
+
+
+if __name__ == "__main__":
+    sys.exit(main_without_args())
@@ -0,0 +1,338 @@
+"""
+Times the main operations of cbpickaxe (ex. loading roots and data files, translating, tag
+queries, building docs) on a synthetic corpus generated by `corpus.py`, and appends the results
+to a JSON history file so that changes in performance can be tracked across commits.
+
+Each benchmark is run for several rounds, with any setup it needs done outside of the timed part
+of each round. Results are compared against the latest earlier run in the history that used the
+same corpus.
+
+Example:
+
+    python benchmarks/run.py --scale 0.2 --history benchmarks/history.json
+"""
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import argparse
+import contextlib
+import dataclasses
+import datetime
+import io
+import json
+import pathlib
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import cbpickaxe as cbp
+from cbpickaxe_scripts import generate_docs
+
+import corpus
+
+SUCCESS = 0
+FAILURE = 1
+
+HISTORY_VERSION = 1
+
+
+@dataclass(frozen=True)
+class Benchmark:
+    """
+    An operation to time. `setup` is run before each round without being timed, and its result
+    is passed to `run`, which is timed.
+    """
+
+    name: str
+    setup: Callable[[], Any]
+    run: Callable[[Any], Any]
+    rounds: int
+
+
+@dataclass(frozen=True)
+class BenchmarkResult:
+    """
+    Timings of all of the rounds of a benchmark, in seconds.
+    """
+
+    rounds: int
+    min: float
+    max: float
+    mean: float
+    median: float
+    stddev: float
+
+    @staticmethod
+    def from_timings(timings: List[float]) -> "BenchmarkResult":
+        return BenchmarkResult(
+            rounds=len(timings),
+            min=min(timings),
+            max=max(timings),
+            mean=statistics.mean(timings),
+            median=statistics.median(timings),
+            stddev=statistics.stdev(timings) if len(timings) > 1 else 0.0,
+        )
+
+
+def main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser()
+
+    parser.add_argument(
+        "--corpus_directory",
+        default=None,
+        help="Directory of the corpus to benchmark on. Generated if it does not exist yet. Defaults to a temporary directory.",
+    )
+    parser.add_argument(
+        "--scale",
+        type=float,
+        default=0.2,
+        help="Size of the generated corpus, as a multiple of the size of the game",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--rounds",
+        type=int,
+        default=None,
+        help="Number of rounds to run each benchmark for, instead of each benchmark's default",
+    )
+    parser.add_argument(
+        "--benchmarks",
+        nargs="+",
+        default=None,
+        help="Names of the benchmarks to run. Defaults to all of them.",
+    )
+    parser.add_argument(
+        "--history",
+        default=None,
+        help="JSON file to append the results to, and to compare them against",
+    )
+
+    args = parser.parse_args(argv)
+
+    size = corpus.CorpusSize().scaled(args.scale)
+
+    with contextlib.ExitStack() as stack:
+        if args.corpus_directory is None:
+            corpus_directory = pathlib.Path(
+                stack.enter_context(tempfile.TemporaryDirectory())
+            )
+        else:
+            corpus_directory = pathlib.Path(args.corpus_directory)
+
+        if not (corpus_directory / corpus.OFFICIAL_ROOT_NAME).exists():
+            print(f"Generating corpus in: {corpus_directory}")
+            corpus.generate_corpus(corpus_directory, size, args.seed)
+
+        benchmarks = create_benchmarks(corpus_directory)
+        if args.benchmarks is not None:
+            unknown = set(args.benchmarks) - {b.name for b in benchmarks}
+            if len(unknown) > 0:
+                print(f"Unknown benchmarks: {', '.join(sorted(unknown))}")
+                return FAILURE
+
+            benchmarks = [b for b in benchmarks if b.name in args.benchmarks]
+
+        results = {}
+        for benchmark in benchmarks:
+            results[benchmark.name] = run_benchmark(
+                benchmark, args.rounds if args.rounds is not None else benchmark.rounds
+            )
+
+    run = {
+        "version": HISTORY_VERSION,
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "commit": get_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "corpus": {
+            "scale": args.scale,
+            "seed": args.seed,
+            # Lists rather than tuples, so that runs compare equal to runs loaded from the history
+            "size": {**dataclasses.asdict(size), "locales": list(size.locales)},
+        },
+        "results": {
+            name: dataclasses.asdict(result) for name, result in results.items()
+        },
+    }
+
+    history: List[Dict[str, Any]] = []
+    if args.history is not None:
+        history = load_history(pathlib.Path(args.history))
+
+    report(results, find_baseline(history, run))
+
+    if args.history is not None:
+        history.append(run)
+        with open(args.history, "w", encoding="utf-8") as output_stream:
+            json.dump(history, output_stream, indent=2)
+        print(f"Appended results to: {args.history}")
+
+    return SUCCESS
+
+
+def create_benchmarks(corpus_directory: pathlib.Path) -> List[Benchmark]:
+    root = corpus_directory / corpus.OFFICIAL_ROOT_NAME
+
+    def new_hoylake() -> cbp.Hoylake:
+        hoylake = cbp.Hoylake()
+        hoylake.load_root(corpus.OFFICIAL_ROOT_NAME, root)
+        return hoylake
+
+    def loaded_hoylake() -> cbp.Hoylake:
+        hoylake = new_hoylake()
+        hoylake.load_monster_forms("res://data/monster_forms/")
+        hoylake.load_moves("res://data/battle_moves/")
+        hoylake.load_items("res://data/items/")
+        return hoylake
+
+    def load_animations(hoylake: cbp.Hoylake) -> None:
+        for _, (_, monster_form) in hoylake.load_monster_forms(
+            "res://data/monster_forms/"
+        ).items():
+            hoylake.load_animation(monster_form.battle_sprite_path)
+
+    def translate_all(hoylake: cbp.Hoylake) -> None:
+        entities: List[Dict[str, Tuple[str, Any]]] = [
+            hoylake.load_monster_forms("res://data/monster_forms/"),
+            hoylake.load_moves("res://data/battle_moves/"),
+            hoylake.load_items("res://data/items/"),
+        ]
+        strings = [entity.name for loaded in entities for _, entity in loaded.values()]
+        for locale in sorted(hoylake.get_locales()):
+            for string in strings:
+                hoylake.translate(string, locale)
+
+    def query_tags(hoylake: cbp.Hoylake) -> None:
+        for _, (_, move) in hoylake.load_moves("res://data/battle_moves/").items():
+            hoylake.get_monster_forms_by_tags(move.tags)
+        for _, (_, monster_form) in hoylake.load_monster_forms(
+            "res://data/monster_forms/"
+        ).items():
+            hoylake.get_moves_by_tags(monster_form.move_tags)
+
+    config_filepath = corpus.write_docs_config(
+        corpus_directory, corpus_directory / "docs"
+    )
+
+    def build_docs(_: None) -> None:
+        # Hide the output of the script, so that it does not get mixed in with the results
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = generate_docs.main(["build", "--config", str(config_filepath)])
+        assert result == generate_docs.SUCCESS
+
+    return [
+        Benchmark("load_root", lambda: None, lambda _: new_hoylake(), rounds=5),
+        Benchmark(
+            "load_monster_forms",
+            new_hoylake,
+            lambda hoylake: hoylake.load_monster_forms("res://data/monster_forms/"),
+            rounds=3,
+        ),
+        Benchmark(
+            "load_moves",
+            new_hoylake,
+            lambda hoylake: hoylake.load_moves("res://data/battle_moves/"),
+            rounds=3,
+        ),
+        Benchmark(
+            "load_items",
+            new_hoylake,
+            lambda hoylake: hoylake.load_items("res://data/items/"),
+            rounds=3,
+        ),
+        Benchmark(
+            "load_animations",
+            loaded_hoylake,
+            load_animations,
+            rounds=3,
+        ),
+        Benchmark("translate", loaded_hoylake, translate_all, rounds=5),
+        Benchmark("tag_queries", loaded_hoylake, query_tags, rounds=5),
+        Benchmark("build_docs", lambda: None, build_docs, rounds=1),
+    ]
+
+
+def run_benchmark(benchmark: Benchmark, rounds: int) -> BenchmarkResult:
+    timings = []
+    for _ in range(0, max(1, rounds)):
+        state = benchmark.setup()
+
+        start_time = time.perf_counter()
+        benchmark.run(state)
+        timings.append(time.perf_counter() - start_time)
+
+    return BenchmarkResult.from_timings(timings)
+
+
+def load_history(filepath: pathlib.Path) -> List[Dict[str, Any]]:
+    if not filepath.exists():
+        return []
+
+    with open(filepath, "r", encoding="utf-8") as input_stream:
+        history = json.load(input_stream)
+
+    assert isinstance(history, list)
+
+    return history
+
+
+def find_baseline(
+    history: List[Dict[str, Any]], run: Dict[str, Any]
+) -> Optional[Dict[str, Any]]:
+    """
+    Returns the latest earlier run that used the same corpus, if any.
+    """
+    earlier_run: Dict[str, Any]
+    for earlier_run in reversed(history):
+        if (
+            earlier_run.get("version") == run["version"]
+            and earlier_run.get("corpus") == run["corpus"]
+        ):
+            return earlier_run
+
+    return None
+
+
+def report(
+    results: Dict[str, BenchmarkResult], baseline: Optional[Dict[str, Any]]
+) -> None:
+    header = f"{'benchmark':<20} {'rounds':>6} {'min (s)':>10} {'median (s)':>11} {'stddev (s)':>11}"
+    if baseline is not None:
+        header += f" {'vs ' + str(baseline.get('commit') or 'baseline')[:8]:>12}"
+    print(header)
+
+    for name, result in results.items():
+        line = f"{name:<20} {result.rounds:>6} {result.min:>10.4f} {result.median:>11.4f} {result.stddev:>11.4f}"
+
+        if baseline is not None and name in baseline["results"]:
+            baseline_median = baseline["results"][name]["median"]
+            ratio = result.median / baseline_median if baseline_median > 0 else 1.0
+            line += f" {ratio:>11.2f}x"
+
+        print(line)
+
+
+def get_commit() -> Optional[str]:
+    try:
+        completed = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            check=True,
+            text=True,
+            cwd=pathlib.Path(__file__).parent,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+    return completed.stdout.strip()
+
+
+def main_without_args() -> int:
+    return main(sys.argv[1:])
+
+
+if __name__ == "__main__":
+    sys.exit(main_without_args())
@@ -0,0 +1,318 @@
+"""
+Times the binary variant decoder (`cbpickaxe.resource.read_variant`) on its own, separately from
+the rest of the work of loading compiled files.
+
+Each mix is a stream of variants of a controlled set of types (ex. large raw arrays, or nested
+dictionaries) written by `godot_writer.py`. The stream is decoded several times and the decoding
+speed is reported in both MB/s and variants/s, where nested values (ex. the entries of a
+dictionary) count as variants of their own.
+
+Example:
+
+    python benchmarks/variants.py --size_kb 1024 --mixes raw_arrays nested_dicts
+"""
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Literal, Optional
+
+import argparse
+import dataclasses
+import datetime
+import io
+import json
+import pathlib
+import platform
+import random
+import statistics
+import sys
+import time
+
+from cbpickaxe.misc_types import Color, Rect2, Vector2, Vector3
+from cbpickaxe.resource import NodePath, read_variant
+
+import godot_writer
+import run
+
+SUCCESS = 0
+FAILURE = 1
+
+HISTORY_VERSION = 1
+
+
+@dataclass(frozen=True)
+class VariantStream:
+    """
+    Variants written one after another, along with the string map that they index into.
+    """
+
+    data: bytes
+    string_map: List[str]
+    endian: Literal["big", "little"]
+    num_variants: int
+
+
+@dataclass(frozen=True)
+class DecodeResult:
+    """
+    Decoding speed of one mix, using the median time of its rounds.
+    """
+
+    rounds: int
+    bytes: int
+    variants: int
+    median_seconds: float
+    mb_per_second: float
+    variants_per_second: float
+
+
+def main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser()
+
+    parser.add_argument(
+        "--size_kb",
+        type=int,
+        default=1024,
+        help="Approximate size of the stream of each mix, in kilobytes",
+    )
+    parser.add_argument(
+        "--mixes",
+        nargs="+",
+        default=None,
+        help=f"Names of the mixes to decode. Defaults to all of them: {', '.join(MIXES)}",
+    )
+    parser.add_argument("--endian", choices=["little", "big"], default="little")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--history",
+        default=None,
+        help="JSON file to append the results to, and to compare them against",
+    )
+
+    args = parser.parse_args(argv)
+
+    mixes = list(MIXES) if args.mixes is None else args.mixes
+    unknown = set(mixes) - set(MIXES)
+    if len(unknown) > 0:
+        print(f"Unknown mixes: {', '.join(sorted(unknown))}")
+        return FAILURE
+
+    results = {}
+    for name in mixes:
+        stream = create_stream(
+            MIXES[name](random.Random(args.seed), args.size_kb * 1024), args.endian
+        )
+        results[name] = benchmark_decode(stream, args.rounds)
+
+    run_info = {
+        "version": HISTORY_VERSION,
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "commit": run.get_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "corpus": {
+            "size_kb": args.size_kb,
+            "endian": args.endian,
+            "seed": args.seed,
+        },
+        "results": {
+            name: dataclasses.asdict(result) for name, result in results.items()
+        },
+    }
+
+    history: List[Dict[str, Any]] = []
+    if args.history is not None:
+        history = run.load_history(pathlib.Path(args.history))
+
+    report(results, run.find_baseline(history, run_info))
+
+    if args.history is not None:
+        history.append(run_info)
+        with open(args.history, "w", encoding="utf-8") as output_stream:
+            json.dump(history, output_stream, indent=2)
+        print(f"Appended results to: {args.history}")
+
+    return SUCCESS
+
+
+def raw_arrays(rng: random.Random, size: int) -> List[Any]:
+    # Large byte arrays, like the strings of translations and the data of imported files
+    return [rng.randbytes(64 * 1024) for _ in range(0, max(1, size // (64 * 1024)))]
+
+
+def int32_arrays(rng: random.Random, size: int) -> List[Any]:
+    # Like the hash and bucket tables of translations and the nodes of packed scenes
+    return [
+        godot_writer.Int32Array([rng.randrange(0, 2**31) for _ in range(0, 4096)])
+        for _ in range(0, max(1, size // (4 * 4096)))
+    ]
+
+
+def real_arrays(rng: random.Random, size: int) -> List[Any]:
+    # Like the key times and transitions of animation tracks
+    return [
+        godot_writer.RealArray([rng.random() for _ in range(0, 4096)])
+        for _ in range(0, max(1, size // (4 * 4096)))
+    ]
+
+
+def vector_arrays(rng: random.Random, size: int) -> List[Any]:
+    # Like the points of polygons and meshes, and the colors of gradients
+    # Each group of one array of each type takes up about 36 KB
+    count = max(1, size // ((2 + 3 + 4) * 4 * 1024))
+    return [
+        array_type([create(rng) for _ in range(0, 1024)])
+        for _ in range(0, count)
+        for array_type, create in [
+            (godot_writer.Vector2Array, lambda r: Vector2(r.random(), r.random())),
+            (
+                godot_writer.Vector3Array,
+                lambda r: Vector3(r.random(), r.random(), r.random()),
+            ),
+            (
+                godot_writer.ColorArray,
+                lambda r: Color(r.random(), r.random(), r.random(), 1.0),
+            ),
+        ]
+    ]
+
+
+def nested_dicts(rng: random.Random, size: int) -> List[Any]:
+    # Like the keys of animation tracks and the bundled data of packed scenes
+    def create(depth: int) -> Dict[str, Any]:
+        value: Dict[str, Any] = {
+            "name": f"entry_{rng.randrange(0, 1000)}",
+            "count": rng.randrange(0, 100),
+            "weight": rng.random(),
+            "enabled": rng.random() < 0.5,
+            "region": Rect2(Vector2(rng.random(), rng.random()), Vector2(16.0, 16.0)),
+            "values": [rng.randrange(0, 100) for _ in range(0, 4)],
+        }
+        if depth > 0:
+            value["children"] = [create(depth - 1) for _ in range(0, 2)]
+
+        return value
+
+    # Each dictionary of depth 2 takes up about 1.4 KB
+    return [create(2) for _ in range(0, max(1, size // 1400))]
+
+
+def node_paths(rng: random.Random, size: int) -> List[Any]:
+    # Like the paths of animation tracks
+    names = ["Sprite", "AnimationPlayer", "Body", "Head", "Tail", "Shadow"]
+    properties = ["region_rect", "frame", "modulate", "position", "visible"]
+
+    # Each node path takes up about 18 bytes
+    return [
+        NodePath(
+            rng.sample(names, rng.randrange(1, 3)),
+            [rng.choice(properties)],
+        )
+        for _ in range(0, max(1, size // 18))
+    ]
+
+
+def mixed(rng: random.Random, size: int) -> List[Any]:
+    values = (
+        raw_arrays(rng, size // 4)
+        + int32_arrays(rng, size // 4)
+        + real_arrays(rng, size // 4)
+        + nested_dicts(rng, size // 8)
+        + node_paths(rng, size // 8)
+    )
+    rng.shuffle(values)
+
+    return values
+
+
+MIXES: Dict[str, Callable[[random.Random, int], List[Any]]] = {
+    "raw_arrays": raw_arrays,
+    "int32_arrays": int32_arrays,
+    "real_arrays": real_arrays,
+    "vector_arrays": vector_arrays,
+    "nested_dicts": nested_dicts,
+    "node_paths": node_paths,
+    "mixed": mixed,
+}
+
+
+def create_stream(
+    values: List[Any], endian: Literal["big", "little"] = "little"
+) -> VariantStream:
+    data, string_map = godot_writer.write_variants(values, endian)
+
+    return VariantStream(
+        data=data,
+        string_map=string_map,
+        endian=endian,
+        num_variants=sum(count_variants(value) for value in values),
+    )
+
+
+def count_variants(value: Any) -> int:
+    """
+    Returns the number of variants that the given value is written as, including itself.
+    """
+    if isinstance(value, dict):
+        return 1 + sum(
+            count_variants(key) + count_variants(entry) for key, entry in value.items()
+        )
+    elif isinstance(value, list):
+        return 1 + sum(count_variants(entry) for entry in value)
+
+    return 1
+
+
+def decode(stream: VariantStream) -> None:
+    input_stream = io.BytesIO(stream.data)
+    while input_stream.tell() < len(stream.data):
+        read_variant(input_stream, stream.endian, stream.string_map)
+
+
+def benchmark_decode(stream: VariantStream, rounds: int) -> DecodeResult:
+    timings = []
+    for _ in range(0, max(1, rounds)):
+        start_time = time.perf_counter()
+        decode(stream)
+        timings.append(time.perf_counter() - start_time)
+
+    median = statistics.median(timings)
+
+    return DecodeResult(
+        rounds=len(timings),
+        bytes=len(stream.data),
+        variants=stream.num_variants,
+        median_seconds=median,
+        mb_per_second=len(stream.data) / 1_000_000 / median,
+        variants_per_second=stream.num_variants / median,
+    )
+
+
+def report(
+    results: Dict[str, DecodeResult], baseline: Optional[Dict[str, Any]]
+) -> None:
+    header = f"{'mix':<14} {'bytes':>10} {'variants':>10} {'median (s)':>11} {'MB/s':>9} {'variants/s':>12}"
+    if baseline is not None:
+        header += f" {'vs ' + str(baseline.get('commit') or 'baseline')[:8]:>12}"
+    print(header)
+
+    for name, result in results.items():
+        line = (
+            f"{name:<14} {result.bytes:>10} {result.variants:>10} "
+            f"{result.median_seconds:>11.4f} {result.mb_per_second:>9.2f} "
+            f"{result.variants_per_second:>12.0f}"
+        )
+
+        if baseline is not None and name in baseline["results"]:
+            baseline_speed = baseline["results"][name]["mb_per_second"]
+            ratio = result.mb_per_second / baseline_speed if baseline_speed > 0 else 1.0
+            line += f" {ratio:>11.2f}x"
+
+        print(line)
+
+
+def main_without_args() -> int:
+    return main(sys.argv[1:])
+
+
+if __name__ == "__main__":
+    sys.exit(main_without_args())
@@ -1,27 +1,146 @@
 """
 A library for data mining the game Cassette Beasts.
+
+The classes and functions of the library are only imported when they are first used, so that
+importing cbpickaxe stays fast and scripts only pay for the parts of the library that they use.
 """
-from .animation import Animation, Frame, FrameTag, Box
-from .elemental_type import ElementalType
-from .hoylake import Hoylake
-from .item import Item
-from .misc_types import Color
-from .monster_form import Evolution, MonsterForm, TapeUpgrade
-from .move import Move
-from .translation_table import TranslationTable
+from typing import Any, Dict, List, TYPE_CHECKING
+
+import importlib
+
+if TYPE_CHECKING:
+    from .animation import Animation, Frame, FrameArray, FrameTag, Box
+    from .animation_cache import (
+        AnimationCache,
+        AnimationCacheEntry,
+        write_animation_json,
+    )
+    from .async_hoylake import AsyncHoylake
+    from .atlas import AtlasEntry, AtlasPage, pack_sprites
+    from .cache import CacheInfo, LRUCache
+    from .elemental_type import ElementalType, get_bootleg_color_mappings
+    from .hoylake import Hoylake
+    from .item import Item
+    from .misc_types import Color, intern_color
+    from .monster_form import Evolution, MonsterForm, TapeUpgrade
+    from .move import Move
+    from .server import HoylakeClient, QueryHandler, create_server
+    from .sprite_sheet import (
+        extract_frames,
+        get_union_alpha_bbox,
+        recolor,
+        recolor_many,
+        to_rgba_array,
+    )
+    from .stats import HoylakeStats, PhaseTiming, Stats
+    from .translation_table import TranslationTable
+    from .watcher import FileWatcher, RootWatcher
+
+#: Environment variable that scripts read the address of a running cbpickaxe_serve server from.
+SERVER_ENV_VAR = "CBPICKAXE_SERVER"
 
 __all__ = [
     "Animation",
+    "AnimationCache",
+    "AnimationCacheEntry",
+    "AsyncHoylake",
+    "AtlasEntry",
+    "AtlasPage",
     "Box",
+    "CacheInfo",
+    "create_server",
     "ElementalType",
+    "get_bootleg_color_mappings",
+    "get_union_alpha_bbox",
     "Frame",
+    "FrameArray",
     "FrameTag",
     "Hoylake",
+    "HoylakeClient",
+    "HoylakeStats",
+    "intern_color",
     "Item",
+    "LRUCache",
     "Color",
     "Evolution",
+    "extract_frames",
+    "FileWatcher",
     "MonsterForm",
     "TapeUpgrade",
     "Move",
+    "pack_sprites",
+    "PhaseTiming",
+    "QueryHandler",
+    "recolor",
+    "recolor_many",
+    "RootWatcher",
+    "SERVER_ENV_VAR",
+    "Stats",
+    "to_rgba_array",
     "TranslationTable",
+    "write_animation_json",
 ]
+
+# Maps each lazily imported name to the submodule that it is defined in
+_LAZY_ATTRIBUTES: Dict[str, str] = {
+    "Animation": "animation",
+    "AnimationCache": "animation_cache",
+    "AnimationCacheEntry": "animation_cache",
+    "AsyncHoylake": "async_hoylake",
+    "AtlasEntry": "atlas",
+    "AtlasPage": "atlas",
+    "Box": "animation",
+    "CacheInfo": "cache",
+    "create_server": "server",
+    "ElementalType": "elemental_type",
+    "get_bootleg_color_mappings": "elemental_type",
+    "Frame": "animation",
+    "FrameArray": "animation",
+    "FrameTag": "animation",
+    "Hoylake": "hoylake",
+    "HoylakeClient": "server",
+    "HoylakeStats": "stats",
+    "intern_color": "misc_types",
+    "Item": "item",
+    "LRUCache": "cache",
+    "Color": "misc_types",
+    "Evolution": "monster_form",
+    "FileWatcher": "watcher",
+    "MonsterForm": "monster_form",
+    "TapeUpgrade": "monster_form",
+    "Move": "move",
+    "pack_sprites": "atlas",
+    "PhaseTiming": "stats",
+    "QueryHandler": "server",
+    "recolor": "sprite_sheet",
+    "recolor_many": "sprite_sheet",
+    "extract_frames": "sprite_sheet",
+    "get_union_alpha_bbox": "sprite_sheet",
+    "to_rgba_array": "sprite_sheet",
+    "RootWatcher": "watcher",
+    "Stats": "stats",
+    "TranslationTable": "translation_table",
+    "write_animation_json": "animation_cache",
+}
+
+_SUBMODULES = set(_LAZY_ATTRIBUTES.values()) | {"resource"}
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY_ATTRIBUTES:
+        module = importlib.import_module(f".{_LAZY_ATTRIBUTES[name]}", __name__)
+        value = getattr(module, name)
+
+        # Cache the value, so that later lookups do not go through __getattr__
+        globals()[name] = value
+
+        return value
+
+    if name in _SUBMODULES:
+        return importlib.import_module(f".{name}", __name__)
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
@@ -2,20 +2,36 @@
 Classes related to sprite animations.
 """
 from dataclasses import dataclass
-from typing import Any, cast, Dict, IO, Iterator, List, Tuple
+from typing import (
+    Any,
+    cast,
+    Dict,
+    IO,
+    Iterable,
+    Iterator,
+    List,
+    overload,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+import array
+import operator
+import struct
+import sys
 
 from .resource import (
     ResourceHeader,
-    read_unicode_string,
     read_variant,
-    get_string,
-    PropertyValue,
-    InternalResourceIndex,
+    seek_to_dictionary_key,
+    seek_to_property,
     Rect2,
+    VariantBin,
 )
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Box:
     """
     A rectangular region of an image.
@@ -43,8 +59,14 @@ class Box:
 
         return Box(x, y, w, h)
 
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Converts the Box into a dict, in the same format that from_dict reads.
+        """
+        return {"x": self.x, "y": self.y, "w": self.width, "h": self.height}
+
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Frame:
     """
     A frame that can be used in animations.
@@ -61,8 +83,100 @@ class Frame:
 
         return Frame(box)
 
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Converts the Frame into a dict, in the same format that from_dict reads.
+        """
+        return {"frame": self.box.to_dict()}
+
+
+class FrameArray(Sequence[Frame]):
+    """
+    A compact sequence of frames that stores the boxes of all of the frames in one array of ints,
+    with four entries (x, y, width, height) per frame.
+
+    Frame and Box objects are only created when frames are accessed, so an animation with many
+    frames takes up a fraction of the memory of a list of Frames.
+    """
+
+    __slots__ = ("boxes",)
+
+    def __init__(self, boxes: "array.array[int]") -> None:
+        assert len(boxes) % 4 == 0, len(boxes)
+
+        self.boxes = boxes  #: x, y, width and height of each frame's box.
+
+    @staticmethod
+    def from_frames(frames: Iterable[Frame]) -> "FrameArray":
+        """
+        Creates a FrameArray containing the given frames.
+        """
+        boxes = array.array("i")
+        for frame in frames:
+            boxes.extend((frame.box.x, frame.box.y, frame.box.width, frame.box.height))
+
+        return FrameArray(boxes)
+
+    def get_boxes(self, start: int, end: int) -> "array.array[int]":
+        """
+        Returns the boxes of the frames from start up to (but not including) end, in the same
+        format as `boxes`.
+        """
+        return self.boxes[start * 4 : end * 4]
+
+    @overload
+    def __getitem__(self, index: int) -> Frame:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> "FrameArray":
+        ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Frame, "FrameArray"]:
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step == 1:
+                return FrameArray(self.get_boxes(start, max(start, stop)))
+
+            return FrameArray.from_frames(self[i] for i in range(start, stop, step))
+
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("frame index out of range")
+
+        offset = index * 4
+        return Frame(Box(*self.boxes[offset : offset + 4]))
+
+    def __len__(self) -> int:
+        return len(self.boxes) // 4
+
+    def __iter__(self) -> Iterator[Frame]:
+        boxes = self.boxes
+        return (
+            Frame(Box(boxes[i], boxes[i + 1], boxes[i + 2], boxes[i + 3]))
+            for i in range(0, len(boxes), 4)
+        )
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, FrameArray):
+            return self.boxes == other.boxes
+        if isinstance(other, Sequence) and not isinstance(other, (str, bytes)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"FrameArray({self.boxes!r})"
 
-@dataclass
+    def __getstate__(self) -> "array.array[int]":
+        return self.boxes
+
+    def __setstate__(self, boxes: "array.array[int]") -> None:
+        self.boxes = boxes
+
+
+@dataclass(slots=True)
 class FrameTag:
     """
     A tag descripting the frames of an animation.
@@ -85,35 +199,76 @@ class FrameTag:
         assert isinstance(start_frame, int)
         assert isinstance(end_frame, int)
 
-        return FrameTag(name, start_frame, end_frame)
+        # Animation names (ex. "idle") are shared by almost every animation
+        return FrameTag(sys.intern(name), start_frame, end_frame)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Converts the FrameTag into a dict, in the same format that from_dict reads.
+
+        "to" is written as end_frame, the same way that from_dict reads it, so that animations
+        written out (ex. to an animation cache) load back in with the same frames. Note that this
+        is one past the last frame, while Aseprite writes the last frame itself.
+        """
+        return {
+            "name": self.name,
+            "from": self.start_frame,
+            "to": self.end_frame,
+            "direction": "forward",
+        }
+
+
+# pylint: disable-next=too-few-public-methods
+class _FrameTagIndex:
+    """
+    Holds the index of an Animation's frame tags by name. It is kept outside of the Animation's
+    dataclass fields, so that the index is not compared, converted by `dataclasses.asdict` or
+    included in its repr.
+    """
+
+    __slots__ = ("_frame_tag_indices", "_indexed_frame_tag_names")
+
+    _frame_tag_indices: Dict[str, int]
+    _indexed_frame_tag_names: List[str]
+
+    def _index_frame_tags(self, names: List[str]) -> None:
+        # Duplicate names refer to their first frame tag
+        self._frame_tag_indices = {}
+        for i, name in enumerate(names):
+            self._frame_tag_indices.setdefault(name, i)
+
+        self._indexed_frame_tag_names = names
+
+
+_get_frame_tag_name = operator.attrgetter("name")
 
 
-@dataclass
-class Animation:
+@dataclass(slots=True)
+class Animation(_FrameTagIndex):
     """
     An animated sprite consisting of a set of frames with several tags indicating types of
     animations (ex. idle, attack, hurt),
     """
 
-    frames: List[
+    frames: Sequence[
         Frame
-    ]  #: Frames that make up the animations. Can be indexed into using the frame ids stored in FrameTags.
+    ]  #: Frames that make up the animations. Can be indexed into using the frame ids stored in FrameTags. Loaded animations store their frames in a compact FrameArray.
     frame_tags: List[
         FrameTag
     ]  #: Information on specific animations (ex. "idle", "atttack", etc.)
     image: str  #: Relative filepath to the sprite sheet image for the animation.
 
+    def __post_init__(self) -> None:
+        self._index_frame_tags(list(map(_get_frame_tag_name, self.frame_tags)))
+
     def __iter__(self) -> Iterator[str]:
         return (frame_tag.name for frame_tag in self.frame_tags)
 
-    def __getitem__(self, key: str) -> Tuple[FrameTag, List[Frame]]:
-        for frame_tag in self.frame_tags:
-            if frame_tag.name == key:
-                frames = self.frames[frame_tag.start_frame : frame_tag.end_frame]
-
-                return frame_tag, frames
+    def __getitem__(self, key: str) -> Tuple[FrameTag, Sequence[Frame]]:
+        frame_tag = self.get_frame_tag(key)
+        frames = self.frames[frame_tag.start_frame : frame_tag.end_frame]
 
-        raise KeyError(key)
+        return frame_tag, frames
 
     def get_frame(self, animation_name: str, frame_offset: int) -> Frame:
         """
@@ -123,27 +278,57 @@ class Animation:
             self.get_frame_tag(animation_name).start_frame + frame_offset
         ]
 
+    def get_frame_boxes(self, animation_name: str) -> "array.array[int]":
+        """
+        Returns the boxes of all of the frames of the animation with the given name as a flat
+        array of ints, with four entries (x, y, width, height) per frame.
+        """
+        frame_tag = self.get_frame_tag(animation_name)
+
+        if isinstance(self.frames, FrameArray):
+            return self.frames.get_boxes(frame_tag.start_frame, frame_tag.end_frame)
+
+        return FrameArray.from_frames(
+            self.frames[frame_tag.start_frame : frame_tag.end_frame]
+        ).boxes
+
+    def compact(self) -> None:
+        """
+        Converts the frames of the animation into a compact FrameArray, if they are not already
+        stored in one.
+        """
+        if not isinstance(self.frames, FrameArray):
+            self.frames = FrameArray.from_frames(self.frames)
+
     def get_frame_tag(self, name: str) -> FrameTag:
         """
         Returns the FrameTag with the given name.
         """
-        for frame_tag in self.frame_tags:
-            if frame_tag.name == name:
-                return frame_tag
+        # The names that the index was built from are checked against the frame tags on every
+        # lookup, and the index is rebuilt if they differ, so that it stays correct even if
+        # frame_tags is modified, replaced or has a tag renamed. Unpickled animations do not have
+        # an index yet.
+        names = list(map(_get_frame_tag_name, self.frame_tags))
+        if names != getattr(self, "_indexed_frame_tag_names", None):
+            self._index_frame_tags(names)
+
+        index = self._frame_tag_indices.get(name)
+        if index is None:
+            raise KeyError(name)
 
-        raise KeyError(name)
+        return self.frame_tags[index]
 
     @staticmethod
     def from_dict(d: Dict[Any, Any]) -> "Animation":
         """
         Converts the given dict into an Animation.
         """
-        frames = [
+        frames = FrameArray.from_frames(
             Frame.from_dict(data)
             for name, data in sorted(
                 d["frames"].items(), key=lambda e: Animation.__get_frame_id(e[0])
             )
-        ]
+        )
         frame_tags = [FrameTag.from_dict(entry) for entry in d["meta"]["frameTags"]]
         image = d["meta"]["image"]
 
@@ -151,65 +336,52 @@ class Animation:
 
         return Animation(frames, frame_tags, image)
 
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Converts the Animation into a dict in the format of an Aseprite sprite sheet JSON file, the
+        same format that from_dict reads.
+        """
+        frame_name = self.image.rsplit(".", 1)[0]
+
+        return {
+            "frames": {
+                f"{frame_name} {i}.aseprite": frame.to_dict()
+                for i, frame in enumerate(self.frames)
+            },
+            "meta": {
+                "image": self.image,
+                "frameTags": [frame_tag.to_dict() for frame_tag in self.frame_tags],
+            },
+        }
+
     @staticmethod
     def from_scn(input_stream: IO[bytes]) -> "Animation":
         """
         Reads in an Animation from the given Godot scn file input stream.
+
+        Only the parts of the file that describe the frames are decoded. All other properties of
+        the scene are skipped over.
         """
         header = ResourceHeader.from_stream(input_stream)
 
         assert len(header.ext_resources) == 1, header.ext_resources
         image = header.ext_resources[0][1].replace("\x00", "").split("/")[-1]
 
-        sections = []
-        main_section_ = None
-        for i, (_, offset) in enumerate(header.int_resources):
-            main = i == (len(header.int_resources) - 1)
-
-            input_stream.seek(offset)
-            _rtype = read_unicode_string(input_stream, header.endian)
-
-            pc = int.from_bytes(input_stream.read(4), header.endian)
-
-            properties: List[Tuple[str, PropertyValue]] = []
-            for _ in range(0, pc):
-                name = get_string(input_stream, header.endian, header.string_map)
-                variant = read_variant(input_stream, header.endian, header.string_map)
-
-                properties.append((name, variant))
-
-            properties_by_name = {
-                prop[0].rstrip("\x00"): prop[1] for prop in properties
-            }
-
-            if main:
-                main_section_ = properties_by_name
-
-            sections.append(properties_by_name)
-
-        assert main_section_ is not None
-        assert isinstance(main_section_, dict)
-        for key, value in main_section_.items():
-            assert isinstance(key, str)
-            assert isinstance(value, dict)
-            for key_2 in value.keys():
-                assert isinstance(key_2, str)
-        main_section: Dict[str, Dict[str, PropertyValue]] = cast(
-            Dict[str, Dict[str, PropertyValue]], main_section_
+        main_offset = header.int_resources[-1][1]
+        found = seek_to_property(
+            input_stream, header, main_offset, "_bundled"
+        ) and seek_to_dictionary_key(
+            input_stream, header.endian, header.string_map, "names"
         )
+        assert found, "Could not find the names of the scene's nodes and properties."
 
-        names = main_section["_bundled"]["names\x00"]
-        variants = main_section["_bundled"]["variants\u0000"]
+        names = read_variant(input_stream, header.endian, header.string_map)
 
         assert isinstance(names, list)
         for n in names:
             assert isinstance(n, str)
         names = cast(List[str], names)
 
-        assert isinstance(variants, list)
-        variants = cast(List[Any], variants)
-
-        animations_dict = {}
         animation_names = []
         for n in names:
             if n.startswith("anims/"):
@@ -222,57 +394,94 @@ class Animation:
         #
         # The names and variants do not mach up in order, so this was the only was I was able to
         # get the correct animation frames for each animation.
+        animations = {}
         for i, animation_name in enumerate(animation_names):
-            animations_dict[animation_name] = InternalResourceIndex(index=1 + i)
+            _, offset = header.int_resources[1 + i]
 
-        animations = {}
-        for animation_name, v in animations_dict.items():
-            if isinstance(v, InternalResourceIndex):
-                data_ = sections[v.index]["tracks/0/keys"]
-
-                assert isinstance(data_, dict)
-                for key in data_:
-                    assert isinstance(key, str)
-                data = cast(Dict[str, Any], data_)
-
-                animation_frames = []
-                for rect_2 in data["values\x00"]:
-                    assert isinstance(rect_2, Rect2)
-                    frame = Frame(
-                        Box(
-                            x=round(rect_2.position.x),
-                            y=round(rect_2.position.y),
-                            width=round(rect_2.size.x),
-                            height=round(rect_2.size.y),
-                        )
-                    )
-
-                    animation_frames.append(frame)
-
-                animations[animation_name.replace("anims/", "")] = animation_frames
+            found = seek_to_property(
+                input_stream, header, offset, "tracks/0/keys"
+            ) and seek_to_dictionary_key(
+                input_stream, header.endian, header.string_map, "values"
+            )
+            assert found, f"Could not find the frames of animation: {animation_name}"
+
+            animations[
+                animation_name.replace("anims/", "")
+            ] = Animation.__read_rect_array(input_stream, header)
 
         frames, frame_tags = Animation.__reconstruct_frames_info(animations)
 
         return Animation(frames, frame_tags, image)
 
+    @staticmethod
+    def __read_rect_array(
+        input_stream: IO[bytes], header: ResourceHeader
+    ) -> "array.array[int]":
+        """
+        Reads an array variant of Rect2s into a flat array of rounded x, y, width, and height
+        values.
+        """
+        start = input_stream.tell()
+
+        t = int.from_bytes(input_stream.read(4), header.endian)
+        assert t == VariantBin.VARIANT_ARRAY.value, t
+        length = int.from_bytes(input_stream.read(4), header.endian) & 0x7FFFFFFF
+
+        # Each element is a Rect2 variant, which is a type id followed by four floats. So the
+        # whole array can be unpacked at once, as long as every element really is a Rect2.
+        prefix = "<" if header.endian == "little" else ">"
+        data = input_stream.read(20 * length)
+        values = (
+            struct.unpack(prefix + "I4f" * length, data)
+            if len(data) == 20 * length
+            else ()
+        )
+        if len(values) == 5 * length and all(
+            values[j] == VariantBin.VARIANT_RECT2.value
+            for j in range(0, len(values), 5)
+        ):
+            return array.array(
+                "i", (round(values[j]) for j in range(0, len(values)) if j % 5 != 0)
+            )
+
+        input_stream.seek(start)
+        rects = read_variant(input_stream, header.endian, header.string_map)
+        assert isinstance(rects, list)
+
+        boxes = array.array("i")
+        for rect_2 in rects:
+            assert isinstance(rect_2, Rect2)
+            boxes.extend(
+                (
+                    round(rect_2.position.x),
+                    round(rect_2.position.y),
+                    round(rect_2.size.x),
+                    round(rect_2.size.y),
+                )
+            )
+
+        return boxes
+
     @staticmethod
     def __reconstruct_frames_info(
-        animations: Dict[str, List[Frame]]
-    ) -> Tuple[List[Frame], List[FrameTag]]:
+        animations: Dict[str, "array.array[int]"]
+    ) -> Tuple[FrameArray, List[FrameTag]]:
         # Note: I originally used a more complex scheme where I tried to pack together re-used
         # frames, but that ran into issues that I was unable to fix.
 
         frame_tags = []
-        frames: List[Frame] = []
-        for animation_name, animation_frames in animations.items():
-            start_frame = len(frames)
-            end_frame = len(frames) + len(animation_frames)
+        boxes = array.array("i")
+        for animation_name, animation_boxes in animations.items():
+            start_frame = len(boxes) // 4
+            end_frame = start_frame + len(animation_boxes) // 4
 
-            frames += animation_frames
+            boxes.extend(animation_boxes)
 
-            frame_tags.append(FrameTag(animation_name, start_frame, end_frame))
+            frame_tags.append(
+                FrameTag(sys.intern(animation_name), start_frame, end_frame)
+            )
 
-        return frames, frame_tags
+        return FrameArray(boxes), frame_tags
 
     @staticmethod
     def __get_frame_id(frame_name: str) -> int:
@@ -0,0 +1,194 @@
+"""
+Classes for caching animations recovered from compiled Godot ".scn" files as JSON files.
+"""
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+import json
+import os
+import pathlib
+
+from .animation import Animation
+
+INDEX_FILENAME = "index.json"
+INDEX_VERSION = 1
+
+
+@dataclass(frozen=True)
+class AnimationCacheEntry:
+    """
+    Information on a single cached animation.
+    """
+
+    source: str  #: res:// path of the compiled ".scn" file that the animation was recovered from.
+    source_mtime_ns: int  #: Modification time of the compiled file when it was cached.
+    source_size: int  #: Size in bytes of the compiled file when it was cached.
+
+    def is_fresh(self, source: str, source_filepath: pathlib.Path) -> bool:
+        """
+        Returns True if the animation was cached from the compiled file at the given res:// path,
+        and the given filepath of that compiled file has not changed since it was cached.
+        """
+        if source != self.source:
+            return False
+
+        try:
+            stat = source_filepath.stat()
+        except OSError:
+            return False
+
+        return (
+            stat.st_mtime_ns == self.source_mtime_ns
+            and stat.st_size == self.source_size
+        )
+
+    @staticmethod
+    def from_source(
+        source: str, source_filepath: pathlib.Path
+    ) -> "AnimationCacheEntry":
+        """
+        Creates an entry for an animation recovered from the given compiled file.
+        """
+        stat = source_filepath.stat()
+
+        return AnimationCacheEntry(
+            source=source, source_mtime_ns=stat.st_mtime_ns, source_size=stat.st_size
+        )
+
+    @staticmethod
+    def from_dict(d: Dict[Any, Any]) -> "AnimationCacheEntry":
+        """
+        Converts the given dict into an AnimationCacheEntry.
+        """
+        source = d["source"]
+        source_mtime_ns = d["source_mtime_ns"]
+        source_size = d["source_size"]
+
+        assert isinstance(source, str)
+        assert isinstance(source_mtime_ns, int)
+        assert isinstance(source_size, int)
+
+        return AnimationCacheEntry(
+            source=source, source_mtime_ns=source_mtime_ns, source_size=source_size
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Converts the AnimationCacheEntry into a dict.
+        """
+        return {
+            "source": self.source,
+            "source_mtime_ns": self.source_mtime_ns,
+            "source_size": self.source_size,
+        }
+
+
+class AnimationCache:
+    """
+    A directory of recovered animation JSON files, laid out by their res:// paths, along with an
+    index file recording which compiled file each one came from.
+    """
+
+    def __init__(
+        self,
+        directory: str | os.PathLike,
+        entries: Optional[Dict[str, AnimationCacheEntry]] = None,
+    ) -> None:
+        self.directory = pathlib.Path(directory)
+        self.entries: Dict[str, AnimationCacheEntry] = (
+            entries if entries is not None else {}
+        )
+
+    @staticmethod
+    def load(directory: str | os.PathLike) -> "AnimationCache":
+        """
+        Loads the cache in the given directory. If the directory does not have an index file (or
+        has one of an unsupported version), then the cache will start out empty.
+        """
+        directory = pathlib.Path(directory)
+
+        index_filepath = directory / INDEX_FILENAME
+        if not index_filepath.exists():
+            return AnimationCache(directory)
+
+        with open(index_filepath, "r", encoding="utf-8") as input_stream:
+            index = json.load(input_stream)
+
+        if index.get("version") != INDEX_VERSION:
+            return AnimationCache(directory)
+
+        return AnimationCache(
+            directory,
+            {
+                path: AnimationCacheEntry.from_dict(entry)
+                for path, entry in index["animations"].items()
+            },
+        )
+
+    def save(self) -> None:
+        """
+        Writes out the index file of the cache.
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        with open(
+            self.directory / INDEX_FILENAME, "w", encoding="utf-8"
+        ) as output_stream:
+            json.dump(
+                {
+                    "version": INDEX_VERSION,
+                    "animations": {
+                        path: entry.to_dict()
+                        for path, entry in sorted(self.entries.items())
+                    },
+                },
+                output_stream,
+                indent=2,
+            )
+
+    def get_filepath(self, path: str) -> pathlib.Path:
+        """
+        Returns the filepath that the cached JSON file for the animation at the given res:// path
+        is stored at.
+        """
+        assert path.startswith("res://"), path
+
+        return self.directory / path.split("res://")[1]
+
+    def is_fresh(self, path: str, source: str, source_filepath: pathlib.Path) -> bool:
+        """
+        Returns True if the cache has an up-to-date copy of the animation at the given res://
+        path, which was compiled to the file at the given res:// source path and filepath.
+        """
+        entry = self.entries.get(path)
+
+        return (
+            entry is not None
+            and entry.is_fresh(source, source_filepath)
+            and self.get_filepath(path).exists()
+        )
+
+    def get(
+        self, path: str, source: str, source_filepath: pathlib.Path
+    ) -> Optional[Animation]:
+        """
+        Returns the cached copy of the animation at the given res:// path, which was compiled to
+        the file at the given res:// source path and filepath. Returns None if the animation is
+        not cached, was cached from a different compiled file, or the compiled file has changed
+        since it was cached.
+        """
+        if not self.is_fresh(path, source, source_filepath):
+            return None
+
+        with open(self.get_filepath(path), "r", encoding="utf-8") as input_stream:
+            return Animation.from_dict(json.load(input_stream))
+
+
+def write_animation_json(animation: Animation, filepath: pathlib.Path) -> None:
+    """
+    Writes the given animation out to the given filepath as an Aseprite style JSON file.
+    """
+    filepath.parent.mkdir(parents=True, exist_ok=True)
+
+    with open(filepath, "w", encoding="utf-8") as output_stream:
+        json.dump(animation.to_dict(), output_stream)
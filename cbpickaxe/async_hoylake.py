@@ -0,0 +1,355 @@
+"""
+Code for loading in data files from asyncio code without blocking the event loop.
+"""
+from typing import (
+    Any,
+    Coroutine,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+)
+
+import asyncio
+import concurrent.futures
+import io
+import os
+import sys
+import time
+
+from .animation import Animation
+from .elemental_type import ElementalType
+from .hoylake import Hoylake, RootName
+from .item import Item
+from .misc_types import Color, intern_color
+from .monster_form import MonsterForm
+from .move import Move
+
+T = TypeVar("T")
+U = TypeVar("U")
+
+
+class AsyncHoylake:
+    """
+    An asyncio wrapper around a Hoylake.
+
+    Files are read in worker threads and parsed in a pool of worker processes, so that loading in
+    many files does not block the event loop. Loaded resources are stored in the wrapped Hoylake,
+    so they are shared with any code that uses it directly.
+
+    Animations are loaded by the wrapped Hoylake in a worker thread, one at a time, since they
+    are not parsed with the ".tres" parser.
+
+    Concurrent requests for the same file are only loaded once, with every request waiting for
+    and getting the same result. Cancelling one request does not cancel the load for the other
+    requests.
+
+    Files parsed in worker processes are included in the stats of the wrapped Hoylake (see
+    `Hoylake.get_stats`). Once they are sent back, the same strings and colors are interned as for
+    files loaded by the Hoylake itself (ex. tags and res:// paths).
+
+    .. code-block:: python
+
+        async with cbp.AsyncHoylake() as hoylake:
+            await hoylake.load_root("base", "my_decompiled_copy_of_cassette_beasts")
+
+            monster_forms = await hoylake.load_monster_forms("res://data/monster_forms/")
+    """
+
+    def __init__(
+        self,
+        hoylake: Optional[Hoylake] = None,
+        max_concurrent_reads: int = 32,
+        max_concurrent_parses: Optional[int] = None,
+        parse_executor: Optional[concurrent.futures.Executor] = None,
+    ) -> None:
+        """
+        Wraps the given Hoylake, or a new one if none is given.
+
+        At most `max_concurrent_reads` files are read at once, and at most `max_concurrent_parses`
+        files are parsed at once (defaults to the number of CPUs).
+
+        Parsing is done in the given executor. If none is given, then a process pool is created
+        when it is first needed and shut down by `close`. The parser used for ".tres" files can
+        only be used by one thread at a time in each process, so a given executor should be a
+        process pool or a single thread.
+        """
+        self.hoylake = hoylake if hoylake is not None else Hoylake()
+
+        if max_concurrent_parses is None:
+            max_concurrent_parses = os.cpu_count() or 1
+
+        self.__read_semaphore = asyncio.Semaphore(max_concurrent_reads)
+        self.__parse_semaphore = asyncio.Semaphore(max_concurrent_parses)
+
+        self.__parse_executor = parse_executor
+        self.__owns_parse_executor = parse_executor is None
+        self.__max_workers = max_concurrent_parses
+
+        self.__animation_lock = asyncio.Lock()
+
+        self.__in_flight: Dict[Tuple[type, str], "asyncio.Task[Any]"] = {}
+
+    async def __aenter__(self) -> "AsyncHoylake":
+        return self
+
+    async def __aexit__(self, *_: Any) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """
+        Shuts down the process pool used for parsing, if this AsyncHoylake created it.
+        """
+        if self.__owns_parse_executor and self.__parse_executor is not None:
+            executor = self.__parse_executor
+            self.__parse_executor = None
+
+            await asyncio.to_thread(executor.shutdown)
+
+    async def load_root(self, name: str, new_root: str | os.PathLike) -> None:
+        """
+        Adds the given root directory to the list of known root directories. See
+        `Hoylake.load_root`.
+        """
+        await asyncio.to_thread(self.hoylake.load_root, name, new_root)
+
+    async def load_elemental_type(self, path: str) -> Tuple[RootName, ElementalType]:
+        """
+        Loads in the elemental type at the given res:// filepath. See
+        `Hoylake.load_elemental_type`.
+        """
+        return await self.__load_resource(ElementalType, path)
+
+    async def load_elemental_types(
+        self, path: str
+    ) -> Dict[str, Tuple[RootName, ElementalType]]:
+        """
+        Loads in all of the elemental types within the given res:// directory path. See
+        `Hoylake.load_elemental_types`.
+        """
+        return await self.__load_resources(ElementalType, path)
+
+    async def load_monster_form(self, path: str) -> Tuple[RootName, MonsterForm]:
+        """
+        Loads in the monster form at the given res:// filepath. See `Hoylake.load_monster_form`.
+        """
+        return await self.__load_resource(MonsterForm, path)
+
+    async def load_monster_forms(
+        self, path: str
+    ) -> Dict[str, Tuple[RootName, MonsterForm]]:
+        """
+        Loads in all of the monster forms within the given res:// directory path. See
+        `Hoylake.load_monster_forms`.
+        """
+        return await self.__load_resources(MonsterForm, path)
+
+    async def load_move(self, path: str) -> Tuple[RootName, Move]:
+        """
+        Loads in the move at the given res:// filepath. See `Hoylake.load_move`.
+        """
+        return await self.__load_resource(Move, path)
+
+    async def load_moves(self, path: str) -> Dict[str, Tuple[RootName, Move]]:
+        """
+        Loads in all of the moves within the given res:// directory path. See
+        `Hoylake.load_moves`.
+        """
+        return await self.__load_resources(Move, path)
+
+    async def load_item(self, path: str) -> Tuple[RootName, Item]:
+        """
+        Loads in the item at the given res:// filepath. See `Hoylake.load_item`.
+        """
+        return await self.__load_resource(Item, path)
+
+    async def load_items(self, path: str) -> Dict[str, Tuple[RootName, Item]]:
+        """
+        Loads in all of the items within the given res:// directory path. See
+        `Hoylake.load_items`.
+        """
+        return await self.__load_resources(Item, path)
+
+    async def load_animation(self, path: str) -> Animation:
+        """
+        Loads in the animation at the given res:// filepath. See `Hoylake.load_animation`.
+        """
+        loaded = self.hoylake.get_loaded(Animation, path)
+        if loaded is not None:
+            return loaded[1]
+
+        return await self.__load_once(Animation, path, self.__read_animation(path))
+
+    async def translate_many(
+        self, strings: Iterable[str], locale: Optional[str] = None
+    ) -> List[str]:
+        """
+        Translates each of the given strings to the specified locale. See `Hoylake.translate`.
+
+        All of the strings are translated together in a single worker thread.
+        """
+        strings = list(strings)
+
+        return await asyncio.to_thread(
+            lambda: [self.hoylake.translate(string, locale) for string in strings]
+        )
+
+    async def __load_resources(
+        self, resource_type: Type[T], path: str
+    ) -> Dict[str, Tuple[RootName, T]]:
+        resource_files = await asyncio.to_thread(self.hoylake.find_resources, path)
+
+        results = await asyncio.gather(
+            *(
+                self.__load_resource(resource_type, resource_path)
+                for resource_path, _, _ in resource_files
+            )
+        )
+
+        return {
+            resource_path: result
+            for (resource_path, _, _), result in zip(resource_files, results)
+        }
+
+    async def __load_resource(
+        self, resource_type: Type[T], path: str
+    ) -> Tuple[RootName, T]:
+        loaded = self.hoylake.get_loaded(resource_type, path)
+        if loaded is not None:
+            return loaded
+
+        return await self.__load_once(
+            resource_type, path, self.__read_and_parse(resource_type, path)
+        )
+
+    async def __load_once(
+        self, resource_type: type, path: str, load: Coroutine[Any, Any, U]
+    ) -> U:
+        """
+        Runs the given load coroutine as its own task, unless another coroutine is already
+        loading the same file, and waits for its result.
+
+        The task is shared by every coroutine that requests the file, and each of them waits on
+        it through a shield, so cancelling one of them does not cancel the load for the others.
+        """
+        key = (resource_type, path)
+
+        task = self.__in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(load)
+            self.__in_flight[key] = task
+            task.add_done_callback(lambda done: self.__finish_load(key, done))
+        else:
+            # Not needed, since the file is already being loaded
+            load.close()
+
+        result: U = await asyncio.shield(task)
+        return result
+
+    def __finish_load(self, key: Tuple[type, str], task: "asyncio.Task[Any]") -> None:
+        if self.__in_flight.get(key) is task:
+            del self.__in_flight[key]
+
+        # Mark any exception as retrieved, in case every coroutine waiting on it was cancelled
+        if not task.cancelled():
+            task.exception()
+
+    async def __read_and_parse(
+        self, resource_type: Type[T], path: str
+    ) -> Tuple[RootName, T]:
+        async with self.__read_semaphore:
+            root_name, filepath = await asyncio.to_thread(
+                self.hoylake.find_resource, path
+            )
+
+            start_time = time.perf_counter()
+            data = await asyncio.to_thread(filepath.read_bytes)
+            read_seconds = time.perf_counter() - start_time
+
+        async with self.__parse_semaphore:
+            resource, parse_seconds = await asyncio.get_running_loop().run_in_executor(
+                self.__get_parse_executor(), _parse_tres, resource_type, data
+            )
+
+        # Strings and colors interned in the worker process are separate objects once they are
+        # sent back to this process
+        _intern_shared(resource)
+
+        self.hoylake.record_load(resource, len(data), read_seconds, parse_seconds)
+        self.hoylake.add_loaded(resource_type, path, root_name, resource)
+
+        return root_name, resource
+
+    async def __read_animation(self, path: str) -> Animation:
+        # The wrapped Hoylake may not be thread-safe
+        async with self.__animation_lock:
+            return await asyncio.to_thread(self.hoylake.load_animation, path)
+
+    def __get_parse_executor(self) -> concurrent.futures.Executor:
+        if self.__parse_executor is None:
+            self.__parse_executor = concurrent.futures.ProcessPoolExecutor(
+                max_workers=self.__max_workers
+            )
+
+        return self.__parse_executor
+
+
+def _parse_tres(resource_type: Type[T], data: bytes) -> Tuple[T, float]:
+    # Run in worker processes, so this needs to be a module-level function
+    start_time = time.perf_counter()
+    resource: T = getattr(resource_type, "from_tres")(
+        io.TextIOWrapper(io.BytesIO(data), encoding="utf-8")
+    )
+
+    return resource, time.perf_counter() - start_time
+
+
+def _intern_shared(resource: Any) -> None:
+    """
+    Interns the strings and colors of the given resource that are shared between many resources
+    (ex. tags, elemental type names and res:// paths), replacing them in place. These are the same
+    fields that are interned when parsing the resource (see `MonsterForm.from_tres`), so resources
+    loaded by the AsyncHoylake and by the Hoylake itself share memory in the same way.
+    """
+    if isinstance(resource, MonsterForm):
+        resource.swap_colors = _intern_colors(resource.swap_colors)
+        resource.default_palette = _intern_colors(resource.default_palette)
+        resource.emission_palette = _intern_colors(resource.emission_palette)
+        resource.battle_cry = _intern_optional(resource.battle_cry)
+        resource.elemental_types = _intern_strings(resource.elemental_types)
+        resource.require_dlc = sys.intern(resource.require_dlc)
+        resource.move_tags = _intern_strings(resource.move_tags)
+        resource.battle_sprite_path = sys.intern(resource.battle_sprite_path)
+
+        for evolution in resource.evolutions:
+            evolution.evolved_form = sys.intern(evolution.evolved_form)
+
+        for i, upgrade in enumerate(resource.tape_upgrades):
+            if isinstance(upgrade, str):
+                resource.tape_upgrades[i] = sys.intern(upgrade)
+            else:
+                upgrade.sticker = sys.intern(upgrade.sticker)
+    elif isinstance(resource, Move):
+        resource.category_name = sys.intern(resource.category_name)
+        resource.tags = _intern_strings(resource.tags)
+        resource.elemental_types = _intern_strings(resource.elemental_types)
+    elif isinstance(resource, Item):
+        resource.category = sys.intern(resource.category)
+        resource.icon = _intern_optional(resource.icon)
+    elif isinstance(resource, ElementalType):
+        resource.palette = _intern_colors(resource.palette)
+
+
+def _intern_strings(strings: List[str]) -> List[str]:
+    return [sys.intern(string) for string in strings]
+
+
+def _intern_optional(string: Optional[str]) -> Optional[str]:
+    return sys.intern(string) if string is not None else None
+
+
+def _intern_colors(colors: List[Color]) -> List[Color]:
+    return [intern_color(color) for color in colors]
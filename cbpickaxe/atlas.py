@@ -0,0 +1,182 @@
+"""
+Classes and functions for packing many sprites into texture atlases.
+"""
+from dataclasses import dataclass
+from typing import Dict, List, Mapping, Optional, Tuple
+
+from .animation import Box
+
+
+@dataclass(frozen=True)
+class AtlasEntry:
+    """
+    The location of a single sprite within a set of texture atlas pages.
+    """
+
+    page: int  #: Index of the atlas page that the sprite was placed on.
+    box: Box  #: Area of the atlas page that the sprite takes up.
+
+
+@dataclass
+class AtlasPage:
+    """
+    A single texture atlas image.
+    """
+
+    width: int  #: Width of the page, trimmed down to the area actually used by sprites.
+    height: int  #: Height of the page, trimmed down to the area actually used by sprites.
+
+
+@dataclass
+class _SkylineSegment:
+    x: int
+    y: int
+    width: int
+
+
+# pylint: disable-next=too-few-public-methods
+class _SkylinePage:
+    """
+    A page packed using the skyline bottom-left heuristic. The skyline tracks the highest used
+    position for each horizontal span of the page, and each new rectangle is placed wherever it
+    would end up lowest.
+    """
+
+    def __init__(self, width: int, height: int) -> None:
+        self.width = width
+        self.height = height
+        self.used_width = 0
+        self.used_height = 0
+        self.__skyline = [_SkylineSegment(0, 0, width)]
+
+    def insert(self, width: int, height: int) -> Optional[Tuple[int, int]]:
+        """
+        Places a rectangle of the given size onto the page, returning its position. Returns None
+        if the rectangle does not fit anywhere on the page.
+        """
+        best: Optional[Tuple[int, int, int]] = None
+        best_key: Optional[Tuple[int, int]] = None
+        for i, segment in enumerate(self.__skyline):
+            y = self.__fit(i, width, height)
+            if y is None:
+                continue
+
+            key = (y + height, segment.x)
+            if best_key is None or key < best_key:
+                best = (i, segment.x, y)
+                best_key = key
+
+        if best is None:
+            return None
+
+        i, x, y = best
+        self.__add_segment(i, x, y + height, width)
+
+        self.used_width = max(self.used_width, x + width)
+        self.used_height = max(self.used_height, y + height)
+
+        return x, y
+
+    def __fit(self, index: int, width: int, height: int) -> Optional[int]:
+        x = self.__skyline[index].x
+        if x + width > self.width:
+            return None
+
+        y = 0
+        remaining = width
+        while remaining > 0:
+            if index >= len(self.__skyline):
+                return None
+
+            segment = self.__skyline[index]
+            y = max(y, segment.y)
+            if y + height > self.height:
+                return None
+
+            remaining -= segment.width
+            index += 1
+
+        return y
+
+    def __add_segment(self, index: int, x: int, y: int, width: int) -> None:
+        self.__skyline.insert(index, _SkylineSegment(x, y, width))
+
+        # Shrink or remove the segments that are now covered by the new one
+        i = index + 1
+        while i < len(self.__skyline):
+            previous = self.__skyline[i - 1]
+            segment = self.__skyline[i]
+
+            overlap = previous.x + previous.width - segment.x
+            if overlap <= 0:
+                break
+
+            segment.x += overlap
+            segment.width -= overlap
+            if segment.width > 0:
+                break
+
+            del self.__skyline[i]
+
+        # Merge neighboring segments at the same height
+        i = 0
+        while i < len(self.__skyline) - 1:
+            segment = self.__skyline[i]
+            next_segment = self.__skyline[i + 1]
+            if segment.y == next_segment.y:
+                segment.width += next_segment.width
+                del self.__skyline[i + 1]
+            else:
+                i += 1
+
+
+def pack_sprites(
+    sizes: Mapping[str, Tuple[int, int]],
+    page_width: int = 2048,
+    page_height: int = 2048,
+    padding: int = 1,
+) -> Tuple[List[AtlasPage], Dict[str, AtlasEntry]]:
+    """
+    Packs sprites of the given (width, height) sizes into as few atlas pages of the given size as
+    possible.
+
+    Returns the pages (trimmed down to the area that they use) and the location of each sprite,
+    keyed by the same keys as the given sizes. Only the sizes of the sprites are needed, so the
+    sprite images can be loaded one at a time afterwards when drawing the pages.
+
+    If a sprite is too large to fit on a page, then a ValueError will be raised.
+    """
+    for name, (width, height) in sizes.items():
+        if width + padding > page_width or height + padding > page_height:
+            raise ValueError(
+                f"Sprite {name} of size {width}x{height} does not fit on a {page_width}x{page_height} atlas page."
+            )
+
+    # Placing the tallest sprites first gives a flatter skyline and so less wasted space
+    order = sorted(
+        sizes.items(), key=lambda entry: (-entry[1][1], -entry[1][0], entry[0])
+    )
+
+    pages: List[_SkylinePage] = []
+    entries: Dict[str, AtlasEntry] = {}
+    for name, (width, height) in order:
+        for page_index, page in enumerate(pages):
+            position = page.insert(width + padding, height + padding)
+            if position is not None:
+                break
+        else:
+            pages.append(_SkylinePage(page_width, page_height))
+            page_index = len(pages) - 1
+            position = pages[-1].insert(width + padding, height + padding)
+
+        assert position is not None
+        x, y = position
+        entries[name] = AtlasEntry(page=page_index, box=Box(x, y, width, height))
+
+    return [
+        AtlasPage(
+            width=max(page.used_width - padding, 1),
+            height=max(page.used_height - padding, 1),
+        )
+        for page in pages
+    ], {name: entries[name] for name in sizes}
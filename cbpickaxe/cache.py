@@ -0,0 +1,291 @@
+"""
+Classes for caching loaded data files in memory.
+"""
+from dataclasses import dataclass
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generic,
+    Iterator,
+    MutableMapping,
+    Optional,
+    Set,
+    TypeVar,
+)
+
+import collections
+import dataclasses
+import sys
+import threading
+
+K = TypeVar("K")
+V = TypeVar("V")
+
+
+@dataclass(frozen=True)
+class CacheInfo:
+    """
+    Information on the current state of a cache.
+    """
+
+    entries: int  #: Number of entries currently in the cache.
+    pinned_entries: int  #: Number of those entries that are pinned, and so are never evicted.
+    max_entries: Optional[int]  #: Maximum number of unpinned entries, if limited.
+    hits: int  #: Number of lookups that found an entry.
+    misses: int  #: Number of lookups that did not find an entry.
+    evictions: int  #: Number of entries that have been evicted to stay within the limit.
+    approx_bytes: int  #: Approximate number of bytes of memory used by the cached values.
+
+
+class LRUCache(MutableMapping[K, V], Generic[K, V]):
+    """
+    A mapping that holds up to a maximum number of entries, evicting the least recently used
+    entries once it is full.
+
+    Entries that the given `is_pinned` function returns True for are pinned. Pinned entries are
+    never evicted and do not count towards the maximum number of entries.
+
+    The cache is safe to use from several threads at once. Every change and iteration holds a
+    lock, and iteration goes over a snapshot of the keys. Lookups also hold the lock, in order to
+    track which entries were most recently used, except for lookups that find an entry in a cache
+    without a maximum number of entries. Those have no recency to track, and so do not wait on
+    the lock. Their hits may then be slightly undercounted when several threads hit at once.
+    """
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        is_pinned: Optional[Callable[[K, V], bool]] = None,
+    ) -> None:
+        if max_entries is not None and max_entries < 0:
+            raise ValueError(
+                f"Maximum number of cache entries must be non-negative, got: {max_entries}"
+            )
+
+        self.max_entries = max_entries
+        self.is_pinned = is_pinned
+
+        self.__lock = threading.Lock()
+        self.__entries: collections.OrderedDict[K, V] = collections.OrderedDict()
+        self.__pinned: Dict[K, V] = {}
+
+        self.__hits = 0
+        self.__misses = 0
+        self.__evictions = 0
+
+    def get(  # type: ignore[override]
+        self, key: K, default: Optional[V] = None
+    ) -> Optional[V]:
+        """
+        Returns the value for the given key, marking it as the most recently used entry. Returns
+        the given default if the key is not in the cache.
+        """
+        if self.max_entries is None:
+            value = self.__get_unlocked(key)
+            if value is not None:
+                self.__hits += 1
+                return value
+
+        with self.__lock:
+            try:
+                value = self.__get(key)
+            except KeyError:
+                self.__misses += 1
+                return default
+
+            self.__hits += 1
+            return value
+
+    def peek(self, key: K, default: Optional[V] = None) -> Optional[V]:
+        """
+        Returns the value for the given key without marking it as used or counting the lookup as
+        a hit or miss. Returns the given default if the key is not in the cache.
+        """
+        with self.__lock:
+            value = self.__get_unlocked(key)
+
+        return value if value is not None else default
+
+    def pop(self, key: K, *default: Any) -> Any:
+        """
+        Removes the entry for the given key and returns its value. Returns the given default if
+        the key is not in the cache, or raises a KeyError if no default is given.
+        """
+        with self.__lock:
+            if key in self.__pinned:
+                return self.__pinned.pop(key)
+            elif key in self.__entries or len(default) == 0:
+                return self.__entries.pop(key)
+
+        return default[0]
+
+    def set_max_entries(self, max_entries: Optional[int]) -> None:
+        """
+        Changes the maximum number of unpinned entries, evicting entries if needed.
+        """
+        if max_entries is not None and max_entries < 0:
+            raise ValueError(
+                f"Maximum number of cache entries must be non-negative, got: {max_entries}"
+            )
+
+        with self.__lock:
+            self.max_entries = max_entries
+            self.__evict()
+
+    def repin(self) -> None:
+        """
+        Re-checks which entries are pinned. Should be run after changing what `is_pinned` returns
+        for entries already in the cache.
+        """
+        with self.__lock:
+            entries = list(self.__pinned.items()) + list(self.__entries.items())
+            self.__pinned.clear()
+            self.__entries.clear()
+
+            for key, value in entries:
+                self.__set(key, value)
+
+    def info(self) -> CacheInfo:
+        """
+        Returns information on the current state of the cache.
+
+        The approximate number of bytes is found by walking all of the cached values, so this can
+        be slow for large caches.
+        """
+        with self.__lock:
+            values = list(self.__pinned.values()) + list(self.__entries.values())
+            info = CacheInfo(
+                entries=len(self.__pinned) + len(self.__entries),
+                pinned_entries=len(self.__pinned),
+                max_entries=self.max_entries,
+                hits=self.__hits,
+                misses=self.__misses,
+                evictions=self.__evictions,
+                approx_bytes=0,
+            )
+
+        # Walking the values can be slow, so it is done without holding the lock
+        seen: Set[int] = set()
+        approx_bytes = sum(approx_size(value, seen) for value in values)
+
+        return dataclasses.replace(info, approx_bytes=approx_bytes)
+
+    def __getitem__(self, key: K) -> V:
+        if self.max_entries is None:
+            value = self.__get_unlocked(key)
+            if value is not None:
+                return value
+
+        with self.__lock:
+            return self.__get(key)
+
+    def __setitem__(self, key: K, value: V) -> None:
+        with self.__lock:
+            self.__set(key, value)
+
+    def __delitem__(self, key: K) -> None:
+        with self.__lock:
+            if key in self.__pinned:
+                del self.__pinned[key]
+            else:
+                del self.__entries[key]
+
+    def __contains__(self, key: object) -> bool:
+        with self.__lock:
+            return key in self.__pinned or key in self.__entries
+
+    def __iter__(self) -> Iterator[K]:
+        # Iterate over a snapshot, so that other threads can add entries in the meantime
+        with self.__lock:
+            keys = list(self.__pinned.keys()) + list(self.__entries.keys())
+
+        return iter(keys)
+
+    def __len__(self) -> int:
+        with self.__lock:
+            return len(self.__pinned) + len(self.__entries)
+
+    def __get(self, key: K) -> V:
+        # Must be run while holding the lock
+        if key in self.__pinned:
+            return self.__pinned[key]
+
+        value = self.__entries[key]
+        self.__entries.move_to_end(key)
+
+        return value
+
+    def __get_unlocked(self, key: K) -> Optional[V]:
+        # Single dict lookups are atomic, so this can be run without holding the lock. A miss may
+        # be an entry that another thread is replacing, so misses should be checked again while
+        # holding the lock.
+        value = self.__pinned.get(key)
+        if value is None:
+            value = self.__entries.get(key)
+
+        return value
+
+    def __set(self, key: K, value: V) -> None:
+        # Must be run while holding the lock
+        self.__pinned.pop(key, None)
+        self.__entries.pop(key, None)
+
+        if self.is_pinned is not None and self.is_pinned(key, value):
+            self.__pinned[key] = value
+            return
+
+        self.__entries[key] = value
+        self.__evict()
+
+    def __evict(self) -> None:
+        # Must be run while holding the lock
+        if self.max_entries is None:
+            return
+
+        while len(self.__entries) > self.max_entries:
+            self.__entries.popitem(last=False)
+            self.__evictions += 1
+
+
+def approx_size(value: Any, seen: Optional[Set[int]] = None) -> int:
+    """
+    Returns the approximate number of bytes of memory used by the given value, including the
+    values it contains (ex. the fields of a dataclass, or the elements of a list).
+
+    Objects found in the given set of object ids are not counted, and the ids of counted objects
+    are added to it, so that objects shared between several values are only counted once.
+    """
+    if seen is None:
+        seen = set()
+
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+
+    size = sys.getsizeof(value)
+
+    if isinstance(value, (str, bytes, int, float, bool)) or value is None:
+        return size
+
+    if isinstance(value, dict):
+        size += sum(
+            approx_size(k, seen) + approx_size(v, seen) for k, v in value.items()
+        )
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(approx_size(element, seen) for element in value)
+    elif dataclasses.is_dataclass(value):
+        size += sum(
+            approx_size(getattr(value, field.name), seen)
+            for field in dataclasses.fields(value)
+        )
+    elif hasattr(value, "__dict__"):
+        size += approx_size(vars(value), seen)
+    elif hasattr(value, "__slots__"):
+        size += sum(
+            approx_size(getattr(value, name), seen)
+            for name in value.__slots__
+            if hasattr(value, name)
+        )
+
+    return size
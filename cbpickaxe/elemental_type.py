@@ -2,14 +2,17 @@
 Classes related to elemental types.
 """
 from dataclasses import dataclass
-from typing import cast, IO, List
+from typing import cast, Dict, IO, List, Mapping, Tuple
+
+import functools
 
 import godot_parser as gp
 
 from .misc_types import Color
+from .monster_form import MonsterForm
 
 
-@dataclass
+@dataclass(slots=True)
 class ElementalType:
     """
     An elemental type.
@@ -17,6 +20,22 @@ class ElementalType:
 
     palette: List[Color]  #: Color palette of the type.
 
+    def get_bootleg_color_mapping(
+        self, monster_form: MonsterForm
+    ) -> Dict[Color, Color]:
+        """
+        Returns a mapping from the swap colors of the given monster form to the colors that a
+        bootleg of that monster form with this elemental type uses.
+
+        The mapping can be applied to the monster's sprite sheet with
+        :func:`cbpickaxe.sprite_sheet.recolor`.
+        """
+        return dict(
+            _get_bootleg_color_mapping(
+                tuple(monster_form.swap_colors), tuple(self.palette)
+            )
+        )
+
     @staticmethod
     def from_tres(input_stream: IO[str]) -> "ElementalType":
         """
@@ -38,3 +57,61 @@ class ElementalType:
         palette = cast(List[gp.Color], palette)
 
         return ElementalType(palette=[Color.from_gp(color) for color in palette])
+
+
+def get_bootleg_color_mappings(
+    monster_form: MonsterForm, elemental_types: Mapping[str, ElementalType]
+) -> Dict[str, Dict[Color, Color]]:
+    """
+    Returns the bootleg color mappings of the given monster form for each of the given elemental
+    types, keyed by the same keys as the given elemental types.
+
+    Mappings are cached by swap colors and type palette, so monster forms that share swap colors
+    only have their mappings computed once per elemental type.
+    """
+    return {
+        name: elemental_type.get_bootleg_color_mapping(monster_form)
+        for name, elemental_type in elemental_types.items()
+    }
+
+
+@functools.lru_cache(maxsize=4096)
+def _get_bootleg_color_mapping(
+    swap_colors: Tuple[Color, ...], palette: Tuple[Color, ...]
+) -> Tuple[Tuple[Color, Color], ...]:
+    # TODO: test more. Glitter Jellyton is not working. Maybe RGB rounding?
+
+    if len(swap_colors) == 0:
+        return ()
+
+    if len(palette) == 0:
+        return ()
+
+    # TODO: handle default palette of monster form if it exists
+    source_colors = list(swap_colors)
+    output_colors = list(swap_colors)
+
+    # Replicating the game's approach. This loop's condition is weird. I don't know what the
+    # intent with it is.
+    i = 0
+    while i < len(output_colors) and output_colors[i] == palette[0]:
+        i += len(palette)
+
+    if i >= len(output_colors):
+        # This branch appears to never trigger. I'm not sure what the intent was in the game's
+        # code.
+        for j, type_color in enumerate(palette):
+            output_colors[j] = type_color
+    else:
+        # "Swap" the existing colors. If the bootleg does not have swapped colors, then the
+        # next loop will overwrite this.
+        for j in range(0, len(palette)):
+            output_colors[j] = output_colors[i + j]
+
+        # Apply the palette of the elemental type
+        for j, type_color in enumerate(palette):
+            output_colors[i + j] = type_color
+
+    assert len(source_colors) == len(output_colors)
+
+    return tuple(dict(zip(source_colors, output_colors)).items())
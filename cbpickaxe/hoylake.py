@@ -1,48 +1,179 @@
 """
 Code for loading in data files and querying data from them.
 """
-from typing import Dict, List, Iterable, Optional, Set, Tuple
+# pylint: disable=too-many-lines
+from typing import (
+    Any,
+    Callable,
+    ContextManager,
+    Dict,
+    Hashable,
+    IO,
+    List,
+    Iterable,
+    Iterator,
+    Mapping,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    TypeVar,
+)
 
 import collections
+import contextlib
+import io
 import json
 import logging
 import os
 import pathlib
+import pickle
 import re
+import struct
+import threading
+import zlib
 
 from .animation import Animation
+from .animation_cache import AnimationCache
+from .cache import CacheInfo, LRUCache
 from .elemental_type import ElementalType
 from .item import Item
 from .monster_form import MonsterForm
 from .move import Move
+from .stats import HoylakeStats, Stats
 from .translation_table import TranslationTable
 
 RelativeResPath = pathlib.Path
 RootName = str
 
+SNAPSHOT_MAGIC = b"CBPSNAP"
+SNAPSHOT_VERSION = 3
 
+# Files whose addition or removal can change what a Hoylake loads, and so makes a snapshot stale
+_SNAPSHOT_LISTED_SUFFIXES = (".tres", ".translation", ".import", ".json")
+
+T = TypeVar("T")
+
+# Matches the path of the compiled file in the [remap] section of a `.import` file. Textures can
+# have several platform specific compiled files instead (ex. `path.s3tc="..."`).
+_IMPORT_PATH_REGEX = re.compile(r'^path(\.\w+)?="(res://[^"]+)"', re.MULTILINE)
+
+
+# pylint: disable-next=too-few-public-methods
+class _SingleFlight:
+    """
+    Lets only one thread at a time hold a given key, with other threads waiting until it is
+    released. Used to make sure that each file is only loaded by one thread.
+    """
+
+    def __init__(self) -> None:
+        self.__lock = threading.Lock()
+        self.__key_locks: Dict[Hashable, Tuple[threading.Lock, int]] = {}
+
+    @contextlib.contextmanager
+    def hold(self, key: Hashable) -> Iterator[None]:
+        """
+        Waits until no other thread holds the given key, and then holds it until the end of the
+        with block.
+        """
+        with self.__lock:
+            key_lock, num_users = self.__key_locks.get(key, (threading.Lock(), 0))
+            self.__key_locks[key] = (key_lock, num_users + 1)
+
+        try:
+            with key_lock:
+                yield
+        finally:
+            with self.__lock:
+                key_lock, num_users = self.__key_locks[key]
+                if num_users == 1:
+                    del self.__key_locks[key]
+                else:
+                    self.__key_locks[key] = (key_lock, num_users - 1)
+
+
+# pylint: disable-next=too-many-public-methods
 class Hoylake:
     """
     A class that handles loading in data files from the decompiled game.
     """
 
-    def __init__(self, default_locale: Optional[str] = None) -> None:
+    def __init__(
+        self,
+        default_locale: Optional[str] = None,
+        thread_safe: bool = False,
+        cache_limits: Optional[Mapping[type, Optional[int]]] = None,
+        pinned_roots: Iterable[str] = (),
+    ) -> None:
+        """
+        By default every loaded file is kept in memory. cache_limits can be used to instead keep
+        at most a given number of each type of resource (ex. `{cbp.Animation: 100}`), evicting the
+        least recently used ones. Resources loaded from the roots named in pinned_roots (ex. the
+        base game) are always kept and do not count towards the limits. Methods like
+        `get_monster_forms_by_tags` only see the resources that are currently kept in memory.
+
+        If thread_safe is True, then one Hoylake can be shared between threads. Each file is then
+        only loaded in by one thread, with any other threads that request it at the same time
+        waiting for that thread to finish loading it. Requests for files that have already been
+        loaded do not need to wait on any locks, unless their type has a cache limit. Those take a
+        brief lock to keep track of which files were most recently used.
+
+        Roots should all be loaded before the Hoylake is shared between threads.
+        """
+        self.__thread_safe = thread_safe
+        self.__single_flight = _SingleFlight()
+        self.__parse_lock = threading.Lock()
+        self.__stats = Stats()
+
         self.__roots: Dict[str, pathlib.Path] = {}
+
+        # The translation files of each root, along with their locales and tables
+        self.__root_translations: Dict[
+            RootName, List[Tuple[pathlib.Path, str, TranslationTable]]
+        ] = {}
+
+        # All of the above, with the tables of each locale in the order of the roots
+        self.__translation_filepaths: List[pathlib.Path] = []
         self.__translation_tables: collections.defaultdict[
             str, List[TranslationTable]
         ] = collections.defaultdict(lambda: [])
 
         self.__default_locale = default_locale if default_locale is not None else "en"
 
-        self.__monster_forms: Dict[RelativeResPath, Tuple[RootName, MonsterForm]] = {}
-        self.__moves: Dict[RelativeResPath, Tuple[RootName, Move]] = {}
-        self.__animations: Dict[RelativeResPath, Tuple[RootName, Animation]] = {}
-        self.__items: Dict[RelativeResPath, Tuple[RootName, Item]] = {}
-        self.__elemental_types: Dict[
+        self.__pinned_roots = set(pinned_roots)
+        cache_limits = cache_limits if cache_limits is not None else {}
+
+        self.__monster_forms: LRUCache[
+            RelativeResPath, Tuple[RootName, MonsterForm]
+        ] = LRUCache(cache_limits.get(MonsterForm), self.__is_pinned)
+        self.__moves: LRUCache[RelativeResPath, Tuple[RootName, Move]] = LRUCache(
+            cache_limits.get(Move), self.__is_pinned
+        )
+        self.__animations: LRUCache[
+            RelativeResPath, Tuple[RootName, Animation]
+        ] = LRUCache(cache_limits.get(Animation), self.__is_pinned)
+        self.__items: LRUCache[RelativeResPath, Tuple[RootName, Item]] = LRUCache(
+            cache_limits.get(Item), self.__is_pinned
+        )
+        self.__elemental_types: LRUCache[
             RelativeResPath, Tuple[RootName, ElementalType]
-        ] = {}
+        ] = LRUCache(cache_limits.get(ElementalType), self.__is_pinned)
+
+        self.__animation_cache: Optional[AnimationCache] = None
+        self.__import_paths: Optional[
+            Dict[RelativeResPath, Tuple[RootName, str]]
+        ] = None
+        self.__compiled_filepaths: Dict[str, pathlib.Path] = {}
 
-        self.__moves_to_ignore = ["res://data/battle_moves/placeholder.tres"]
+        self.__loaded: Dict[type, LRUCache[RelativeResPath, Tuple[RootName, Any]]] = {
+            MonsterForm: self.__monster_forms,
+            Move: self.__moves,
+            Animation: self.__animations,
+            Item: self.__items,
+            ElementalType: self.__elemental_types,
+        }
+
+        self.__paths_to_ignore = {"res://data/battle_moves/placeholder.tres"}
 
     def load_root(self, name: str, new_root: str | os.PathLike) -> None:
         """
@@ -62,7 +193,74 @@ class Hoylake:
             raise ValueError(f"A root with name {name} has already been loaded.")
 
         self.__roots[name] = new_root
-        self.__load_translation_tables(new_root)
+        self.__root_translations[name] = self.__load_translation_tables(new_root)
+        self.__combine_translation_tables()
+
+        # The new root may have import files that the redirect map does not know about yet
+        self.__import_paths = None
+        self.__compiled_filepaths = {}
+
+    def get_roots(self) -> Dict[RootName, pathlib.Path]:
+        """
+        Returns the names and directories of the loaded roots, in the order that they are looked
+        through.
+        """
+        return dict(self.__roots)
+
+    def invalidate(self, path: str, root_name: Optional[RootName] = None) -> None:
+        """
+        Forgets anything that was loaded in from the file at the given res:// path, so that it
+        will be loaded in again the next time it is requested. Should be run when a file has been
+        changed, added, or removed (ex. by a `RootWatcher`).
+
+        If the name of the root that the file was changed in is given, then only that root's
+        translation files are loaded in again when the file is a translation file. Otherwise the
+        translation files of every root that has (or had) the file are loaded in again.
+
+        Methods like `get_moves_by_tags` only see loaded files, so they will not see the file
+        again until it is loaded in again.
+        """
+        self.__check_if_root_loaded()
+
+        relative_path = Hoylake.__parse_res_path(path)
+
+        for loaded in self.__loaded.values():
+            loaded.pop(relative_path, None)
+
+        is_import_file = relative_path.suffix == ".import"
+        is_compiled_file = len(relative_path.parts) > 0 and relative_path.parts[0] == (
+            ".import"
+        )
+        if is_import_file or is_compiled_file:
+            # Forget the animations that were loaded from the compiled file
+            if self.__import_paths is not None:
+                for asset_path, (_, import_path) in self.__import_paths.items():
+                    if import_path == path:
+                        self.__animations.pop(asset_path, None)
+
+            if is_import_file:
+                self.__animations.pop(relative_path.with_suffix(""), None)
+
+                self.__import_paths = None
+
+            self.__compiled_filepaths = {}
+
+        if relative_path.suffix == ".translation":
+            # Only reload the roots that have (or had) the translation file
+            for name, root in self.__roots.items():
+                if root_name is not None and name != root_name:
+                    continue
+
+                filepath = root / relative_path
+                if filepath.exists() or any(
+                    translation_filepath == filepath
+                    for translation_filepath, _, _ in self.__root_translations[name]
+                ):
+                    self.__root_translations[name] = self.__load_translation_tables(
+                        root
+                    )
+
+            self.__combine_translation_tables()
 
     def load_elemental_type(self, path: str) -> Tuple[RootName, ElementalType]:
         """
@@ -73,23 +271,42 @@ class Hoylake:
         If there is no elemental type file at that location in any of the loaded root directories,
         then a ValueError will be raised.
         """
-        self.__check_if_root_loaded()
+        return self.__load_resource(
+            path, self.__elemental_types, ElementalType.from_tres, "elemental type"
+        )
 
-        relative_path = Hoylake.__parse_res_path(path)
+    def load_elemental_types(
+        self, path: str
+    ) -> Dict[str, Tuple[RootName, ElementalType]]:
+        """
+        Loads in all of the elemental types within the given res:// directory path.
 
-        if relative_path in self.__elemental_types:
-            return self.__elemental_types[relative_path]
+        Looks for that path in all of the loaded root directories.
 
-        for root_name, root in self.__roots.items():
-            type_path = root / relative_path
-            if type_path.exists():
-                with open(type_path, "r", encoding="utf-8") as input_stream:
-                    elemental_type = ElementalType.from_tres(input_stream)
-                    self.__elemental_types[relative_path] = (root_name, elemental_type)
+        Must have loaded at least one root before running.
+        """
+        return {
+            type_path: (root_name, elemental_type)
+            for type_path, root_name, elemental_type in self.iter_elemental_types(path)
+        }
+
+    def iter_elemental_types(
+        self, path: str, cache: bool = True
+    ) -> Iterator[Tuple[str, RootName, ElementalType]]:
+        """
+        Loads in the elemental types within the given res:// directory path one at a time,
+        yielding the res:// path, root name, and elemental type of each as soon as it is parsed.
 
-                    return root_name, elemental_type
+        If cache is False, then elemental types that have not already been loaded are not kept
+        in memory by Hoylake.
 
-        raise ValueError(f"Could not find elemental type file at path: {path}")
+        Looks for that path in all of the loaded root directories.
+
+        Must have loaded at least one root before running.
+        """
+        return self.__iter_resources(
+            path, self.__elemental_types, ElementalType.from_tres, cache
+        )
 
     def load_animation(self, path: str) -> Animation:
         """
@@ -104,40 +321,31 @@ class Hoylake:
 
         relative_path = Hoylake.__parse_res_path(path)
 
-        if relative_path in self.__animations:
-            return self.__animations[relative_path][1]
+        loaded = self.__animations.get(relative_path)
+        if loaded is not None:
+            return loaded[1]
 
-        for root_name, root in self.__roots.items():
-            animation_path = root / relative_path
-            animation_import_path = pathlib.Path(
-                str((root / relative_path)) + ".import"
-            )
-            if animation_path.exists():
-                with open(animation_path, "r", encoding="utf-8") as input_stream:
-                    animation = Animation.from_dict(json.load(input_stream))
-                    self.__animations[relative_path] = (root_name, animation)
+        with self.__hold(Animation, relative_path):
+            # Another thread may have loaded the animation while we were waiting
+            loaded = self.__animations.peek(relative_path)
+            if loaded is not None:
+                return loaded[1]
 
-                    return animation
-            elif animation_import_path.exists():
-                # If the original JSON animation file is not available (since it was compiled and
-                # the original was not distributed), then lookup the `.import` version which will
-                # point to the compiled `.scn` version fo the file which we can parse to get out
-                # the information we need.
-                import_path = None
-                with open(animation_import_path, "r", encoding="utf-8") as input_stream:
-                    for line in input_stream:
-                        match = re.match(r'path="(res.+)"', line)
-                        if match is not None:
-                            import_path = match.groups()[0]
-
-                assert import_path is not None
-                with open(self.lookup_filepath(import_path), "rb") as input_stream:
-                    animation = Animation.from_scn(input_stream)
-                    self.__animations[relative_path] = (root_name, animation)
-
-                    return animation
+            root_name, animation = self.__read_animation(path, relative_path)
+            self.__animations[relative_path] = (root_name, animation)
 
-        raise ValueError(f"Could not find animation file at path: {path}")
+            return animation
+
+    def load_animation_cache(self, directory: str | os.PathLike) -> None:
+        """
+        Uses the animation cache in the given directory (ex. one written by
+        `cbpickaxe_extract_animations`) when loading in animations that are only available in
+        compiled form.
+
+        Cached animations are only used if the compiled file they were recovered from has not
+        changed since they were cached, otherwise the compiled file is parsed as usual.
+        """
+        self.__animation_cache = AnimationCache.load(directory)
 
     def load_monster_form(self, path: str) -> Tuple[RootName, MonsterForm]:
         """
@@ -148,23 +356,9 @@ class Hoylake:
         If there is no monster form file at that location in any of the loaded root directories,
         then a ValueError will be raised.
         """
-        self.__check_if_root_loaded()
-
-        relative_path = Hoylake.__parse_res_path(path)
-
-        if relative_path in self.__monster_forms:
-            return self.__monster_forms[relative_path]
-
-        for root_name, root in self.__roots.items():
-            monster_path = root / relative_path
-            if monster_path.exists():
-                with open(monster_path, "r", encoding="utf-8") as input_stream:
-                    monster_form = MonsterForm.from_tres(input_stream)
-                    self.__monster_forms[relative_path] = (root_name, monster_form)
-
-                    return (root_name, monster_form)
-
-        raise ValueError(f"Could not find monster file at path: {path}")
+        return self.__load_resource(
+            path, self.__monster_forms, MonsterForm.from_tres, "monster"
+        )
 
     def load_monster_forms(self, path: str) -> Dict[str, Tuple[RootName, MonsterForm]]:
         """
@@ -174,38 +368,29 @@ class Hoylake:
 
         Must have loaded at least one root before running.
         """
-        self.__check_if_root_loaded()
-
-        relative_path = Hoylake.__parse_res_path(path)
-
-        monster_forms: Dict[str, Tuple[RootName, MonsterForm]] = {}
-        for root_name, root in self.__roots.items():
-            monsters_dir_path = root / relative_path
-            if monsters_dir_path.exists():
-                monster_paths = sorted(monsters_dir_path.glob("*.tres"))
-                for monster_path in monster_paths:
-                    monster_relative_path = relative_path / monster_path.name
-
-                    if monster_relative_path in self.__monster_forms:
-                        monster_forms[
-                            f"res://{monster_relative_path}"
-                        ] = self.__monster_forms[monster_relative_path]
-                        continue
+        return {
+            monster_path: (root_name, monster_form)
+            for monster_path, root_name, monster_form in self.iter_monster_forms(path)
+        }
+
+    def iter_monster_forms(
+        self, path: str, cache: bool = True
+    ) -> Iterator[Tuple[str, RootName, MonsterForm]]:
+        """
+        Loads in the monster forms within the given res:// directory path one at a time, yielding
+        the res:// path, root name, and monster form of each as soon as it is parsed.
 
-                    with open(monster_path, "r", encoding="utf-8") as input_stream:
-                        monster_form = MonsterForm.from_tres(input_stream)
+        If cache is False, then monster forms that have not already been loaded are not kept in
+        memory by Hoylake. This lets large directories be processed with bounded memory, but the
+        monster forms will then not be found by methods like `get_monster_forms_by_tags`.
 
-                        monster_relative_path = relative_path / monster_path.name
-                        monster_forms[f"res://{monster_relative_path}"] = (
-                            root_name,
-                            monster_form,
-                        )
-                        self.__monster_forms[monster_relative_path] = (
-                            root_name,
-                            monster_form,
-                        )
+        Looks for that path in all of the loaded root directories.
 
-        return monster_forms
+        Must have loaded at least one root before running.
+        """
+        return self.__iter_resources(
+            path, self.__monster_forms, MonsterForm.from_tres, cache
+        )
 
     def load_move(self, path: str) -> Tuple[RootName, Move]:
         """
@@ -216,91 +401,116 @@ class Hoylake:
         If there is no move file at that location in any of the loaded root directories, then a
         ValueError will be raised.
         """
-        self.__check_if_root_loaded()
+        return self.__load_resource(path, self.__moves, Move.from_tres, "move")
 
-        relative_path = Hoylake.__parse_res_path(path)
+    def load_moves(self, path: str) -> Dict[str, Tuple[RootName, Move]]:
+        """
+        Loads in all of the moves within the given res:// directory path.
 
-        if relative_path in self.__moves:
-            return self.__moves[relative_path]
+        Looks for that path in all of the loaded root directories.
 
-        for root_name, root in self.__roots.items():
-            move_path = root / relative_path
-            if move_path.exists():
-                with open(move_path, "r", encoding="utf-8") as input_stream:
-                    move = Move.from_tres(input_stream)
-                    self.__moves[relative_path] = (root_name, move)
+        Must have loaded at least one root before running.
+        """
+        return {
+            move_path: (root_name, move)
+            for move_path, root_name, move in self.iter_moves(path)
+        }
+
+    def iter_moves(
+        self, path: str, cache: bool = True
+    ) -> Iterator[Tuple[str, RootName, Move]]:
+        """
+        Loads in the moves within the given res:// directory path one at a time, yielding the
+        res:// path, root name, and move of each as soon as it is parsed.
 
-                    return (root_name, move)
+        If cache is False, then moves that have not already been loaded are not kept in memory by
+        Hoylake. This lets large directories be processed with bounded memory, but the moves will
+        then not be found by methods like `get_moves_by_tags`.
 
-        raise ValueError(f"Could not find monster file at path: {path}")
+        Looks for that path in all of the loaded root directories.
 
-    def load_moves(self, path: str) -> Dict[str, Tuple[RootName, Move]]:
+        Must have loaded at least one root before running.
         """
-        Loads in all of the moves within the given res:// directory path.
+        return self.__iter_resources(path, self.__moves, Move.from_tres, cache)
 
-        Looks for that path in all of the loaded root directories.
+    def load_item(self, path: str) -> Tuple[RootName, Item]:
+        """
+        Loads in the item at the given res:// filepath.
 
         Must have loaded at least one root before running.
+
+        If there is no item file at that location in any of the loaded root directories, then a
+        ValueError will be raised.
         """
-        self.__check_if_root_loaded()
+        return self.__load_resource(path, self.__items, Item.from_tres, "item")
 
-        relative_path = Hoylake.__parse_res_path(path)
+    def load_items(self, path: str) -> Dict[str, Tuple[RootName, Item]]:
+        """
+        Loads in all of the items within the given res:// directory path.
 
-        moves: Dict[str, Tuple[RootName, Move]] = {}
-        for root_name, root in self.__roots.items():
-            moves_dir_path = root / relative_path
-            if moves_dir_path.exists():
-                move_paths = sorted(moves_dir_path.glob("*.tres"))
-                for move_path in move_paths:
-                    move_relative_path = relative_path / move_path.name
+        Looks for that path in all of the loaded root directories.
 
-                    if f"res://{move_relative_path}" in self.__moves_to_ignore:
-                        continue
+        Must have loaded at least one root before running.
+        """
+        return {
+            item_path: (root_name, item)
+            for item_path, root_name, item in self.iter_items(path)
+        }
+
+    def iter_items(
+        self, path: str, cache: bool = True
+    ) -> Iterator[Tuple[str, RootName, Item]]:
+        """
+        Loads in the items within the given res:// directory path one at a time, yielding the
+        res:// path, root name, and item of each as soon as it is parsed.
 
-                    if move_relative_path in self.__moves:
-                        moves[f"res://{move_relative_path}"] = self.__moves[
-                            move_relative_path
-                        ]
-                        continue
+        If cache is False, then items that have not already been loaded are not kept in memory by
+        Hoylake.
 
-                    with open(move_path, "r", encoding="utf-8") as input_stream:
-                        move = Move.from_tres(input_stream)
+        Looks for that path in all of the loaded root directories.
 
-                        moves[f"res://{move_relative_path}"] = (root_name, move)
-                        self.__moves[move_relative_path] = (root_name, move)
+        Must have loaded at least one root before running.
+        """
+        return self.__iter_resources(path, self.__items, Item.from_tres, cache)
 
-        return moves
+    def lookup_filepath(self, path: str) -> pathlib.Path:
+        """
+        Returns a real filesystem path to the file at the given res:// path.
 
-    def load_item(self, path: str) -> Tuple[RootName, Item]:
+        If there is no file at that location in any of the loaded root directories, then a
+        ValueError will be raised.
         """
-        Loads in the item at the given res:// filepath.
+        return self.find_resource(path)[1]
 
-        Must have loaded at least one root before running.
+    def find_resource(self, path: str) -> Tuple[RootName, pathlib.Path]:
+        """
+        Returns the name of the root that the file at the given res:// path will be loaded from,
+        along with a real filesystem path to that file. If several roots have the file, then the
+        first root takes precedence.
 
-        If there is no item file at that location in any of the loaded root directories, then a
+        If there is no file at that location in any of the loaded root directories, then a
         ValueError will be raised.
         """
         self.__check_if_root_loaded()
 
         relative_path = Hoylake.__parse_res_path(path)
 
-        if relative_path in self.__moves:
-            return self.__items[relative_path]
-
-        for root_name, root in self.__roots.items():
-            item_path = root / relative_path
-            if item_path.exists():
-                with open(item_path, "r", encoding="utf-8") as input_stream:
-                    item = Item.from_tres(input_stream)
-                    self.__items[relative_path] = (root_name, item)
+        with self.__stats.time("find"):
+            for root_name, root in self.__roots.items():
+                filepath = root / relative_path
 
-                    return (root_name, item)
+                self.__stats.count("files_stated")
+                if filepath.exists():
+                    return root_name, filepath
 
-        raise ValueError(f"Could not find monster file at path: {path}")
+        raise ValueError(f"Could not find file at path: {path}")
 
-    def load_items(self, path: str) -> Dict[str, Tuple[RootName, Item]]:
+    def find_resources(self, path: str) -> List[Tuple[str, RootName, pathlib.Path]]:
         """
-        Loads in all of the items within the given res:// directory path.
+        Returns the res:// path, root name, and real filesystem path of each of the `.tres` files
+        within the given res:// directory path, in the order that they are loaded in by methods
+        like `load_monster_forms`. If several roots have the same file, then the first root takes
+        precedence.
 
         Looks for that path in all of the loaded root directories.
 
@@ -308,48 +518,111 @@ class Hoylake:
         """
         self.__check_if_root_loaded()
 
-        relative_path = Hoylake.__parse_res_path(path)
+        return list(self.__iter_resource_files(Hoylake.__parse_res_path(path)))
 
-        items: Dict[str, Tuple[RootName, Item]] = {}
-        for root_name, root in self.__roots.items():
-            items_dir_path = root / relative_path
-            if items_dir_path.exists():
-                item_paths = sorted(items_dir_path.glob("*.tres"))
-                for item_path in item_paths:
-                    item_relative_path = relative_path / item_path.name
-
-                    if item_relative_path in self.__moves:
-                        items[f"res://{item_relative_path}"] = self.__items[
-                            item_relative_path
-                        ]
-                        continue
+    def get_loaded(
+        self, resource_type: Type[T], path: str
+    ) -> Optional[Tuple[RootName, T]]:
+        """
+        Returns the root name and the already loaded resource of the given type (ex. MonsterForm)
+        at the given res:// path. Returns None if that resource has not been loaded yet.
+
+        If Hoylake does not load resources of the given type, then a ValueError will be raised.
+        """
+        loaded = self.__get_loaded_of_type(resource_type)
 
-                    with open(item_path, "r", encoding="utf-8") as input_stream:
-                        item = Item.from_tres(input_stream)
+        result: Optional[Tuple[RootName, T]] = loaded.get(
+            Hoylake.__parse_res_path(path)
+        )
+        return result
 
-                        items[f"res://{item_relative_path}"] = (root_name, item)
-                        self.__items[item_relative_path] = (root_name, item)
+    def add_loaded(
+        self, resource_type: Type[T], path: str, root_name: RootName, resource: T
+    ) -> None:
+        """
+        Records the given resource of the given type (ex. MonsterForm) as having been loaded from
+        the given res:// path of the given root, so that later requests for it (ex. through
+        `load_monster_form`) use it instead of loading the file again. This is useful for loading
+        resources outside of Hoylake (ex. in another process).
 
-        return items
+        If Hoylake does not load resources of the given type, then a ValueError will be raised.
+        """
+        assert isinstance(resource, resource_type)
 
-    def lookup_filepath(self, path: str) -> pathlib.Path:
+        loaded = self.__get_loaded_of_type(resource_type)
+        loaded[Hoylake.__parse_res_path(path)] = (root_name, resource)
+
+    def lookup_import_path(self, path: str) -> str:
         """
-        Returns a real filesystem path to the file at the given res:// path.
+        Returns the res:// path of the compiled file that the asset at the given res:// path
+        (ex. an animation, texture, or audio file) was imported as.
 
-        If there is no file at that location in any of the loaded root directories, then a
+        The `.import` files of all of the loaded roots are read in once, the first time this is
+        needed, so further lookups do not need to touch the filesystem. If several roots have an
+        `.import` file for the asset, then the first root takes precedence.
+
+        If there is no `.import` file for the asset in any of the loaded root directories, then a
         ValueError will be raised.
         """
         self.__check_if_root_loaded()
 
         relative_path = Hoylake.__parse_res_path(path)
 
-        for root in self.__roots.values():
-            filepath = root / relative_path
+        import_paths = self.__get_import_paths()
+        if relative_path not in import_paths:
+            raise ValueError(f"Could not find import file for path: {path}")
 
-            if filepath.exists():
-                return filepath
+        return import_paths[relative_path][1]
 
-        raise ValueError(f"Could not find file at path: {path}")
+    def lookup_compiled_filepath(self, path: str) -> pathlib.Path:
+        """
+        Returns a real filesystem path to the compiled file that the asset at the given res://
+        path was imported as.
+
+        If there is no `.import` file for the asset, or no file at the compiled location, in any
+        of the loaded root directories, then a ValueError will be raised.
+        """
+        import_path = self.lookup_import_path(path)
+
+        if import_path not in self.__compiled_filepaths:
+            self.__compiled_filepaths[import_path] = self.lookup_filepath(import_path)
+
+        return self.__compiled_filepaths[import_path]
+
+    def get_import_paths(self) -> Dict[str, str]:
+        """
+        Returns the res:// paths of all of the imported assets in the loaded roots, along with the
+        res:// paths of the compiled files that they were imported as.
+        """
+        self.__check_if_root_loaded()
+
+        return {
+            f"res://{relative_path.as_posix()}": import_path
+            for relative_path, (_, import_path) in self.__get_import_paths().items()
+        }
+
+    @staticmethod
+    def read_import_path(import_filepath: str | os.PathLike) -> str:
+        """
+        Returns the res:// path of the compiled file that the given `.import` file points to.
+
+        If the `.import` file does not point to a compiled file, then a ValueError will be raised.
+        """
+        with open(import_filepath, "r", encoding="utf-8") as input_stream:
+            contents = input_stream.read()
+
+        matches: List[Tuple[str, str]] = _IMPORT_PATH_REGEX.findall(contents)
+        if len(matches) == 0:
+            raise ValueError(
+                f"Could not find path of compiled file in import file: {import_filepath}"
+            )
+
+        # Prefer the platform independent compiled file if there is one
+        for suffix, import_path in matches:
+            if suffix == "":
+                return import_path
+
+        return matches[0][1]
 
     def translate(self, string: str, locale: Optional[str] = None) -> str:
         """
@@ -364,6 +637,7 @@ class Hoylake:
         raised.
         """
         self.__check_if_root_loaded()
+        self.__stats.count("translate_calls")
         locale = locale if locale is not None else self.__default_locale
 
         if locale not in self.__translation_tables:
@@ -393,7 +667,7 @@ class Hoylake:
         """
         monster_forms = {}
         for tag in tags:
-            for path, (root_name, monster_form) in self.__monster_forms.items():
+            for path, (root_name, monster_form) in list(self.__monster_forms.items()):
                 if tag in monster_form.move_tags or (include_any and tag == "any"):
                     monster_forms[f"res://{path}"] = (root_name, monster_form)
 
@@ -407,36 +681,580 @@ class Hoylake:
         """
         moves = {}
         for tag in tags:
-            for path, (root_name, move) in self.__moves.items():
+            for path, (root_name, move) in list(self.__moves.items()):
                 if tag in move.tags:
                     moves[f"res://{path}"] = (root_name, move)
 
         return moves
 
+    def save_snapshot(self, path: str | os.PathLike) -> None:
+        """
+        Saves everything that has been loaded in (roots, translations, monster forms, moves,
+        etc.) to a snapshot file at the given filepath. `Hoylake.from_snapshot` can then restore
+        the same state much faster than loading in all of the files again.
+
+        The snapshot records the modification time and size of every file that was loaded in,
+        along with a listing of the data, translation, import and animation files of each root,
+        so that a snapshot that no longer matches its roots can be detected when restoring it.
+        """
+        self.__check_if_root_loaded()
+
+        state = {
+            "default_locale": self.__default_locale,
+            "roots": [(name, str(root)) for name, root in self.__roots.items()],
+            "translations": {
+                name: [
+                    (str(filepath), locale, table)
+                    for filepath, locale, table in translations
+                ]
+                for name, translations in self.__root_translations.items()
+            },
+            "pinned_roots": sorted(self.__pinned_roots),
+            "loaded": {
+                resource_type.__name__: (
+                    loaded.max_entries,
+                    [
+                        (str(relative_path), root_name, resource)
+                        for relative_path, (root_name, resource) in loaded.items()
+                    ],
+                )
+                for resource_type, loaded in self.__loaded.items()
+            },
+            "import_paths": (
+                {
+                    str(relative_path): entry
+                    for relative_path, entry in self.__import_paths.items()
+                }
+                if self.__import_paths is not None
+                else None
+            ),
+            "animation_cache_directory": (
+                str(self.__animation_cache.directory)
+                if self.__animation_cache is not None
+                else None
+            ),
+            "file_states": {
+                str(filepath): (stat.st_mtime_ns, stat.st_size)
+                for filepath, stat in (
+                    (filepath, filepath.stat())
+                    for filepath in self.__get_source_filepaths()
+                )
+            },
+            "root_listings": {
+                name: Hoylake.__list_root_files(root)
+                for name, root in self.__roots.items()
+            },
+        }
+
+        with open(path, "wb") as output_stream:
+            output_stream.write(SNAPSHOT_MAGIC)
+            output_stream.write(struct.pack("<I", SNAPSHOT_VERSION))
+            output_stream.write(
+                zlib.compress(pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL))
+            )
+
+    @staticmethod
+    def from_snapshot(
+        path: str | os.PathLike, validate: bool = True, thread_safe: bool = False
+    ) -> "Hoylake":
+        """
+        Restores a Hoylake from a snapshot file saved by `Hoylake.save_snapshot`.
+
+        If validate is True, then every file that was loaded in when the snapshot was saved is
+        checked, along with the listing of each root, and a ValueError is raised if any of those
+        files has since been changed or removed, or if any files have been added to a root.
+
+        If the file is not a snapshot, or was saved by an incompatible version of cbpickaxe, then
+        a ValueError will be raised.
+
+        Snapshots are pickle files, so only restore snapshots that you trust.
+        """
+        with open(path, "rb") as input_stream:
+            magic = input_stream.read(len(SNAPSHOT_MAGIC))
+            if magic != SNAPSHOT_MAGIC:
+                raise ValueError(f"File is not a Hoylake snapshot: {path}")
+
+            (version,) = struct.unpack("<I", input_stream.read(4))
+            if version != SNAPSHOT_VERSION:
+                raise ValueError(
+                    f"Snapshot {path} has version {version}, but only version {SNAPSHOT_VERSION} is supported."
+                )
+
+            state = pickle.loads(zlib.decompress(input_stream.read()))
+
+        if validate:
+            stale_filepaths = [
+                filepath
+                for filepath, file_state in state["file_states"].items()
+                if Hoylake.__get_file_state(pathlib.Path(filepath)) != tuple(file_state)
+            ]
+            if len(stale_filepaths) > 0:
+                raise ValueError(
+                    f"Snapshot {path} is out of date, since these files have changed: {', '.join(sorted(stale_filepaths))}"
+                )
+
+            roots = dict(state["roots"])
+            for name, listing in state["root_listings"].items():
+                current_listing = Hoylake.__list_root_files(pathlib.Path(roots[name]))
+                changed_filepaths = set(listing).symmetric_difference(current_listing)
+                if len(changed_filepaths) > 0:
+                    raise ValueError(
+                        f"Snapshot {path} is out of date, since these files have been added to or removed from root {name}: {', '.join(sorted(changed_filepaths))}"
+                    )
+
+        types_by_name = {
+            resource_type.__name__: resource_type
+            for resource_type in [MonsterForm, Move, Animation, Item, ElementalType]
+        }
+
+        hoylake = Hoylake(
+            default_locale=state["default_locale"],
+            thread_safe=thread_safe,
+            cache_limits={
+                types_by_name[name]: max_entries
+                for name, (max_entries, _) in state["loaded"].items()
+            },
+            pinned_roots=state["pinned_roots"],
+        )
+
+        Hoylake.__restore(hoylake, state, types_by_name)
+
+        return hoylake
+
+    def set_cache_limit(self, resource_type: type, max_entries: Optional[int]) -> None:
+        """
+        Sets the maximum number of resources of the given type (ex. MonsterForm) to keep in
+        memory, not counting those from pinned roots. None means no limit.
+
+        If Hoylake does not load resources of the given type, then a ValueError will be raised.
+        """
+        self.__get_loaded_of_type(resource_type).set_max_entries(max_entries)
+
+    def pin_root(self, name: str) -> None:
+        """
+        Makes sure that the resources loaded from the root with the given name (ex. the base
+        game) are always kept in memory, regardless of the cache limits.
+        """
+        self.__pinned_roots.add(name)
+
+        for loaded in self.__loaded.values():
+            loaded.repin()
+
+    def get_cache_info(self) -> Dict[str, CacheInfo]:
+        """
+        Returns information on how many resources of each type are kept in memory, and roughly
+        how much memory they take up. Keyed by type name (ex. "MonsterForm").
+        """
+        return {
+            resource_type.__name__: loaded.info()
+            for resource_type, loaded in self.__loaded.items()
+        }
+
+    def get_stats(self) -> HoylakeStats:
+        """
+        Returns how much work the Hoylake has done so far, and how long it spent in each phase of
+        that work (ex. finding, reading, and parsing files). Useful for finding out what makes a
+        script slow.
+        """
+        counts = self.__stats.get_counts()
+
+        return HoylakeStats(
+            timings=self.__stats.get_timings(),
+            files_stated=counts.get("files_stated", 0),
+            files_parsed={
+                name.split(":", 1)[1]: count
+                for name, count in sorted(counts.items())
+                if name.startswith("files_parsed:")
+            },
+            bytes_read=counts.get("bytes_read", 0),
+            translate_calls=counts.get("translate_calls", 0),
+            cache=self.get_cache_info(),
+        )
+
+    def record_load(
+        self, resource: Any, num_bytes: int, read_seconds: float, parse_seconds: float
+    ) -> None:
+        """
+        Includes a file that was read and parsed outside of the Hoylake (ex. by an `AsyncHoylake`
+        in a worker process) in the stats returned by `get_stats`.
+        """
+        self.__stats.add_time("read", read_seconds)
+        self.__stats.count("bytes_read", num_bytes)
+        self.__stats.add_time("parse", parse_seconds)
+        self.__stats.count(f"files_parsed:{type(resource).__name__}")
+
+    def reset_stats(self) -> None:
+        """
+        Sets the counters and timings returned by `get_stats` back to zero. Does not reset the
+        cache hit and miss counts.
+        """
+        self.__stats.reset()
+
+    def __restore(self, state: Dict[str, Any], types_by_name: Dict[str, type]) -> None:
+        self.__roots = {name: pathlib.Path(root) for name, root in state["roots"]}
+        self.__root_translations = {
+            name: [
+                (pathlib.Path(filepath), locale, table)
+                for filepath, locale, table in translations
+            ]
+            for name, translations in state["translations"].items()
+        }
+        self.__combine_translation_tables()
+
+        for name, (_, entries) in state["loaded"].items():
+            loaded = self.__loaded[types_by_name[name]]
+            for relative_path, root_name, resource in entries:
+                loaded[pathlib.Path(relative_path)] = (root_name, resource)
+
+        if state["import_paths"] is not None:
+            self.__import_paths = {
+                pathlib.Path(relative_path): tuple(entry)
+                for relative_path, entry in state["import_paths"].items()
+            }
+
+        if state["animation_cache_directory"] is not None:
+            self.load_animation_cache(state["animation_cache_directory"])
+
+    def __get_source_filepaths(self) -> List[pathlib.Path]:
+        filepaths = list(self.__translation_filepaths)
+        for resource_type, loaded in self.__loaded.items():
+            for relative_path, (root_name, _) in loaded.items():
+                filepath = self.__roots[root_name] / relative_path
+                if filepath.exists() or resource_type != Animation:
+                    filepaths.append(filepath)
+                    continue
+
+                # Animations that were only available in compiled form
+                filepaths.append(pathlib.Path(str(filepath) + ".import"))
+                filepaths.append(
+                    self.lookup_compiled_filepath(f"res://{relative_path.as_posix()}")
+                )
+
+        return filepaths
+
+    @staticmethod
+    def __list_root_files(root: pathlib.Path) -> List[str]:
+        listing: List[str] = []
+        for directory, subdirectories, filenames in os.walk(root):
+            # Changes to the compiled files that were used are found through their file states
+            if ".import" in subdirectories:
+                subdirectories.remove(".import")
+
+            relative_directory = pathlib.Path(directory).relative_to(root)
+            listing.extend(
+                (relative_directory / filename).as_posix()
+                for filename in filenames
+                if filename.endswith(_SNAPSHOT_LISTED_SUFFIXES)
+            )
+
+        return sorted(listing)
+
+    @staticmethod
+    def __get_file_state(filepath: pathlib.Path) -> Optional[Tuple[int, int]]:
+        try:
+            stat = filepath.stat()
+        except OSError:
+            return None
+
+        return stat.st_mtime_ns, stat.st_size
+
+    def __is_pinned(self, _: RelativeResPath, value: Tuple[RootName, Any]) -> bool:
+        return value[0] in self.__pinned_roots
+
     def __check_if_root_loaded(self) -> None:
         if len(self.__roots) == 0:
             raise RuntimeError(
                 "No roots have been loaded. You must load a root with `hoylake.load_root` before querying."
             )
 
-    def __load_translation_tables(self, root: pathlib.Path) -> None:
+    def __get_loaded_of_type(
+        self, resource_type: type
+    ) -> LRUCache[RelativeResPath, Tuple[RootName, Any]]:
+        if resource_type not in self.__loaded:
+            raise ValueError(
+                f"Hoylake does not load resources of type: {resource_type.__name__}"
+            )
+
+        return self.__loaded[resource_type]
+
+    def __load_resource(
+        self,
+        path: str,
+        loaded: LRUCache[RelativeResPath, Tuple[RootName, T]],
+        parse: Callable[[IO[str]], T],
+        description: str,
+    ) -> Tuple[RootName, T]:
+        self.__check_if_root_loaded()
+
+        relative_path = Hoylake.__parse_res_path(path)
+
+        result = loaded.get(relative_path)
+        if result is not None:
+            return result
+
+        with self.__hold(parse, relative_path):
+            # Another thread may have loaded the resource while we were waiting
+            result = loaded.peek(relative_path)
+            if result is not None:
+                return result
+
+            try:
+                root_name, resource_path = self.find_resource(path)
+            except ValueError:
+                raise ValueError(
+                    f"Could not find {description} file at path: {path}"
+                ) from None
+
+            resource = self.__parse_file(resource_path, parse)
+            loaded[relative_path] = (root_name, resource)
+
+            return root_name, resource
+
+    def __iter_resources(
+        self,
+        path: str,
+        loaded: LRUCache[RelativeResPath, Tuple[RootName, T]],
+        parse: Callable[[IO[str]], T],
+        cache: bool,
+    ) -> Iterator[Tuple[str, RootName, T]]:
+        # Check the arguments eagerly, rather than when the first resource is requested
+        self.__check_if_root_loaded()
+
+        relative_path = Hoylake.__parse_res_path(path)
+
+        return self.__iter_resources_in(relative_path, loaded, parse, cache)
+
+    def __iter_resources_in(
+        self,
+        relative_path: RelativeResPath,
+        loaded: LRUCache[RelativeResPath, Tuple[RootName, T]],
+        parse: Callable[[IO[str]], T],
+        cache: bool,
+    ) -> Iterator[Tuple[str, RootName, T]]:
+        for resource_res_path, root_name, resource_path in self.__iter_resource_files(
+            relative_path
+        ):
+            resource_relative_path = relative_path / resource_path.name
+
+            result = loaded.get(resource_relative_path)
+            if result is not None:
+                yield (resource_res_path, *result)
+                continue
+
+            if not cache:
+                yield resource_res_path, root_name, self.__parse_file(
+                    resource_path, parse
+                )
+                continue
+
+            with self.__hold(parse, resource_relative_path):
+                # Another thread may have loaded the resource while we were waiting
+                result = loaded.peek(resource_relative_path)
+                if result is None:
+                    result = (root_name, self.__parse_file(resource_path, parse))
+                    loaded[resource_relative_path] = result
+
+            yield (resource_res_path, *result)
+
+    def __parse_file(self, filepath: pathlib.Path, parse: Callable[[IO[str]], T]) -> T:
+        data = self.__read_bytes(filepath)
+
+        # The parser used for ".tres" files keeps state between calls, so it can only be used by
+        # one thread at a time
+        with self.__parse_lock if self.__thread_safe else contextlib.nullcontext():
+            with self.__stats.time("parse"):
+                resource = parse(io.TextIOWrapper(io.BytesIO(data), encoding="utf-8"))
+
+        self.__stats.count(f"files_parsed:{type(resource).__name__}")
+
+        return resource
+
+    def __read_bytes(self, filepath: pathlib.Path) -> bytes:
+        with self.__stats.time("read"):
+            with open(filepath, "rb") as input_stream:
+                data = input_stream.read()
+        self.__stats.count("bytes_read", len(data))
+
+        return data
+
+    def __hold(self, *key: Hashable) -> ContextManager[None]:
+        # Makes other threads wait to load the same file, when in thread-safe mode. The parse
+        # function is used as part of the key to tell apart resources of different types.
+        if not self.__thread_safe:
+            return contextlib.nullcontext()
+
+        return self.__single_flight.hold(key)
+
+    def __iter_resource_files(
+        self, relative_path: RelativeResPath
+    ) -> Iterator[Tuple[str, RootName, pathlib.Path]]:
+        # Earlier roots take precedence over later roots that have the same file
+        seen: Set[RelativeResPath] = set()
+        for root_name, root in list(self.__roots.items()):
+            resources_dir_path = root / relative_path
+            with self.__stats.time("find"):
+                self.__stats.count("files_stated")
+                if not resources_dir_path.exists():
+                    continue
+
+                resource_paths = sorted(resources_dir_path.glob("*.tres"))
+                self.__stats.count("files_stated", len(resource_paths))
+
+            for resource_path in resource_paths:
+                resource_relative_path = relative_path / resource_path.name
+                resource_res_path = f"res://{resource_relative_path}"
+
+                if (
+                    resource_res_path in self.__paths_to_ignore
+                    or resource_relative_path in seen
+                ):
+                    continue
+                seen.add(resource_relative_path)
+
+                yield resource_res_path, root_name, resource_path
+
+    def __read_animation(
+        self, path: str, relative_path: RelativeResPath
+    ) -> Tuple[RootName, Animation]:
+        for root_name, root in self.__roots.items():
+            animation_path = root / relative_path
+            with self.__stats.time("find"):
+                self.__stats.count("files_stated")
+                animation_exists = animation_path.exists()
+
+            if animation_exists:
+                data = self.__read_bytes(animation_path)
+                with self.__stats.time("parse"):
+                    animation = Animation.from_dict(json.loads(data))
+                self.__stats.count("files_parsed:Animation")
+
+                return root_name, animation
+
+            # Only read in the `.import` files of the roots when the JSON file is missing, since
+            # that requires walking through all of the roots
+            with self.__stats.time("find"):
+                self.__stats.count("files_stated")
+                import_file_exists = pathlib.Path(f"{animation_path}.import").exists()
+
+            if not import_file_exists:
+                continue
+
+            import_paths = self.__get_import_paths()
+            if (
+                relative_path in import_paths
+                and import_paths[relative_path][0] == root_name
+            ):
+                # If the original JSON animation file is not available (since it was compiled and
+                # the original was not distributed), then lookup the compiled `.scn` version of
+                # the file which we can parse to get out the information we need.
+                compiled_filepath = self.lookup_compiled_filepath(path)
+
+                if self.__animation_cache is not None:
+                    cached_animation = self.__animation_cache.get(
+                        f"res://{relative_path}",
+                        import_paths[relative_path][1],
+                        compiled_filepath,
+                    )
+                    if cached_animation is not None:
+                        return root_name, cached_animation
+
+                data = self.__read_bytes(compiled_filepath)
+                with self.__stats.time("parse"):
+                    animation = Animation.from_scn(io.BytesIO(data))
+                self.__stats.count("files_parsed:Animation")
+
+                return root_name, animation
+
+        raise ValueError(f"Could not find animation file at path: {path}")
+
+    def __get_import_paths(self) -> Dict[RelativeResPath, Tuple[RootName, str]]:
+        if self.__import_paths is not None:
+            return self.__import_paths
+
+        with self.__hold("import_paths"):
+            # Another thread may have read the import files while we were waiting
+            if self.__import_paths is not None:
+                return self.__import_paths
+
+            with self.__stats.time("import_paths"):
+                self.__import_paths = self.__read_import_paths()
+
+            return self.__import_paths
+
+    def __read_import_paths(self) -> Dict[RelativeResPath, Tuple[RootName, str]]:
+        import_paths: Dict[RelativeResPath, Tuple[RootName, str]] = {}
+        for root_name, root in self.__roots.items():
+            logging.debug(f"Looking for import files in root: {root}")
+            for directory, subdirectories, filenames in os.walk(root):
+                # The `.import` directory holds the compiled files, which are not imported assets
+                if ".import" in subdirectories:
+                    subdirectories.remove(".import")
+
+                for filename in filenames:
+                    if not filename.endswith(".import"):
+                        continue
+
+                    import_filepath = pathlib.Path(directory) / filename
+                    relative_path = import_filepath.relative_to(root).with_suffix("")
+                    if relative_path in import_paths:
+                        continue
+
+                    try:
+                        import_path = Hoylake.read_import_path(import_filepath)
+                    except ValueError:
+                        logging.debug(
+                            f"Skipping import file without a compiled file: {import_filepath}"
+                        )
+                        continue
+
+                    import_paths[relative_path] = (root_name, import_path)
+
+        logging.debug(f"Found {len(import_paths)} imported assets.")
+
+        return import_paths
+
+    def __load_translation_tables(
+        self, root: pathlib.Path
+    ) -> List[Tuple[pathlib.Path, str, TranslationTable]]:
         logging.debug(f"Looking for translation files in root: {root}")
-        translation_filepaths = sorted(root.glob("**/*.translation"))
+        with self.__stats.time("find"):
+            translation_filepaths = sorted(root.glob("**/*.translation"))
+        self.__stats.count("files_stated", len(translation_filepaths))
         logging.debug(
             f"Found {len(translation_filepaths)} translation files in: {root}"
         )
+
+        translations = []
         for translation_filepath in translation_filepaths:
             logging.debug(f"Trying to load translation file: {translation_filepath}")
-            with open(translation_filepath, "rb") as input_stream:
-                table, locale = TranslationTable.from_translation(input_stream)
-                self.__translation_tables[locale].append(table)
-                logging.debug(
-                    f"Successfully loaded {locale} translation file: {translation_filepath}"
-                )
+            data = self.__read_bytes(translation_filepath)
+            with self.__stats.time("translations"):
+                table, locale = TranslationTable.from_translation(io.BytesIO(data))
+            self.__stats.count("files_parsed:TranslationTable")
+
+            translations.append((translation_filepath, locale, table))
+            logging.debug(
+                f"Successfully loaded {locale} translation file: {translation_filepath}"
+            )
         logging.debug(
-            f"Successfully loaded {len(translation_filepaths)} translation files of locales {','.join(sorted(self.__translation_tables.keys()))}."
+            f"Successfully loaded {len(translation_filepaths)} translation files of locales {','.join(sorted({locale for _, locale, _ in translations}))}."
         )
 
+        return translations
+
+    def __combine_translation_tables(self) -> None:
+        translation_filepaths = []
+        translation_tables: collections.defaultdict[
+            str, List[TranslationTable]
+        ] = collections.defaultdict(lambda: [])
+        for name in self.__roots:
+            for filepath, locale, table in self.__root_translations.get(name, []):
+                translation_filepaths.append(filepath)
+                translation_tables[locale].append(table)
+
+        self.__translation_filepaths = translation_filepaths
+        self.__translation_tables = translation_tables
+
     @staticmethod
     def __parse_res_path(path: str) -> RelativeResPath:
         assert path.startswith("res://"), path
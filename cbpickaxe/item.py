@@ -4,10 +4,12 @@ Classes related to items.
 from dataclasses import dataclass
 from typing import IO, Optional
 
+import sys
+
 import godot_parser as gp
 
 
-@dataclass
+@dataclass(slots=True)
 class Item:
     """
     An item that the player can obtain.
@@ -46,7 +48,7 @@ class Item:
         return Item(
             name=name,
             description=description,
-            category=category,
+            category=sys.intern(category),
             icon=icon,
         )
 
@@ -60,6 +62,6 @@ class Item:
         assert isinstance(icon_resource, gp.ExtResource)
         icon_ext_resource = scene.find_ext_resource(id=icon_resource.id)
         assert icon_ext_resource is not None
-        icon = icon_ext_resource.path
+        icon = sys.intern(icon_ext_resource.path)
 
         return icon
@@ -5,12 +5,14 @@ Many of these are simple dataclass re-implementations of Godot datatypes, which
 write out to JSON.
 """
 from dataclasses import dataclass
-from typing import Tuple
+from typing import Dict, Tuple, TYPE_CHECKING
 
-import godot_parser as gp
+if TYPE_CHECKING:
+    # Only needed for type hints, and slow to import
+    import godot_parser as gp
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Color:
     """
     A RGBA color.
@@ -35,19 +37,38 @@ class Color:
         )
 
     @staticmethod
-    def from_gp(original: gp.Color) -> "Color":
+    def from_gp(original: "gp.Color") -> "Color":
         """
         Converts the given godot_parser Color into a cbpickaxe Color.
+
+        Equal colors share the same instance. See `intern_color`.
         """
-        return Color(
-            red=original.r,
-            green=original.g,
-            blue=original.b,
-            alpha=original.a,
+        return intern_color(
+            Color(
+                red=original.r,
+                green=original.g,
+                blue=original.b,
+                alpha=original.a,
+            )
         )
 
 
-@dataclass(frozen=True)
+# Canonical instance of each color that has been interned
+_COLOR_POOL: Dict[Color, Color] = {}
+
+
+def intern_color(color: Color) -> Color:
+    """
+    Returns the canonical instance of the given color, so that equal colors (ex. the same palette
+    color used by many monsters) share one instance instead of each taking up memory.
+
+    Interned colors are kept for the lifetime of the program, which is fine for the limited
+    number of distinct colors that the game uses.
+    """
+    return _COLOR_POOL.setdefault(color, color)
+
+
+@dataclass(frozen=True, slots=True)
 class Vector2:
     """
     A 2D vector.
@@ -57,7 +78,7 @@ class Vector2:
     y: float  #: y component of the vector.
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Rect2:
     """
     A 2D rectangle.
@@ -65,3 +86,76 @@ class Rect2:
 
     position: Vector2  #: Position of the top left corner of the rectangle.
     size: Vector2  #: Width (x) and height (y) of the rectangle.
+
+
+@dataclass(frozen=True, slots=True)
+class Vector3:
+    """
+    A 3D vector.
+    """
+
+    x: float  #: x component of the vector.
+    y: float  #: y component of the vector.
+    z: float  #: z component of the vector.
+
+
+@dataclass(frozen=True, slots=True)
+class Plane:
+    """
+    A plane in 3D space.
+    """
+
+    normal: Vector3  #: Normal of the plane.
+    d: float  #: Distance of the plane from the origin, along its normal.
+
+
+@dataclass(frozen=True, slots=True)
+class Quat:
+    """
+    A quaternion, used for representing 3D rotations.
+    """
+
+    x: float  #: x component of the quaternion.
+    y: float  #: y component of the quaternion.
+    z: float  #: z component of the quaternion.
+    w: float  #: w component of the quaternion.
+
+
+@dataclass(frozen=True, slots=True)
+class AABB:
+    """
+    An axis-aligned 3D box.
+    """
+
+    position: Vector3  #: Position of the corner of the box with the smallest coordinates.
+    size: Vector3  #: Width (x), height (y) and depth (z) of the box.
+
+
+@dataclass(frozen=True, slots=True)
+class Basis:
+    """
+    A 3x3 matrix, used for representing 3D rotation and scale.
+    """
+
+    rows: Tuple[Vector3, Vector3, Vector3]  #: Rows of the matrix, from top to bottom.
+
+
+@dataclass(frozen=True, slots=True)
+class Transform:
+    """
+    A 3D transform.
+    """
+
+    basis: Basis  #: Rotation and scale of the transform.
+    origin: Vector3  #: Translation of the transform.
+
+
+@dataclass(frozen=True, slots=True)
+class Transform2D:
+    """
+    A 2D transform.
+    """
+
+    x: Vector2  #: x axis of the transform.
+    y: Vector2  #: y axis of the transform.
+    origin: Vector2  #: Translation of the transform.
@@ -4,12 +4,14 @@ Classes related to monster forms (species).
 from dataclasses import dataclass
 from typing import cast, IO, List, Optional, Union
 
+import sys
+
 import godot_parser as gp
 
 from .misc_types import Color
 
 
-@dataclass
+@dataclass(slots=True)
 class TapeUpgrade:
     """
     An activity that occurs when a monster tape reaches a specific grade level.
@@ -32,7 +34,7 @@ class TapeUpgrade:
 
         ext_resource = scene.find_ext_resource(id=sticker_resource.id)
         assert ext_resource is not None
-        sticker = ext_resource.path
+        sticker = sys.intern(ext_resource.path)
 
         assert isinstance(name, str)
         assert isinstance(add_slot, bool)
@@ -41,7 +43,7 @@ class TapeUpgrade:
         return TapeUpgrade(name=name, add_slot=add_slot, sticker=sticker)
 
 
-@dataclass
+@dataclass(slots=True)
 class Evolution:
     """
     A remastering that a monster tape can undergo.
@@ -59,7 +61,7 @@ class Evolution:
     is_secret: bool
 
 
-@dataclass
+@dataclass(slots=True)
 class MonsterForm:
     """
     A monster form (species).
@@ -217,7 +219,8 @@ class MonsterForm:
 
         for tag in move_tags:
             assert isinstance(tag, str)
-        move_tags = cast(List[str], move_tags)
+        # Tags are shared by many monsters and moves, so only keep one copy of each
+        move_tags = [sys.intern(tag) for tag in cast(List[str], move_tags)]
 
         for bio in bestiary_bios:
             assert isinstance(bio, str)
@@ -231,7 +234,7 @@ class MonsterForm:
             battle_cry=battle_cry,
             elemental_types=elemental_types,
             exp_yield=exp_yield,
-            require_dlc=require_dlc,
+            require_dlc=sys.intern(require_dlc),
             pronouns=pronouns,
             description=description,
             max_hp=max_hp,
@@ -247,7 +250,7 @@ class MonsterForm:
             evolutions=evolutions,
             bestiary_index=bestiary_index,
             move_tags=move_tags,
-            battle_sprite_path=battle_sprite_path,
+            battle_sprite_path=sys.intern(battle_sprite_path),
             tape_upgrades=tape_upgrades,
             bestiary_bios=bestiary_bios,
         )
@@ -269,7 +272,7 @@ class MonsterForm:
                 ext_resource = scene.find_ext_resource(id=upgrade.id)
                 assert ext_resource is not None
 
-                tape_upgrades.append(ext_resource.path)
+                tape_upgrades.append(sys.intern(ext_resource.path))
                 continue
 
             raise ValueError(f"Could not find tape upgrade with id={upgrade.id}")
@@ -287,7 +290,7 @@ class MonsterForm:
         ext_resource = scene.find_ext_resource(id=battle_cry_raw.id)
         assert ext_resource is not None
 
-        return ext_resource.path
+        return sys.intern(ext_resource.path)
 
     @staticmethod
     def __parse_elemental_types(
@@ -300,7 +303,7 @@ class MonsterForm:
             assert ext_resource is not None
 
             elemental_type = ext_resource.path.split("/")[-1].split(".tres")[0]
-            elemental_types.append(elemental_type)
+            elemental_types.append(sys.intern(elemental_type))
 
         return elemental_types
 
@@ -325,7 +328,7 @@ class MonsterForm:
             evolved_form_raw = sub_resource["evolved_form"]
             ext_resource = scene.find_ext_resource(id=evolved_form_raw.id)
             assert ext_resource is not None
-            evolved_form = ext_resource.path
+            evolved_form = sys.intern(ext_resource.path)
 
             assert isinstance(name, str)
             assert isinstance(required_tape_grade, int)
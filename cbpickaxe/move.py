@@ -5,6 +5,7 @@ from dataclasses import dataclass
 from typing import cast, IO, List, Optional
 
 import enum
+import sys
 
 import godot_parser as gp
 
@@ -39,7 +40,7 @@ class TargetType(enum.Enum):
         return str(self)
 
 
-@dataclass
+@dataclass(slots=True)
 class Move:
     """
     A move / sticker that monsters can use in battle.
@@ -121,11 +122,12 @@ class Move:
 
         for tag in tags:
             assert isinstance(tag, str)
-        tags = cast(List[str], tags)
+        # Tags are shared by many monsters and moves, so only keep one copy of each
+        tags = [sys.intern(tag) for tag in cast(List[str], tags)]
 
         return Move(
             name=name,
-            category_name=category_name,
+            category_name=sys.intern(category_name),
             description=description,
             cost=cost,
             is_passive_only=is_passive_only,
@@ -152,6 +154,6 @@ class Move:
             assert ext_resource is not None
 
             elemental_type = ext_resource.path.split("/")[-1].split(".tres")[0]
-            elemental_types.append(elemental_type)
+            elemental_types.append(sys.intern(elemental_type))
 
         return elemental_types
@@ -2,18 +2,59 @@
 Classes and methods for parsing Godot resource files.
 """
 from dataclasses import dataclass
-from typing import Dict, IO, List, Literal, Tuple, Union
+from typing import Any, Callable, Dict, IO, List, Literal, Sequence, Tuple, Union
 
 import enum
 import struct
 
-from .misc_types import Vector2, Rect2
+from .misc_types import (
+    AABB,
+    Basis,
+    Color,
+    Plane,
+    Quat,
+    Rect2,
+    Transform,
+    Transform2D,
+    Vector2,
+    Vector3,
+)
 
 OBJECT_EMPTY = 0
 OBJECT_EXTERNAL_RESOURCE = 1
 OBJECT_INTERNAL_RESOURCE = 2
 OBJECT_EXTERNAL_RESOURCE_INDEX = 3
 
+# Sizes in bytes of the variant types that are always stored using the same number of bytes.
+FIXED_VARIANT_SIZES = {
+    1: 0,  # VARIANT_NIL
+    2: 4,  # VARIANT_BOOL
+    3: 4,  # VARIANT_INT
+    4: 4,  # VARIANT_REAL
+    10: 8,  # VARIANT_VECTOR2
+    11: 16,  # VARIANT_RECT2
+    12: 12,  # VARIANT_VECTOR3
+    13: 16,  # VARIANT_PLANE
+    14: 16,  # VARIANT_QUAT
+    15: 24,  # VARIANT_AABB
+    16: 36,  # VARIANT_MATRIX3
+    17: 48,  # VARIANT_TRANSFORM
+    18: 24,  # VARIANT_MATRIX32
+    20: 16,  # VARIANT_COLOR
+    23: 4,  # VARIANT_RID
+    40: 8,  # VARIANT_INT64
+    41: 8,  # VARIANT_DOUBLE
+}
+
+# Sizes in bytes of the elements of the variant array types that store fixed size elements.
+ARRAY_ELEMENT_SIZES = {
+    32: 4,  # VARIANT_INT32_ARRAY
+    33: 4,  # VARIANT_REAL_ARRAY
+    35: 12,  # VARIANT_VECTOR3_ARRAY
+    36: 16,  # VARIANT_COLOR_ARRAY
+    37: 8,  # VARIANT_VECTOR2_ARRAY
+}
+
 
 @dataclass(frozen=True)
 class ResourceHeader:
@@ -101,6 +142,16 @@ class ExternalResourceIndex:
     index: int
 
 
+@dataclass(frozen=True)
+class ExternalResource:
+    """
+    A reference to an external resource by its type and path, rather than by its index.
+    """
+
+    resource_type: str
+    path: str
+
+
 @dataclass(frozen=True)
 class InternalResourceIndex:
     """
@@ -118,24 +169,37 @@ class NodePath:
 
     name_parts: List[str]
     sub_name_parts: List[str]
+    absolute: bool = False
 
 
 PropertyValue = Union[
-    List[bytes],
+    bytes,
     List[int],
     List[float],
     List[str],
+    List[Vector2],
+    List[Vector3],
+    List[Color],
     str,
     bool,
     int,
     float,
     None,
+    ExternalResource,
     ExternalResourceIndex,
     InternalResourceIndex,
     NodePath,
     List["PropertyValue"],
     Vector2,
     Rect2,
+    Vector3,
+    Plane,
+    Quat,
+    AABB,
+    Basis,
+    Transform,
+    Transform2D,
+    Color,
     Dict[str, "PropertyValue"],
 ]
 
@@ -213,136 +277,455 @@ def get_string(
     """
     index = int.from_bytes(input_stream.read(4), endian)
     if index & 0x80000000:
-        raise NotImplementedError()
-        # This code below should works, but has not yet been tested. Once we have a case to test
-        # this, we can uncomment it and try it out.
-        # length = index & 0x7FFFFFFF
-        # if length == 0:
-        #    return ""
+        # The string is stored inline instead, as its length in bytes followed by its bytes
+        return input_stream.read(index & 0x7FFFFFFF).decode("utf8")
 
-        # prev_location = input_stream.tell()
-        # string = read_unicode_string(input_stream, endian)
-        # input_stream.seek(prev_location)
+    return string_map[index]
 
-        # return string
 
-    return string_map[index]
+def seek_to_property(
+    input_stream: IO[bytes], header: ResourceHeader, offset: int, name: str
+) -> bool:
+    """
+    Moves the given input stream to the value of the property with the given name in the internal
+    resource at the given offset, skipping over the values of any properties before it without
+    decoding them.
+
+    Returns False if the resource does not have a property with that name.
+    """
+    try:
+        name_index = header.string_map.index(name + "\x00")
+    except ValueError:
+        return False
 
+    input_stream.seek(offset)
+    _rtype = read_unicode_string(input_stream, header.endian)
 
-def read_variant(
+    pc = int.from_bytes(input_stream.read(4), header.endian)
+    for _ in range(0, pc):
+        # Property names are indexes into the string map, so they can be compared without
+        # decoding them
+        if int.from_bytes(input_stream.read(4), header.endian) == name_index:
+            return True
+
+        skip_variant(input_stream, header.endian)
+
+    return False
+
+
+def seek_to_dictionary_key(
     input_stream: IO[bytes],
     endian: Literal["big", "little"],
     string_map: List[str],
-) -> PropertyValue:
+    key: str,
+) -> bool:
     """
-    Reads in a "variant" value from the given input stream.
+    Moves the given input stream from the start of a dictionary variant to the value of the given
+    key, skipping over the values of any entries before it without decoding them.
+
+    Returns False if the variant is not a dictionary or does not contain that key.
+    """
+    t = int.from_bytes(input_stream.read(4), endian)
+    if t != VariantBin.VARIANT_DICTIONARY.value:
+        return False
+
+    size = int.from_bytes(input_stream.read(4), endian) & 0x7FFFFFFF
+    for _ in range(0, size):
+        entry_key = read_variant(input_stream, endian, string_map)
+        if isinstance(entry_key, str) and entry_key.rstrip("\x00") == key:
+            return True
+
+        skip_variant(input_stream, endian)
+
+    return False
+
+
+def skip_variant(input_stream: IO[bytes], endian: Literal["big", "little"]) -> None:
+    """
+    Moves the given input stream past the "variant" value that it is at, without decoding it.
+
+    Variants of fixed size and arrays of fixed size elements are skipped over in a single seek.
     """
     t = int.from_bytes(input_stream.read(4), endian)
 
-    v = VariantBin(t)
-    if v == VariantBin.VARIANT_BOOL:
-        value = int.from_bytes(input_stream.read(4), endian)
-        return value == 0
-    elif v == VariantBin.VARIANT_INT:
-        return int.from_bytes(input_stream.read(4), endian)
-    elif v == VariantBin.VARIANT_REAL:
-        value = struct.unpack("f", input_stream.read(4))[0]
+    fixed_size = FIXED_VARIANT_SIZES.get(t)
+    if fixed_size is not None:
+        input_stream.seek(fixed_size, 1)
+        return
+
+    element_size = ARRAY_ELEMENT_SIZES.get(t)
+    if element_size is not None:
+        length = int.from_bytes(input_stream.read(4), endian)
+        input_stream.seek(length * element_size, 1)
+        return
+
+    if t == VariantBin.VARIANT_STRING.value:
+        length = int.from_bytes(input_stream.read(4), endian)
+        input_stream.seek(length, 1)
+    elif t == VariantBin.VARIANT_RAW_ARRAY.value:
+        length = int.from_bytes(input_stream.read(4), endian)
+        input_stream.seek(length + (-length % 4), 1)
+    elif t == VariantBin.VARIANT_STRING_ARRAY.value:
+        length = int.from_bytes(input_stream.read(4), endian)
+        for _ in range(0, length):
+            string_length = int.from_bytes(input_stream.read(4), endian)
+            input_stream.seek(string_length, 1)
+    elif t == VariantBin.VARIANT_NODE_PATH.value:
+        name_count = int.from_bytes(input_stream.read(2), endian)
+        snc = int.from_bytes(input_stream.read(2), endian) & 0x7FFF
+        for _ in range(0, name_count + snc):
+            index = int.from_bytes(input_stream.read(4), endian)
+            if index & 0x80000000:
+                input_stream.seek(index & 0x7FFFFFFF, 1)
+    elif t == VariantBin.VARIANT_OBJECT.value:
+        kind = int.from_bytes(input_stream.read(4), endian)
+        if kind in (OBJECT_INTERNAL_RESOURCE, OBJECT_EXTERNAL_RESOURCE_INDEX):
+            input_stream.seek(4, 1)
+        elif kind == OBJECT_EXTERNAL_RESOURCE:
+            for _ in range(0, 2):
+                length = int.from_bytes(input_stream.read(4), endian)
+                input_stream.seek(length, 1)
+        elif kind != OBJECT_EMPTY:
+            raise NotImplementedError(f"t={t} kind={kind}")
+    elif t == VariantBin.VARIANT_DICTIONARY.value:
+        size = int.from_bytes(input_stream.read(4), endian) & 0x7FFFFFFF
+        for _ in range(0, size * 2):
+            skip_variant(input_stream, endian)
+    elif t == VariantBin.VARIANT_ARRAY.value:
+        length = int.from_bytes(input_stream.read(4), endian) & 0x7FFFFFFF
+        for _ in range(0, length):
+            skip_variant(input_stream, endian)
+    else:
+        raise NotImplementedError(f"t={t}")
+
+
+# pylint: disable-next=too-few-public-methods
+class _VariantReader:
+    """
+    Decodes variants of one endianness, dispatching on their type id through a table of decoding
+    methods.
+
+    Packed arrays (ex. of ints, floats, vectors or colors) are unpacked in a single call, instead
+    of one element at a time.
+    """
+
+    def __init__(self, endian: Literal["big", "little"]) -> None:
+        self.__endian = endian
+        self.__prefix = "<" if endian == "little" else ">"
+        self.__u32 = struct.Struct(self.__prefix + "I")
+        self.__i32 = struct.Struct(self.__prefix + "i")
+        self.__i64 = struct.Struct(self.__prefix + "q")
+        self.__f32 = struct.Struct(self.__prefix + "f")
+        self.__f64 = struct.Struct(self.__prefix + "d")
+        self.__u16_pair = struct.Struct(self.__prefix + "HH")
+        self.__floats = {
+            count: struct.Struct(f"{self.__prefix}{count}f")
+            for count in [2, 3, 4, 6, 9, 12]
+        }
+
+        self.__readers: Dict[int, Callable[[IO[bytes], List[str]], PropertyValue]] = {
+            VariantBin.VARIANT_NIL.value: self.__read_nil,
+            VariantBin.VARIANT_BOOL.value: self.__read_bool,
+            VariantBin.VARIANT_INT.value: self.__read_int,
+            VariantBin.VARIANT_REAL.value: self.__read_real,
+            VariantBin.VARIANT_STRING.value: self.__read_string,
+            VariantBin.VARIANT_VECTOR2.value: self.__read_vector2,
+            VariantBin.VARIANT_RECT2.value: self.__read_rect2,
+            VariantBin.VARIANT_VECTOR3.value: self.__read_vector3,
+            VariantBin.VARIANT_PLANE.value: self.__read_plane,
+            VariantBin.VARIANT_QUAT.value: self.__read_quat,
+            VariantBin.VARIANT_AABB.value: self.__read_aabb,
+            VariantBin.VARIANT_MATRIX3.value: self.__read_basis,
+            VariantBin.VARIANT_TRANSFORM.value: self.__read_transform,
+            VariantBin.VARIANT_MATRIX32.value: self.__read_transform_2d,
+            VariantBin.VARIANT_COLOR.value: self.__read_color,
+            VariantBin.VARIANT_NODE_PATH.value: self.__read_node_path,
+            VariantBin.VARIANT_RID.value: self.__read_rid,
+            VariantBin.VARIANT_OBJECT.value: self.__read_object,
+            VariantBin.VARIANT_DICTIONARY.value: self.__read_dictionary,
+            VariantBin.VARIANT_ARRAY.value: self.__read_array,
+            VariantBin.VARIANT_RAW_ARRAY.value: self.__read_raw_array,
+            VariantBin.VARIANT_INT32_ARRAY.value: self.__read_int32_array,
+            VariantBin.VARIANT_REAL_ARRAY.value: self.__read_real_array,
+            VariantBin.VARIANT_STRING_ARRAY.value: self.__read_string_array,
+            VariantBin.VARIANT_VECTOR3_ARRAY.value: self.__read_vector3_array,
+            VariantBin.VARIANT_COLOR_ARRAY.value: self.__read_color_array,
+            VariantBin.VARIANT_VECTOR2_ARRAY.value: self.__read_vector2_array,
+            VariantBin.VARIANT_INT64.value: self.__read_int64,
+            VariantBin.VARIANT_DOUBLE.value: self.__read_double,
+        }
+
+    def read(self, input_stream: IO[bytes], string_map: List[str]) -> PropertyValue:
+        """
+        Reads in a "variant" value from the given input stream.
+        """
+        (t,) = self.__u32.unpack(input_stream.read(4))
+
+        reader = self.__readers.get(t)
+        if reader is None:
+            raise NotImplementedError(f"t={t}")
+
+        return reader(input_stream, string_map)
+
+    def __read_u32(self, input_stream: IO[bytes]) -> int:
+        value = self.__u32.unpack(input_stream.read(4))[0]
+        assert isinstance(value, int)
+
+        return value
+
+    def __read_floats(self, input_stream: IO[bytes], count: int) -> Tuple[float, ...]:
+        return self.__floats[count].unpack(input_stream.read(4 * count))
+
+    def __read_packed(
+        self, input_stream: IO[bytes], element_format: str, element_size: int
+    ) -> Tuple[Any, ...]:
+        length = self.__read_u32(input_stream)
+
+        return struct.unpack(
+            f"{self.__prefix}{length * len(element_format)}{element_format[0]}",
+            input_stream.read(length * element_size),
+        )
+
+    def __read_nil(self, _input_stream: IO[bytes], _string_map: List[str]) -> None:
+        return None
+
+    def __read_bool(self, input_stream: IO[bytes], _string_map: List[str]) -> bool:
+        return self.__read_u32(input_stream) != 0
+
+    def __read_int(self, input_stream: IO[bytes], _string_map: List[str]) -> int:
+        value = self.__i32.unpack(input_stream.read(4))[0]
+        assert isinstance(value, int)
+
+        return value
+
+    def __read_int64(self, input_stream: IO[bytes], _string_map: List[str]) -> int:
+        value = self.__i64.unpack(input_stream.read(8))[0]
+        assert isinstance(value, int)
+
+        return value
+
+    def __read_real(self, input_stream: IO[bytes], _string_map: List[str]) -> float:
+        value = self.__f32.unpack(input_stream.read(4))[0]
         assert isinstance(value, float)
 
         return value
-    elif v == VariantBin.VARIANT_STRING:
-        return read_unicode_string(input_stream, endian)
-    elif v == VariantBin.VARIANT_VECTOR2:
-        x = struct.unpack("f", input_stream.read(4))[0]
-        y = struct.unpack("f", input_stream.read(4))[0]
-
-        return Vector2(x, y)
-    elif v == VariantBin.VARIANT_RECT2:
-        position_x = struct.unpack("f", input_stream.read(4))[0]
-        position_y = struct.unpack("f", input_stream.read(4))[0]
-        size_x = struct.unpack("f", input_stream.read(4))[0]
-        size_y = struct.unpack("f", input_stream.read(4))[0]
-
-        return Rect2(Vector2(position_x, position_y), Vector2(size_x, size_y))
-    elif v == VariantBin.VARIANT_NODE_PATH:
-        name_count = int.from_bytes(input_stream.read(2), endian)
-        snc = int.from_bytes(input_stream.read(2), endian)
 
-        is_absolute = snc >= 0x8000
-        assert not is_absolute, "Not yet supported"
+    def __read_double(self, input_stream: IO[bytes], _string_map: List[str]) -> float:
+        value = self.__f64.unpack(input_stream.read(8))[0]
+        assert isinstance(value, float)
 
-        name_parts = []
-        for _ in range(0, name_count):
-            name_parts.append(get_string(input_stream, endian, string_map))
+        return value
 
-        sub_name_parts = []
-        for _ in range(0, snc):
-            sub_name_parts.append(get_string(input_stream, endian, string_map))
+    def __read_string(self, input_stream: IO[bytes], _string_map: List[str]) -> str:
+        length = self.__read_u32(input_stream)
 
-        return NodePath(name_parts, sub_name_parts)
-    elif v == VariantBin.VARIANT_OBJECT:
-        kind = int.from_bytes(input_stream.read(4), endian)
+        return input_stream.read(length).decode("utf8")
+
+    def __read_vector2(
+        self, input_stream: IO[bytes], _string_map: List[str]
+    ) -> Vector2:
+        return Vector2(*self.__read_floats(input_stream, 2))
+
+    def __read_rect2(self, input_stream: IO[bytes], _string_map: List[str]) -> Rect2:
+        x, y, width, height = self.__read_floats(input_stream, 4)
+
+        return Rect2(Vector2(x, y), Vector2(width, height))
+
+    def __read_vector3(
+        self, input_stream: IO[bytes], _string_map: List[str]
+    ) -> Vector3:
+        return Vector3(*self.__read_floats(input_stream, 3))
+
+    def __read_plane(self, input_stream: IO[bytes], _string_map: List[str]) -> Plane:
+        x, y, z, d = self.__read_floats(input_stream, 4)
+
+        return Plane(Vector3(x, y, z), d)
+
+    def __read_quat(self, input_stream: IO[bytes], _string_map: List[str]) -> Quat:
+        return Quat(*self.__read_floats(input_stream, 4))
+
+    def __read_aabb(self, input_stream: IO[bytes], _string_map: List[str]) -> AABB:
+        values = self.__read_floats(input_stream, 6)
+
+        return AABB(Vector3(*values[0:3]), Vector3(*values[3:6]))
+
+    def __read_basis(self, input_stream: IO[bytes], _string_map: List[str]) -> Basis:
+        return _to_basis(self.__read_floats(input_stream, 9))
+
+    def __read_transform(
+        self, input_stream: IO[bytes], _string_map: List[str]
+    ) -> Transform:
+        values = self.__read_floats(input_stream, 12)
+
+        return Transform(_to_basis(values[0:9]), Vector3(*values[9:12]))
+
+    def __read_transform_2d(
+        self, input_stream: IO[bytes], _string_map: List[str]
+    ) -> Transform2D:
+        values = self.__read_floats(input_stream, 6)
+
+        return Transform2D(
+            Vector2(values[0], values[1]),
+            Vector2(values[2], values[3]),
+            Vector2(values[4], values[5]),
+        )
+
+    def __read_color(self, input_stream: IO[bytes], _string_map: List[str]) -> Color:
+        return Color(*self.__read_floats(input_stream, 4))
+
+    def __read_node_path(
+        self, input_stream: IO[bytes], string_map: List[str]
+    ) -> NodePath:
+        name_count, snc = self.__u16_pair.unpack(input_stream.read(4))
+
+        is_absolute = snc >= 0x8000
+        snc &= 0x7FFF
+
+        start = input_stream.tell()
+        indexes = struct.unpack(
+            f"{self.__prefix}{name_count + snc}I",
+            input_stream.read(4 * (name_count + snc)),
+        )
+        if any(index & 0x80000000 for index in indexes):
+            # Some of the names are stored inline instead of in the string map, so they have to
+            # be read one at a time
+            input_stream.seek(start)
+            parts = [
+                get_string(input_stream, self.__endian, string_map)
+                for _ in range(0, name_count + snc)
+            ]
+        else:
+            parts = [string_map[index] for index in indexes]
+
+        return NodePath(parts[:name_count], parts[name_count:], is_absolute)
+
+    def __read_rid(self, input_stream: IO[bytes], _string_map: List[str]) -> int:
+        return self.__read_u32(input_stream)
+
+    def __read_object(
+        self, input_stream: IO[bytes], string_map: List[str]
+    ) -> Union[None, ExternalResource, ExternalResourceIndex, InternalResourceIndex]:
+        kind = self.__read_u32(input_stream)
         if kind == OBJECT_EMPTY:
             return None
         elif kind == OBJECT_EXTERNAL_RESOURCE_INDEX:
-            index = int.from_bytes(input_stream.read(4), endian)
-            return ExternalResourceIndex(index)
+            return ExternalResourceIndex(self.__read_u32(input_stream))
         elif kind == OBJECT_INTERNAL_RESOURCE:
-            index = int.from_bytes(input_stream.read(4), endian)
-            return InternalResourceIndex(index)
+            return InternalResourceIndex(self.__read_u32(input_stream))
+        elif kind == OBJECT_EXTERNAL_RESOURCE:
+            resource_type = self.__read_string(input_stream, string_map)
+            path = self.__read_string(input_stream, string_map)
+
+            return ExternalResource(resource_type, path)
 
-        raise NotImplementedError(f"t={t} kind={kind}")
-    elif v == VariantBin.VARIANT_DICTIONARY:
-        size = int.from_bytes(input_stream.read(4), endian)
+        raise NotImplementedError(f"t={VariantBin.VARIANT_OBJECT.value} kind={kind}")
+
+    def __read_dictionary(
+        self, input_stream: IO[bytes], string_map: List[str]
+    ) -> Dict[str, PropertyValue]:
+        # The highest bit marks whether the dictionary is shared
+        size = self.__read_u32(input_stream) & 0x7FFFFFFF
 
         data: Dict[str, PropertyValue] = {}
         for _ in range(0, size):
-            key = read_variant(input_stream, endian, string_map)
+            key = self.read(input_stream, string_map)
             assert isinstance(key, str)
 
-            key_value = read_variant(input_stream, endian, string_map)
-            data[key] = key_value
+            data[key] = self.read(input_stream, string_map)
 
         return data
-    elif v == VariantBin.VARIANT_RAW_ARRAY:
-        length = int.from_bytes(input_stream.read(4), endian)
-        values_bytes: List[bytes] = [input_stream.read(1) for _ in range(0, length)]
 
-        extra = 4 - (length % 4)
-        if extra < 4:
-            for _ in range(0, extra):
-                input_stream.read(1)
+    def __read_array(
+        self, input_stream: IO[bytes], string_map: List[str]
+    ) -> List[PropertyValue]:
+        # The highest bit marks whether the array is shared
+        length = self.__read_u32(input_stream) & 0x7FFFFFFF
 
-        return values_bytes
-    elif v == VariantBin.VARIANT_ARRAY:
-        length = int.from_bytes(input_stream.read(4), endian)
-        values: List[PropertyValue] = [
-            read_variant(input_stream, endian, string_map) for _ in range(0, length)
-        ]
+        return [self.read(input_stream, string_map) for _ in range(0, length)]
 
-        return values
-    elif v == VariantBin.VARIANT_STRING_ARRAY:
-        length = int.from_bytes(input_stream.read(4), endian)
-        values_strings: List[str] = [
-            read_unicode_string(input_stream, endian) for _ in range(0, length)
-        ]
+    def __read_raw_array(
+        self, input_stream: IO[bytes], _string_map: List[str]
+    ) -> bytes:
+        length = self.__read_u32(input_stream)
+        data = input_stream.read(length)
 
-        return values_strings
-    elif v == VariantBin.VARIANT_INT32_ARRAY:
-        length = int.from_bytes(input_stream.read(4), endian)
-        values_ints: List[int] = [
-            int.from_bytes(input_stream.read(4), endian) for _ in range(0, length)
+        # Skip the padding to the next multiple of 4 bytes
+        input_stream.read(-length % 4)
+
+        return data
+
+    def __read_int32_array(
+        self, input_stream: IO[bytes], _string_map: List[str]
+    ) -> List[int]:
+        return list(self.__read_packed(input_stream, "i", 4))
+
+    def __read_real_array(
+        self, input_stream: IO[bytes], _string_map: List[str]
+    ) -> List[float]:
+        return list(self.__read_packed(input_stream, "f", 4))
+
+    def __read_string_array(
+        self, input_stream: IO[bytes], string_map: List[str]
+    ) -> List[str]:
+        length = self.__read_u32(input_stream)
+
+        return [self.__read_string(input_stream, string_map) for _ in range(0, length)]
+
+    def __read_vector2_array(
+        self, input_stream: IO[bytes], _string_map: List[str]
+    ) -> List[Vector2]:
+        values = self.__read_packed(input_stream, "ff", 8)
+
+        return [Vector2(values[i], values[i + 1]) for i in range(0, len(values), 2)]
+
+    def __read_vector3_array(
+        self, input_stream: IO[bytes], _string_map: List[str]
+    ) -> List[Vector3]:
+        values = self.__read_packed(input_stream, "fff", 12)
+
+        return [
+            Vector3(values[i], values[i + 1], values[i + 2])
+            for i in range(0, len(values), 3)
         ]
 
-        return values_ints
-    elif v == VariantBin.VARIANT_REAL_ARRAY:
-        length = int.from_bytes(input_stream.read(4), endian)
-        values_floats: List[float] = [
-            struct.unpack("f", input_stream.read(4))[0] for _ in range(0, length)
+    def __read_color_array(
+        self, input_stream: IO[bytes], _string_map: List[str]
+    ) -> List[Color]:
+        values = self.__read_packed(input_stream, "ffff", 16)
+
+        return [
+            Color(values[i], values[i + 1], values[i + 2], values[i + 3])
+            for i in range(0, len(values), 4)
         ]
 
-        return values_floats
-    else:
-        raise NotImplementedError(f"t={t}")
 
-    raise NotImplementedError()
+def _to_basis(values: Sequence[float]) -> Basis:
+    return Basis(
+        (
+            Vector3(values[0], values[1], values[2]),
+            Vector3(values[3], values[4], values[5]),
+            Vector3(values[6], values[7], values[8]),
+        )
+    )
+
+
+# Decoders for each endianness, so that their structs only need to be compiled once
+_VARIANT_READERS = {
+    "little": _VariantReader("little"),
+    "big": _VariantReader("big"),
+}
+
+
+def read_variant(
+    input_stream: IO[bytes],
+    endian: Literal["big", "little"],
+    string_map: List[str],
+) -> PropertyValue:
+    """
+    Reads in a "variant" value from the given input stream.
+
+    All of the types of variants that Godot 3 stores in binary resource files are supported.
+    Resources saved with 64-bit reals are not supported, since Godot does not use them by
+    default.
+    """
+    return _VARIANT_READERS[endian].read(input_stream, string_map)
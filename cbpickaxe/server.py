@@ -0,0 +1,557 @@
+"""
+Classes for serving the data loaded by a Hoylake to other processes, so that they do not each need
+to load in the game's files themselves.
+
+Queries are JSON objects sent in the body of an HTTP POST request, either to a localhost port or
+to a Unix domain socket. Each query names the kind of query to run, along with its arguments:
+
+.. code-block:: json
+
+    {"query": "translate", "strings": ["KITTELLY_NAME"], "locale": "en"}
+
+The response is a JSON object with either a "result" or an "error".
+"""
+from typing import Any, Callable, Dict, List, Optional, Tuple, TYPE_CHECKING
+
+import dataclasses
+import enum
+import http.client
+import http.server
+import json
+import os
+import pathlib
+import select
+import socket
+import socketserver
+import threading
+
+from . import SERVER_ENV_VAR
+
+if TYPE_CHECKING:
+    from .hoylake import Hoylake
+
+DEFAULT_PORT = 8765
+
+_UNIX_PREFIX = "unix:"
+
+# Unix domain sockets are not available on every platform (ex. older versions of Windows)
+_UNIX_SOCKETS_SUPPORTED = hasattr(socket, "AF_UNIX")
+
+
+def to_json(value: Any) -> Any:
+    """
+    Converts the given value (ex. a MonsterForm) into a value made up of only JSON types.
+    """
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return {
+            field.name: to_json(getattr(value, field.name))
+            for field in dataclasses.fields(value)
+        }
+    if isinstance(value, enum.Enum):
+        return value.name
+    if isinstance(value, dict):
+        return {str(k): to_json(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return [to_json(element) for element in value]
+
+    return value
+
+
+def _to_json_fields(value: Any, fields: Optional[List[str]]) -> Dict[str, Any]:
+    """
+    Converts only the given fields of the given resource into JSON types, or all of its fields if
+    no fields are given.
+    """
+    if fields is None:
+        converted: Dict[str, Any] = to_json(value)
+        return converted
+
+    names = {field.name for field in dataclasses.fields(value)}
+    unknown = [field for field in fields if field not in names]
+    if len(unknown) > 0:
+        raise ValueError(
+            f'Unknown fields: {", ".join(map(str, unknown))}. Supported fields are: {", ".join(sorted(names))}'
+        )
+
+    return {field: to_json(getattr(value, field)) for field in fields}
+
+
+# pylint: disable-next=too-few-public-methods
+class QueryHandler:
+    """
+    Answers queries about the data loaded by a Hoylake.
+
+    Queries that load in files (ex. "load") store the loaded files in the Hoylake, so later
+    queries for the same files are answered from memory.
+    """
+
+    def __init__(self, hoylake: "Hoylake") -> None:
+        # Imported here so that clients do not need to import the parsing code
+        # pylint: disable-next=import-outside-toplevel
+        from . import elemental_type, item, monster_form, move
+
+        self.hoylake = hoylake
+
+        self.__resource_types: Dict[str, type] = {
+            "elemental_type": elemental_type.ElementalType,
+            "item": item.Item,
+            "monster_form": monster_form.MonsterForm,
+            "move": move.Move,
+        }
+
+        self.__queries: Dict[str, Callable[[Dict[str, Any]], Any]] = {
+            "compatible": self.__compatible,
+            "load": self.__load,
+            "load_all": self.__load_all,
+            "monster_forms_by_tags": self.__monster_forms_by_tags,
+            "preload": self.__preload,
+            "roots": self.__roots,
+            "translate": self.__translate,
+        }
+
+    def handle(self, query: Dict[str, Any]) -> Any:
+        """
+        Runs the given query and returns its result.
+
+        If the query is malformed or fails, then a ValueError will be raised.
+        """
+        if not isinstance(query, dict):
+            raise ValueError(f"Query must be a JSON object, got: {query}")
+
+        name = query.get("query")
+        if not isinstance(name, str) or name not in self.__queries:
+            raise ValueError(
+                f'Unknown query: {name}. Supported queries are: {", ".join(sorted(self.__queries))}'
+            )
+
+        try:
+            return self.__queries[name](query)
+        except KeyError as e:
+            raise ValueError(f"Query {name} is missing argument: {e}") from e
+        except TypeError as e:
+            raise ValueError(
+                f"Query {name} has an argument of the wrong type: {e}"
+            ) from e
+
+    def __roots(self, _: Dict[str, Any]) -> Dict[str, str]:
+        return {name: str(root) for name, root in self.hoylake.get_roots().items()}
+
+    def __load(self, query: Dict[str, Any]) -> Dict[str, Any]:
+        resource_type = self.__get_resource_type(query)
+        path = self.__check_res_path(query["path"])
+
+        loaded: Optional[Tuple[str, Any]] = self.hoylake.get_loaded(resource_type, path)
+        if loaded is None:
+            loaded = getattr(self.hoylake, f"load_{query['type']}")(path)
+
+        root_name, resource = loaded
+        return {"path": path, "root": root_name, "data": to_json(resource)}
+
+    def __load_all(self, query: Dict[str, Any]) -> List[Dict[str, Any]]:
+        self.__get_resource_type(query)
+        path = self.__check_res_path(query["path"])
+
+        resources = getattr(self.hoylake, f"load_{query['type']}s")(path)
+        fields = query.get("fields")
+        return [
+            {"path": path, "root": root_name, "data": _to_json_fields(resource, fields)}
+            for path, (root_name, resource) in sorted(resources.items())
+        ]
+
+    def __preload(self, query: Dict[str, Any]) -> int:
+        self.__get_resource_type(query)
+        path = self.__check_res_path(query["path"])
+
+        resources = getattr(self.hoylake, f"load_{query['type']}s")(path)
+        return len(resources)
+
+    def __translate(self, query: Dict[str, Any]) -> List[str]:
+        locale = query.get("locale")
+        return [self.hoylake.translate(string, locale) for string in query["strings"]]
+
+    def __monster_forms_by_tags(self, query: Dict[str, Any]) -> List[Dict[str, Any]]:
+        monster_forms = self.hoylake.get_monster_forms_by_tags(
+            query["tags"], include_any=query.get("include_any", True)
+        )
+        fields = query.get("fields")
+        return [
+            {
+                "path": path,
+                "root": root_name,
+                "data": _to_json_fields(monster_form, fields),
+            }
+            for path, (root_name, monster_form) in sorted(monster_forms.items())
+        ]
+
+    def __compatible(self, query: Dict[str, Any]) -> bool:
+        _, monster_form = self.hoylake.load_monster_form(
+            self.__check_res_path(query["monster_form_path"])
+        )
+        _, move = self.hoylake.load_move(self.__check_res_path(query["move_path"]))
+
+        return any(tag == "any" or tag in monster_form.move_tags for tag in move.tags)
+
+    def __check_res_path(self, path: Any) -> str:
+        """
+        Makes sure that the given res:// path can only refer to files within the roots, so that
+        queries cannot read other files on the machine (ex. "res://../../etc/passwd").
+        """
+        if not isinstance(path, str) or not path.startswith("res://"):
+            raise ValueError(f"Path must be a res:// path, got: {path}")
+
+        relative_path = pathlib.PurePosixPath(path[len("res://") :])
+        if (
+            relative_path.is_absolute()
+            or ".." in relative_path.parts
+            or "\\" in path
+            or "\x00" in path
+        ):
+            raise ValueError(f"Path must be within the roots: {path}")
+
+        # Also catch paths that leave a root through a symlink
+        for root in self.hoylake.get_roots().values():
+            resolved_root = root.resolve()
+            if (
+                not (resolved_root / relative_path)
+                .resolve()
+                .is_relative_to(resolved_root)
+            ):
+                raise ValueError(f"Path must be within the roots: {path}")
+
+        return path
+
+    def __get_resource_type(self, query: Dict[str, Any]) -> type:
+        if not isinstance(query["type"], str) or query["type"] not in (
+            self.__resource_types
+        ):
+            raise ValueError(
+                f'Unknown resource type: {query["type"]}. Supported types are: {", ".join(sorted(self.__resource_types))}'
+            )
+
+        return self.__resource_types[query["type"]]
+
+
+class _RequestHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    # Close keep-alive connections that have been idle for this many seconds, so that clients
+    # which have gone away do not hold on to a thread forever
+    timeout = 300.0
+
+    def do_POST(self) -> None:  # pylint: disable=invalid-name
+        """
+        Answers the query in the body of the request.
+        """
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            query = json.loads(self.rfile.read(length))
+
+            query_handler: QueryHandler = getattr(self.server, "query_handler")
+            response = {"result": query_handler.handle(query)}
+        # Any failure (ex. a file that could not be parsed) is sent back to the client, rather
+        # than dropping the connection
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            response = {"error": f"{type(e).__name__}: {e}"}
+
+        body = json.dumps(response).encode("utf-8")
+
+        self.send_response(200 if "result" in response else 400)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def address_string(self) -> str:
+        # Unix socket clients do not have an address
+        return str(self.client_address[0]) if self.client_address else "local"
+
+    # pylint: disable-next=redefined-builtin
+    def log_message(self, format: str, *args: Any) -> None:
+        if getattr(self.server, "verbose", False):
+            super().log_message(format, *args)
+
+
+class _TCPServer(http.server.ThreadingHTTPServer):
+    daemon_threads = True
+
+
+if _UNIX_SOCKETS_SUPPORTED:
+
+    class _UnixServer(socketserver.ThreadingUnixStreamServer):
+        daemon_threads = True
+
+        def server_close(self) -> None:
+            super().server_close()
+
+            try:
+                os.remove(str(self.server_address))
+            except OSError:
+                pass
+
+
+def create_server(
+    query_handler: QueryHandler, address: str, verbose: bool = False
+) -> socketserver.BaseServer:
+    """
+    Creates a server that answers queries with the given query handler at the given address.
+    Run its `serve_forever` method to start answering queries.
+
+    The address is either "unix:" followed by the filepath of a Unix domain socket to create, or
+    a "host:port" pair. Only serve on localhost, as anyone who can connect can read the game's
+    files through the server. If Unix domain sockets are not supported on this platform, then a
+    ValueError will be raised for "unix:" addresses.
+
+    The Hoylake of the query handler should have been created with `thread_safe=True`, as
+    queries are answered in separate threads.
+    """
+    server: socketserver.BaseServer
+    if address.startswith(_UNIX_PREFIX):
+        _check_unix_sockets_supported(address)
+
+        socket_filepath = address[len(_UNIX_PREFIX) :]
+        if os.path.exists(socket_filepath):
+            # Left behind by a server that did not shut down cleanly
+            os.remove(socket_filepath)
+
+        # Only defined when Unix domain sockets are supported, which was checked above
+        # pylint: disable-next=possibly-used-before-assignment
+        server = _UnixServer(socket_filepath, _RequestHandler)
+    else:
+        server = _TCPServer(_parse_host_and_port(address), _RequestHandler)
+
+    setattr(server, "query_handler", query_handler)
+    setattr(server, "verbose", verbose)
+
+    return server
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, socket_filepath: str, timeout: Optional[float]) -> None:
+        super().__init__("localhost", timeout=timeout)
+        self.socket_filepath = socket_filepath
+
+    def connect(self) -> None:
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.socket_filepath)
+
+
+class HoylakeClient:
+    """
+    A client for sending queries to a server made by `create_server` (ex. one started by
+    `cbpickaxe_serve`).
+
+    Resources are returned as JSON-style dicts rather than as cbpickaxe classes.
+
+    .. code-block:: python
+
+        client = cbp.HoylakeClient("unix:/tmp/cbpickaxe.sock")
+        names = client.translate_many(["KITTELLY_NAME", "PYROMEOW_NAME"])
+    """
+
+    def __init__(self, address: str, timeout: Optional[float] = 60.0) -> None:
+        """
+        Connects to the server at the given address. See `create_server` for the address format
+        and for when a ValueError will be raised.
+        """
+        self.address = address
+
+        self.__connection: http.client.HTTPConnection
+        if address.startswith(_UNIX_PREFIX):
+            _check_unix_sockets_supported(address)
+
+            self.__connection = _UnixHTTPConnection(
+                address[len(_UNIX_PREFIX) :], timeout
+            )
+        else:
+            host, port = _parse_host_and_port(address)
+            self.__connection = http.client.HTTPConnection(host, port, timeout=timeout)
+
+        self.__lock = threading.Lock()
+
+    @staticmethod
+    def from_env() -> Optional["HoylakeClient"]:
+        """
+        Returns a client for the server at the address in the CBPICKAXE_SERVER environment
+        variable, or None if it is not set.
+        """
+        address = os.environ.get(SERVER_ENV_VAR)
+        if address is None or address == "":
+            return None
+
+        return HoylakeClient(address)
+
+    def close(self) -> None:
+        """
+        Closes the connection to the server.
+        """
+        self.__connection.close()
+
+    def query(self, name: str, **arguments: Any) -> Any:
+        """
+        Sends the query with the given name and arguments to the server and returns its result.
+
+        If the server could not answer the query, then a ValueError will be raised.
+        """
+        body = json.dumps({"query": name, **arguments}).encode("utf-8")
+
+        with self.__lock:
+            response = self.__send(body)
+
+        if "error" in response:
+            raise ValueError(response["error"])
+
+        return response["result"]
+
+    def get_roots(self) -> Dict[str, str]:
+        """
+        Returns the names and directories of the roots loaded by the server.
+        """
+        roots: Dict[str, str] = self.query("roots")
+        return roots
+
+    def load(self, resource_type: str, path: str) -> Tuple[str, Dict[str, Any]]:
+        """
+        Returns the root name and data of the resource of the given type (ex. "monster_form") at
+        the given res:// filepath.
+        """
+        result = self.query("load", type=resource_type, path=path)
+        return result["root"], result["data"]
+
+    def load_all(
+        self, resource_type: str, path: str, fields: Optional[List[str]] = None
+    ) -> Dict[str, Tuple[str, Dict[str, Any]]]:
+        """
+        Returns the res:// paths, root names and data of all of the resources of the given type
+        (ex. "move") within the given res:// directory path.
+
+        If fields are given (ex. ["name", "tags"]), then the data only includes those fields.
+        """
+        return {
+            result["path"]: (result["root"], result["data"])
+            for result in self.query(
+                "load_all", type=resource_type, path=path, fields=fields
+            )
+        }
+
+    def preload(self, resource_type: str, path: str) -> int:
+        """
+        Has the server load in all of the resources of the given type within the given res://
+        directory path, without sending them back. Returns the number of resources loaded.
+
+        Useful for queries that only look at loaded resources (ex. `get_monster_forms_by_tags`).
+        """
+        count: int = self.query("preload", type=resource_type, path=path)
+        return count
+
+    def translate_many(
+        self, strings: List[str], locale: Optional[str] = None
+    ) -> List[str]:
+        """
+        Translates each of the given strings to the specified locale. See `Hoylake.translate`.
+        """
+        translated: List[str] = self.query("translate", strings=strings, locale=locale)
+        return translated
+
+    def get_monster_forms_by_tags(
+        self,
+        tags: List[str],
+        include_any: bool = True,
+        fields: Optional[List[str]] = None,
+    ) -> Dict[str, Tuple[str, Dict[str, Any]]]:
+        """
+        Returns all of the monster forms loaded by the server that have any of the given tags.
+        See `Hoylake.get_monster_forms_by_tags`.
+
+        If fields are given (ex. ["name", "bestiary_index"]), then the data only includes those
+        fields.
+        """
+        return {
+            result["path"]: (result["root"], result["data"])
+            for result in self.query(
+                "monster_forms_by_tags",
+                tags=tags,
+                include_any=include_any,
+                fields=fields,
+            )
+        }
+
+    def is_compatible(self, monster_form_path: str, move_path: str) -> bool:
+        """
+        Returns True if the monster form at the given res:// path can learn the move at the given
+        res:// path.
+        """
+        compatible: bool = self.query(
+            "compatible", monster_form_path=monster_form_path, move_path=move_path
+        )
+        return compatible
+
+    def __send(self, body: bytes) -> Dict[str, Any]:
+        reused = self.__connection.sock is not None
+        if reused and _is_closed_by_peer(self.__connection.sock):
+            # The server closed the idle connection (ex. because it was restarted)
+            self.__connection.close()
+            reused = False
+
+        try:
+            self.__request(body)
+        except (http.client.HTTPException, ConnectionError):
+            self.__connection.close()
+            if not reused:
+                raise
+
+            # The request was not sent over the stale connection, so it is safe to send it again
+            # without the server running the query twice
+            self.__request(body)
+
+        try:
+            response: Dict[str, Any] = json.loads(
+                self.__connection.getresponse().read()
+            )
+        except (http.client.HTTPException, ConnectionError):
+            # The request may already have been run, so do not retry it
+            self.__connection.close()
+            raise
+
+        return response
+
+    def __request(self, body: bytes) -> None:
+        self.__connection.request(
+            "POST",
+            "/",
+            body=body,
+            headers={"Content-Type": "application/json"},
+        )
+
+
+def _check_unix_sockets_supported(address: str) -> None:
+    if not _UNIX_SOCKETS_SUPPORTED:
+        raise ValueError(
+            f'Unix domain sockets are not supported on this platform, so cannot use address: {address}. Use a "host:port" address instead.'
+        )
+
+
+def _parse_host_and_port(address: str) -> Tuple[str, int]:
+    address = address.removeprefix("http://").rstrip("/")
+
+    # A bare number is a port on localhost
+    if address.isdigit():
+        return "127.0.0.1", int(address)
+
+    host, _, port = address.rpartition(":")
+    if host == "":
+        return address if address != "" else "127.0.0.1", DEFAULT_PORT
+
+    return host, int(port)
+
+
+def _is_closed_by_peer(sock: socket.socket) -> bool:
+    # An idle connection only becomes readable if the server closed it
+    readable, _, _ = select.select([sock], [], [], 0)
+    if len(readable) == 0:
+        return False
+
+    try:
+        return sock.recv(1, socket.MSG_PEEK) == b""
+    except OSError:
+        return True
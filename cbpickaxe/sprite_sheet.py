@@ -0,0 +1,175 @@
+"""
+Functions for working with sprite sheet images.
+"""
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+import numpy.typing as npt
+import PIL.Image
+
+from .misc_types import Color
+
+
+def recolor(
+    image: PIL.Image.Image, color_mapping: Mapping[Color, Color]
+) -> PIL.Image.Image:
+    """
+    Returns a copy of the given image where every pixel whose color is a key of the given mapping
+    has been replaced with the corresponding value. Other pixels are left as-is.
+
+    Colors are compared after converting them to 8-bit RGBA. The whole image is recolored at once,
+    so this can be used on entire sprite sheets.
+    """
+    pixels = np.array(image.convert("RGBA"), dtype=np.uint8)
+    packed = pixels.view(np.uint32)[..., 0]
+
+    recolored = _apply_mapping(packed, color_mapping)
+
+    return PIL.Image.fromarray(recolored.view(np.uint8).reshape(pixels.shape), "RGBA")
+
+
+def recolor_many(
+    image: PIL.Image.Image, color_mappings: Mapping[str, Mapping[Color, Color]]
+) -> Dict[str, PIL.Image.Image]:
+    """
+    Returns a recolored copy of the given image for each of the given color mappings, keyed by
+    the same keys as the given mappings. See :func:`recolor` for how each mapping is applied.
+
+    The image is only decoded and analyzed once, and each mapping is then applied to the distinct
+    colors of the image rather than to every pixel, which makes producing many variants of the
+    same sprite sheet (ex. bootlegs of every elemental type) much cheaper than calling
+    :func:`recolor` once per mapping.
+    """
+    pixels = np.array(image.convert("RGBA"), dtype=np.uint8)
+    packed = pixels.view(np.uint32)[..., 0]
+
+    unique_colors, inverse = np.unique(packed, return_inverse=True)
+    inverse = inverse.reshape(packed.shape)
+
+    images = {}
+    for name, color_mapping in color_mappings.items():
+        recolored = _apply_mapping(unique_colors, color_mapping)[inverse]
+
+        images[name] = PIL.Image.fromarray(
+            recolored.view(np.uint8).reshape(pixels.shape), "RGBA"
+        )
+
+    return images
+
+
+def to_rgba_array(image: PIL.Image.Image) -> npt.NDArray[np.uint8]:
+    """
+    Converts the given image into an array of RGBA pixels with the shape (height, width, 4).
+
+    Converting a sprite sheet once and then using :func:`extract_frames` on the array is much
+    faster than cropping each frame out of the image separately.
+    """
+    return np.asarray(image.convert("RGBA"), dtype=np.uint8)
+
+
+def extract_frames(
+    pixels: npt.NDArray[np.uint8], boxes: Sequence[int]
+) -> List[npt.NDArray[np.uint8]]:
+    """
+    Extracts the frames within the given boxes from the given array of RGBA pixels (see
+    :func:`to_rgba_array`).
+
+    The boxes are given as a flat sequence of ints with four entries (x, y, width, height) per
+    frame, as returned by `Animation.get_frame_boxes`.
+
+    Frames that lie within the sprite sheet are returned as views into the array, without copying
+    any pixels. Frames that extend past the edges of the sprite sheet are copied, with the parts
+    outside of it filled in with transparent pixels, like PIL's `Image.crop` does.
+    """
+    assert len(boxes) % 4 == 0, len(boxes)
+
+    sheet_height, sheet_width = pixels.shape[:2]
+
+    frames = []
+    for i in range(0, len(boxes), 4):
+        x, y, width, height = boxes[i : i + 4]
+
+        if (
+            x >= 0
+            and y >= 0
+            and x + width <= sheet_width
+            and y + height <= sheet_height
+        ):
+            frames.append(pixels[y : y + height, x : x + width])
+            continue
+
+        frame = np.zeros((height, width, pixels.shape[2]), dtype=pixels.dtype)
+
+        left, upper = max(x, 0), max(y, 0)
+        right, lower = min(x + width, sheet_width), min(y + height, sheet_height)
+        if left < right and upper < lower:
+            frame[upper - y : lower - y, left - x : right - x] = pixels[
+                upper:lower, left:right
+            ]
+
+        frames.append(frame)
+
+    return frames
+
+
+def get_union_alpha_bbox(
+    frames: Sequence[npt.NDArray[np.uint8]],
+) -> Optional[Tuple[int, int, int, int]]:
+    """
+    Returns the bounding box (left, upper, right, lower) of the pixels that are not fully
+    transparent in any of the given RGBA frames, or None if every pixel of every frame is fully
+    transparent.
+
+    Cropping all of the frames of an animation to this box removes the empty space around the
+    animation without cutting off any part of it. The box is relative to the first frame, and
+    parts of later frames that lie outside of the first frame's size are ignored.
+    """
+    if len(frames) == 0:
+        return None
+
+    height, width = frames[0].shape[:2]
+    opaque: npt.NDArray[np.bool_]
+    if all(frame.shape[:2] == (height, width) for frame in frames):
+        opaque = np.any(np.stack([frame[:, :, 3] for frame in frames]), axis=0)
+    else:
+        opaque = np.zeros((height, width), dtype=bool)
+        for frame in frames:
+            alpha = frame[:height, :width, 3]
+            opaque[: alpha.shape[0], : alpha.shape[1]] |= alpha != 0
+
+    rows = np.flatnonzero(opaque.any(axis=1))
+    if len(rows) == 0:
+        return None
+    columns = np.flatnonzero(opaque.any(axis=0))
+
+    return int(columns[0]), int(rows[0]), int(columns[-1]) + 1, int(rows[-1]) + 1
+
+
+def _apply_mapping(
+    packed: npt.NDArray[np.uint32], color_mapping: Mapping[Color, Color]
+) -> npt.NDArray[np.uint32]:
+    rgba_mapping = {
+        source.to_8bit_rgba(): target.to_8bit_rgba()
+        for source, target in color_mapping.items()
+    }
+
+    if len(rgba_mapping) == 0:
+        return packed
+
+    sources = _pack_rgba(list(rgba_mapping.keys()))
+    targets = _pack_rgba(list(rgba_mapping.values()))
+
+    order = np.argsort(sources)
+    sources = sources[order]
+    targets = targets[order]
+
+    indices = np.minimum(np.searchsorted(sources, packed), len(sources) - 1)
+    matches = sources[indices] == packed
+
+    return np.where(matches, targets[indices], packed)
+
+
+def _pack_rgba(colors: List[Tuple[int, int, int, int]]) -> npt.NDArray[np.uint32]:
+    # Pack using the same memory layout as an RGBA pixel array viewed as uint32, so that the result
+    # can be compared directly against the pixels regardless of the platform's byte order.
+    return np.array(colors, dtype=np.uint8).reshape(-1, 4).view(np.uint32)[:, 0]
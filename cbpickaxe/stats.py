@@ -0,0 +1,139 @@
+"""
+Classes for recording where time is spent when loading in data files.
+"""
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, Mapping
+
+import collections
+import contextlib
+import dataclasses
+import threading
+import time
+
+from .cache import CacheInfo
+
+
+@dataclass(frozen=True)
+class PhaseTiming:
+    """
+    How much time was spent in one phase of work (ex. parsing files).
+    """
+
+    calls: int  #: Number of times that the phase was entered.
+    seconds: float  #: Total wall-clock time spent in the phase, across all calls.
+
+
+class Stats:
+    """
+    Thread-safe counters and timers for the phases of some work.
+
+    Timings of phases that run at the same time in different threads are added together, so the
+    total time of a phase can be more than the wall-clock time of the work as a whole.
+    """
+
+    def __init__(self) -> None:
+        self.__lock = threading.Lock()
+        self.__counts: collections.Counter[str] = collections.Counter()
+        self.__timings: Dict[str, PhaseTiming] = {}
+
+    def count(self, name: str, amount: int = 1) -> None:
+        """
+        Adds the given amount to the counter with the given name.
+        """
+        with self.__lock:
+            self.__counts[name] += amount
+
+    @contextlib.contextmanager
+    def time(self, phase: str) -> Iterator[None]:
+        """
+        Adds the time spent within the with block to the given phase.
+        """
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(phase, time.perf_counter() - start_time)
+
+    def add_time(self, phase: str, seconds: float) -> None:
+        """
+        Adds one call that took the given number of seconds to the given phase.
+        """
+        with self.__lock:
+            timing = self.__timings.get(phase, PhaseTiming(0, 0.0))
+            self.__timings[phase] = PhaseTiming(
+                timing.calls + 1, timing.seconds + seconds
+            )
+
+    def add_timings(self, timings: Mapping[str, PhaseTiming]) -> None:
+        """
+        Adds the calls and time of each of the given phases (ex. the timings of a Stats in another
+        process) to the same phases of this Stats.
+        """
+        with self.__lock:
+            for phase, added in timings.items():
+                timing = self.__timings.get(phase, PhaseTiming(0, 0.0))
+                self.__timings[phase] = PhaseTiming(
+                    timing.calls + added.calls, timing.seconds + added.seconds
+                )
+
+    def get_counts(self) -> Dict[str, int]:
+        """
+        Returns the current value of each counter.
+        """
+        with self.__lock:
+            return dict(self.__counts)
+
+    def get_timings(self) -> Dict[str, PhaseTiming]:
+        """
+        Returns the timing of each phase so far.
+        """
+        with self.__lock:
+            return dict(self.__timings)
+
+    def reset(self) -> None:
+        """
+        Sets all of the counters and timings back to zero.
+        """
+        with self.__lock:
+            self.__counts.clear()
+            self.__timings.clear()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Returns the counters and timings as a JSON-serializable dictionary.
+        """
+        return {
+            "counts": self.get_counts(),
+            "timings": {
+                phase: dataclasses.asdict(timing)
+                for phase, timing in self.get_timings().items()
+            },
+        }
+
+
+@dataclass(frozen=True)
+class HoylakeStats:
+    """
+    A snapshot of how much work a Hoylake has done, and where it spent its time.
+
+    Timings are keyed by phase:
+
+    * find: Looking for files in the roots (ex. globbing resource directories).
+    * read: Reading the contents of data files.
+    * parse: Parsing data files into resources.
+    * import_paths: Reading `.import` files to find compiled files.
+    * translations: Reading and decoding translation files.
+    """
+
+    timings: Dict[str, PhaseTiming]  #: Time spent in each phase.
+    files_stated: int  #: Number of filesystem lookups made to check whether files exist.
+    files_parsed: Dict[str, int]  #: Number of files parsed, keyed by type name.
+    bytes_read: int  #: Number of bytes read from data, animation, and translation files.
+    translate_calls: int  #: Number of strings that were translated.
+    cache: Dict[str, CacheInfo]  #: Cache information, keyed by type name (ex. "Move").
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Returns the stats as a JSON-serializable dictionary.
+        """
+        return dataclasses.asdict(self)
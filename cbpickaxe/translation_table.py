@@ -2,7 +2,7 @@
 Classes related to translating in-game string ids to localized strings.
 """
 from dataclasses import dataclass
-from typing import cast, IO, List, Optional, Tuple
+from typing import cast, IO, List, Optional, Tuple, Union
 
 import smaz
 
@@ -67,11 +67,11 @@ class TranslationTable:
         self,
         hashes: List[int],
         buckets: List[int],
-        strings: List[bytes],
+        strings: Union[bytes, List[bytes]],
     ) -> None:
         self.__hashes = hashes
         self.__buckets = buckets
-        self.__strings = strings
+        self.__strings = strings if isinstance(strings, bytes) else b"".join(strings)
 
     @staticmethod
     def from_translation(input_stream: IO[bytes]) -> Tuple["TranslationTable", str]:
@@ -112,19 +112,18 @@ class TranslationTable:
             assert isinstance(locale, str)
             locale = locale.replace("\x00", "")
 
-            assert isinstance(strings, list)
-            assert isinstance(strings[0], bytes)
-            strings = cast(List[bytes], strings)
+            assert isinstance(strings, bytes)
 
+            # The tables are stored as signed ints, but hold unsigned hashes and offsets
             assert isinstance(hashes, list)
             for h in hashes:
                 assert isinstance(h, int)
-            hashes = cast(List[int], hashes)
+            hashes = [h & 0xFFFFFFFF for h in cast(List[int], hashes)]
 
             assert isinstance(buckets, list)
             for b in buckets:
                 assert isinstance(b, int)
-            buckets = cast(List[int], buckets)
+            buckets = [b & 0xFFFFFFFF for b in cast(List[int], buckets)]
 
             return TranslationTable(hashes, buckets, strings), locale
 
@@ -154,7 +153,7 @@ class TranslationTable:
     def __get(
         hashes: List[int],
         buckets: List[int],
-        strings: List[bytes],
+        strings: bytes,
         string: str,
     ) -> str:
         h = TranslationTable.__hash(0, string)
@@ -174,9 +173,7 @@ class TranslationTable:
 
         for e in bucket.elements:
             if e.key == h:
-                value_bytes = b"".join(
-                    strings[e.str_offset : e.str_offset + e.comp_size]
-                )
+                value_bytes = strings[e.str_offset : e.str_offset + e.comp_size]
 
                 if e.comp_size == e.uncomp_size:
                     value = value_bytes.decode("utf8")
@@ -0,0 +1,211 @@
+"""
+Classes for watching root directories for changed files.
+"""
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import os
+import pathlib
+import time
+
+from .hoylake import Hoylake, RootName
+
+FileState = Tuple[int, int]
+
+# Directories modified more recently than this are listed again even if their modification time
+# has not changed, since a file could have been added within the same tick of the filesystem's
+# clock right after they were last listed
+_RECENT_NS = 2_000_000_000
+
+
+@dataclass(frozen=True, slots=True)
+class _DirectoryListing:
+    mtime_ns: int
+    filenames: Tuple[str, ...]
+    subdirectories: Tuple[str, ...]
+
+
+# pylint: disable-next=too-few-public-methods
+class FileWatcher:
+    """
+    Watches directories for files being added, changed, or removed.
+
+    Changes are found by polling the modification times and sizes of the files, so no external
+    file notification service is needed. The listing of each directory is kept between polls,
+    and a directory is only listed again once its modification time changes (ex. when a file is
+    added to it or removed from it).
+    """
+
+    def __init__(
+        self,
+        directories: Iterable[str | os.PathLike],
+        ignored_directories: Iterable[str | os.PathLike] = (),
+        ignored_directory_names: Iterable[str] = (".git",),
+    ) -> None:
+        """
+        Watches the files in the given directories and their subdirectories, except for the given
+        ignored directories (ex. an output directory) and any directories with the given names.
+        """
+        self.directories = [pathlib.Path(directory) for directory in directories]
+        self.ignored_directories = {
+            pathlib.Path(directory).resolve() for directory in ignored_directories
+        }
+        self.ignored_directory_names = set(ignored_directory_names)
+
+        self.__listings: Dict[str, _DirectoryListing] = {}
+        self.__states = self.__scan()
+
+    def poll(self) -> List[pathlib.Path]:
+        """
+        Returns the paths of the files that have been added, changed, or removed since the
+        watcher was created or last polled.
+        """
+        states = self.__scan()
+
+        changed = [
+            filepath
+            for filepath, state in states.items()
+            if self.__states.get(filepath) != state
+        ]
+        removed = [filepath for filepath in self.__states if filepath not in states]
+
+        self.__states = states
+
+        return sorted(pathlib.Path(filepath) for filepath in changed + removed)
+
+    def __scan(self) -> Dict[str, FileState]:
+        states = {}
+        listings = {}
+
+        now_ns = time.time_ns()
+        directories = [str(directory) for directory in reversed(self.directories)]
+        while len(directories) > 0:
+            directory = directories.pop()
+            try:
+                mtime_ns = os.stat(directory).st_mtime_ns
+            except OSError:
+                # Removed while scanning
+                continue
+
+            listing = self.__listings.get(directory)
+            if (
+                listing is None
+                or listing.mtime_ns != mtime_ns
+                or now_ns - mtime_ns < _RECENT_NS
+            ):
+                listing = self.__list_directory(directory, mtime_ns)
+
+            listings[directory] = listing
+            directories.extend(reversed(listing.subdirectories))
+
+            # Files can be changed in place without changing the modification time of their
+            # directory, so each file still needs to be checked
+            for filename in listing.filenames:
+                filepath = os.path.join(directory, filename)
+                try:
+                    stat = os.stat(filepath)
+                except OSError:
+                    # Removed while scanning
+                    continue
+
+                states[filepath] = (stat.st_mtime_ns, stat.st_size)
+
+        self.__listings = listings
+
+        return states
+
+    def __list_directory(self, directory: str, mtime_ns: int) -> _DirectoryListing:
+        filenames = []
+        subdirectories = []
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir():
+                        # Symbolic links to directories are not followed, like os.walk
+                        if (
+                            not entry.is_symlink()
+                            and entry.name not in self.ignored_directory_names
+                            and not self.__is_ignored(pathlib.Path(entry.path))
+                        ):
+                            subdirectories.append(entry.path)
+                    else:
+                        filenames.append(entry.name)
+        except OSError:
+            # Removed while scanning
+            pass
+
+        return _DirectoryListing(
+            mtime_ns, tuple(sorted(filenames)), tuple(sorted(subdirectories))
+        )
+
+    def __is_ignored(self, directory: pathlib.Path) -> bool:
+        return (
+            len(self.ignored_directories) > 0
+            and directory.resolve() in self.ignored_directories
+        )
+
+
+class RootWatcher:
+    """
+    Watches the roots of a Hoylake for changed files, and has the Hoylake forget anything it
+    loaded from those files so that they get loaded in again when next requested.
+
+    .. code-block:: python
+
+        watcher = cbp.RootWatcher(hoylake, ["my_mod"])
+        for changed_paths in watcher.watch():
+            print("Changed:", changed_paths)
+    """
+
+    def __init__(
+        self,
+        hoylake: Hoylake,
+        root_names: Optional[Iterable[RootName]] = None,
+        ignored_directories: Iterable[str | os.PathLike] = (),
+    ) -> None:
+        """
+        Watches the roots with the given names, or all of the loaded roots if no names are given.
+        Only watching the roots that are being edited (ex. a mod) keeps each poll fast.
+
+        Changes within the given ignored directories (ex. an output directory inside of a root)
+        are not reported.
+        """
+        self.hoylake = hoylake
+
+        roots = hoylake.get_roots()
+        if root_names is not None:
+            roots = {name: roots[name] for name in root_names}
+
+        self.__roots = roots
+        self.__watchers = {
+            name: FileWatcher([directory], ignored_directories)
+            for name, directory in roots.items()
+        }
+
+    def poll(self) -> List[str]:
+        """
+        Returns the res:// paths of the files that have been added, changed, or removed since the
+        watcher was created or last polled, after having the Hoylake forget them.
+        """
+        changed_paths = set()
+        for name, watcher in self.__watchers.items():
+            for filepath in watcher.poll():
+                relative_path = filepath.relative_to(self.__roots[name])
+                path = f"res://{relative_path.as_posix()}"
+
+                self.hoylake.invalidate(path, name)
+                changed_paths.add(path)
+
+        return sorted(changed_paths)
+
+    def watch(self, interval: float = 0.25) -> Iterator[List[str]]:
+        """
+        Polls for changes forever, waiting the given number of seconds between polls. Yields the
+        res:// paths of the changed files each time there are changes.
+        """
+        while True:
+            changed_paths = self.poll()
+            if len(changed_paths) > 0:
+                yield changed_paths
+
+            time.sleep(interval)
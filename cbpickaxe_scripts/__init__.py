@@ -1,16 +1,57 @@
 """
 Scripts for data mining the game Cassette Beasts.
+
+Each script is only imported when its entry point is first used, so that running one script does
+not import the dependencies of all of the others (ex. Jinja2 for generate_docs).
 """
-from .extract_translation import main_without_args as extract_translation_main
-from .get_move_users import main_without_args as get_move_users_main
-from .generate_docs import main_without_args as generate_docs_main
-from .generate_monster_animations import (
-    main_without_args as generate_monster_animations_main,
-)
+from typing import Callable, Dict, List, TYPE_CHECKING
+
+import importlib
+
+if TYPE_CHECKING:
+    from .extract_translation import main_without_args as extract_translation_main
+    from .extract_animations import main_without_args as extract_animations_main
+    from .get_move_users import main_without_args as get_move_users_main
+    from .generate_docs import main_without_args as generate_docs_main
+    from .generate_monster_animations import (
+        main_without_args as generate_monster_animations_main,
+    )
+    from .generate_sprite_atlas import main_without_args as generate_sprite_atlas_main
+    from .serve import main_without_args as serve_main
 
 __all__ = [
+    "extract_animations_main",
     "extract_translation_main",
     "get_move_users_main",
     "generate_docs_main",
     "generate_monster_animations_main",
+    "generate_sprite_atlas_main",
+    "serve_main",
 ]
+
+# Maps each entry point to the script module that it runs
+_ENTRY_POINTS: Dict[str, str] = {
+    "extract_animations_main": "extract_animations",
+    "extract_translation_main": "extract_translation",
+    "get_move_users_main": "get_move_users",
+    "generate_docs_main": "generate_docs",
+    "generate_monster_animations_main": "generate_monster_animations",
+    "generate_sprite_atlas_main": "generate_sprite_atlas",
+    "serve_main": "serve",
+}
+
+
+def __getattr__(name: str) -> Callable[[], int]:
+    if name not in _ENTRY_POINTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    module = importlib.import_module(f".{_ENTRY_POINTS[name]}", __name__)
+    main_without_args: Callable[[], int] = getattr(module, "main_without_args")
+
+    globals()[name] = main_without_args
+
+    return main_without_args
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_ENTRY_POINTS))
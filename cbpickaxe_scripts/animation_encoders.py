@@ -0,0 +1,147 @@
+# pylint: disable=missing-module-docstring,missing-function-docstring,missing-class-docstring
+from dataclasses import dataclass
+from typing import Any, Dict, List, Type
+
+import abc
+import pathlib
+import time
+
+import PIL.Image
+
+PRESETS = ["fast", "balanced", "small"]
+
+# Duration of each frame of a monster animation, in milliseconds
+FRAME_DURATION = 100
+
+
+@dataclass(frozen=True)
+class EncodedAnimation:
+    """
+    An animation that was written to a file by an encoder.
+    """
+
+    format_name: str
+    filepath: pathlib.Path
+    num_bytes: int
+    encode_seconds: float
+
+
+class AnimationEncoder(abc.ABC):
+    """
+    Writes out frames as an animated image file of a specific format.
+
+    Each encoder supports the same presets, which trade encoding speed for file size:
+
+    * fast: Encodes as quickly as possible.
+    * balanced: Spends some extra time making the files smaller.
+    * small: Makes the files as small as the format allows, no matter how long it takes.
+
+    Presets only change how hard the encoder works, so the frames look the same with every preset.
+    """
+
+    format_name: str
+    extension: str
+
+    def __init__(self, preset: str) -> None:
+        if preset not in PRESETS:
+            raise ValueError(
+                f"Unknown preset: {preset}. Supported presets are: {', '.join(PRESETS)}"
+            )
+
+        self.preset = preset
+
+    def encode(
+        self, images: List[PIL.Image.Image], filepath: pathlib.Path
+    ) -> EncodedAnimation:
+        """
+        Writes out the given frames as an animation to the given filepath, with the encoder's
+        file extension added on.
+        """
+        assert len(images) > 0
+
+        filepath = filepath.with_name(filepath.name + self.extension)
+
+        start_time = time.perf_counter()
+        images[0].save(
+            filepath,
+            save_all=True,
+            append_images=images[1:],
+            duration=FRAME_DURATION,
+            loop=0,
+            **self.get_save_options(),
+        )
+        encode_seconds = time.perf_counter() - start_time
+
+        return EncodedAnimation(
+            format_name=self.format_name,
+            filepath=filepath,
+            num_bytes=filepath.stat().st_size,
+            encode_seconds=encode_seconds,
+        )
+
+    @abc.abstractmethod
+    def get_save_options(self) -> Dict[str, Any]:
+        """
+        Returns the format-specific options to pass to PIL's `Image.save` for the encoder's preset.
+        """
+
+
+class GifEncoder(AnimationEncoder):
+    format_name = "gif"
+    extension = ".gif"
+
+    def get_save_options(self) -> Dict[str, Any]:
+        return {
+            "optimize": self.preset != "fast",
+            "disposal": 2,  # Avoids issues with transparency leading to frame bleeding
+        }
+
+
+class ApngEncoder(AnimationEncoder):
+    format_name = "apng"
+    extension = ".png"
+
+    def get_save_options(self) -> Dict[str, Any]:
+        compress_level = {"fast": 1, "balanced": 6, "small": 9}[self.preset]
+
+        return {
+            "format": "PNG",
+            "compress_level": compress_level,
+            "optimize": self.preset == "small",
+            "disposal": 1,  # Clear each frame before drawing the next, to avoid frame bleeding
+            "blend": 0,
+        }
+
+
+class WebpEncoder(AnimationEncoder):
+    format_name = "webp"
+    extension = ".webp"
+
+    def get_save_options(self) -> Dict[str, Any]:
+        method = {"fast": 0, "balanced": 4, "small": 6}[self.preset]
+
+        return {
+            "lossless": True,
+            "quality": 100 if self.preset == "small" else 50,
+            "method": method,
+            "minimize_size": self.preset == "small",
+        }
+
+
+ENCODERS: Dict[str, Type[AnimationEncoder]] = {
+    GifEncoder.format_name: GifEncoder,
+    ApngEncoder.format_name: ApngEncoder,
+    WebpEncoder.format_name: WebpEncoder,
+}
+
+
+def create_encoder(format_name: str, preset: str) -> AnimationEncoder:
+    """
+    Creates the encoder for the given format (ex. "gif") using the given preset.
+    """
+    if format_name not in ENCODERS:
+        raise ValueError(
+            f"Unknown animation format: {format_name}. Supported formats are: {', '.join(ENCODERS)}"
+        )
+
+    return ENCODERS[format_name](preset)
@@ -0,0 +1,155 @@
+# pylint: disable=missing-module-docstring,missing-function-docstring,missing-class-docstring
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import argparse
+import concurrent.futures
+import pathlib
+import sys
+
+import cbpickaxe as cbp
+
+from . import profiling
+
+SUCCESS = 0
+FAILURE = 1
+
+
+@dataclass(frozen=True)
+class ExtractionTask:
+    path: str
+    compiled_filepath: pathlib.Path
+    output_filepath: pathlib.Path
+
+
+def main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser()
+
+    parser.add_argument("--roots", nargs="+", required=True)
+    parser.add_argument("--output_directory", required=True)
+    parser.add_argument("--jobs", type=int, default=1)
+    parser.add_argument("--force", default=False, action="store_true")
+    profiling.add_profile_argument(parser)
+
+    args = parser.parse_args(argv)
+
+    profile = profiling.start_profile(args.profile_out)
+
+    with profile.time("find_animations") as find_timer:
+        hoylake = cbp.Hoylake()
+        profile.track(hoylake)
+        for i, root in enumerate(args.roots):
+            hoylake.load_root(str(i), pathlib.Path(root))
+
+        cache = cbp.AnimationCache.load(args.output_directory)
+
+        tasks = []
+        entries: Dict[str, cbp.AnimationCacheEntry] = {}
+        failures: List[Tuple[str, str]] = []
+        num_fresh = 0
+        for path in find_compiled_animations(hoylake):
+            try:
+                compiled_path = hoylake.lookup_import_path(path)
+                compiled_filepath = hoylake.lookup_compiled_filepath(path)
+            except ValueError as e:
+                failures.append((path, str(e)))
+                continue
+
+            if not args.force and cache.is_fresh(
+                path, compiled_path, compiled_filepath
+            ):
+                num_fresh += 1
+                continue
+
+            # Record the state of the compiled file before parsing it, so that any change made to
+            # it while parsing will cause it to be extracted again next time
+            entries[path] = cbp.AnimationCacheEntry.from_source(
+                compiled_path, compiled_filepath
+            )
+            tasks.append(
+                ExtractionTask(
+                    path=path,
+                    compiled_filepath=compiled_filepath,
+                    output_filepath=cache.get_filepath(path),
+                )
+            )
+
+    with profile.time("extract_animations") as extract_timer:
+        for i, (path, error) in enumerate(run_tasks(tasks, args.jobs)):
+            if error is None:
+                cache.entries[path] = entries[path]
+                print(f"[{i + 1}/{len(tasks)}] Extracted animation: {path}")
+            else:
+                cache.entries.pop(path, None)
+                failures.append((path, error))
+
+        cache.save()
+
+    elapsed = find_timer.seconds + extract_timer.seconds
+    num_extracted = sum(1 for task in tasks if task.path in cache.entries)
+
+    for path, error in failures:
+        print(f"Failed to extract animation {path}: {error}")
+
+    print(
+        f"Extracted {num_extracted} animations ({num_fresh} already up to date, {len(failures)} failed) in {elapsed:.2f}s ({num_extracted / elapsed if elapsed > 0 else 0.0:.1f} files/s, {max(1, args.jobs)} job(s))"
+    )
+
+    return SUCCESS if len(failures) == 0 else FAILURE
+
+
+def find_compiled_animations(hoylake: cbp.Hoylake) -> List[str]:
+    """
+    Returns the res:// paths of all of the JSON animations that are only available in compiled
+    form.
+    """
+    paths = []
+    for path in sorted(hoylake.get_import_paths()):
+        if not path.endswith(".json"):
+            continue
+
+        # If the original JSON file is available, then there is nothing to extract
+        try:
+            hoylake.lookup_filepath(path)
+            continue
+        except ValueError:
+            pass
+
+        paths.append(path)
+
+    return paths
+
+
+def run_tasks(
+    tasks: List[ExtractionTask], jobs: int
+) -> Iterator[Tuple[str, Optional[str]]]:
+    """
+    Extracts the given animations, yielding the res:// path of each animation along with an error
+    message if it could not be extracted.
+    """
+    if jobs <= 1:
+        for task in tasks:
+            yield extract_animation(task)
+        return
+
+    chunksize = max(1, len(tasks) // (jobs * 4))
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=jobs) as executor:
+        yield from executor.map(extract_animation, tasks, chunksize=chunksize)
+
+
+def extract_animation(task: ExtractionTask) -> Tuple[str, Optional[str]]:
+    try:
+        with open(task.compiled_filepath, "rb") as input_stream:
+            animation = cbp.Animation.from_scn(input_stream)
+
+        cbp.write_animation_json(animation, task.output_filepath)
+    # pylint: disable-next=broad-exception-caught
+    except Exception as e:
+        return task.path, f"{type(e).__name__}: {e}"
+
+    return task.path, None
+
+
+def main_without_args() -> int:
+    return main(sys.argv[1:])
@@ -8,6 +8,8 @@ import sys
 
 import cbpickaxe as cbp
 
+from . import profiling
+
 SUCCESS = 0
 FAILURE = 1
 
@@ -18,24 +20,30 @@ def main(argv: List[str]) -> int:
     parser.add_argument("--translation_files", nargs="+", required=True)
     parser.add_argument("--strings_text_files", nargs="+", required=True)
     parser.add_argument("--output_file", required=True)
+    profiling.add_profile_argument(parser)
 
     args = parser.parse_args(argv)
 
+    profile = profiling.start_profile(args.profile_out)
+
     strings_to_translate = load_string_text_files(args.strings_text_files)
 
     tables: Dict[str, cbp.TranslationTable] = {}
-    for translation_filepath in args.translation_files:
-        with open(translation_filepath, "rb") as input_stream:
-            translation_table = cbp.TranslationTable.from_translation(input_stream)
+    with profile.time("load_translations"):
+        for translation_filepath in args.translation_files:
+            with open(translation_filepath, "rb") as input_stream:
+                translation_table = cbp.TranslationTable.from_translation(input_stream)
 
-        tables[translation_filepath], _ = translation_table
+            tables[translation_filepath], _ = translation_table
 
     locales = {
         translation_filepath: pathlib.Path(translation_filepath).name.split(".")[-2]
         for translation_filepath in args.translation_files
     }
 
-    with open(args.output_file, "w", encoding="utf-8") as ouput_stream:
+    with profile.time("write_output"), open(
+        args.output_file, "w", encoding="utf-8"
+    ) as ouput_stream:
         writer = csv.DictWriter(
             ouput_stream, fieldnames=["id", *sorted(set(locales.values()))]
         )
@@ -1,6 +1,6 @@
-# pylint: disable=missing-module-docstring,missing-function-docstring,missing-class-docstring
+# pylint: disable=missing-module-docstring,missing-function-docstring,missing-class-docstring,too-many-lines
 from dataclasses import dataclass
-from typing import Any, cast, Dict, IO, List, Optional, Tuple
+from typing import Any, cast, Dict, IO, List, Optional, Set, Tuple, TypeVar
 
 import argparse
 import logging
@@ -15,9 +15,13 @@ import PIL.Image
 
 import cbpickaxe as cbp
 
+from . import profiling
+
 SUCCESS = 0
 FAILURE = 1
 
+T = TypeVar("T")
+
 SOURCE_DIR = pathlib.Path(os.path.dirname(os.path.abspath(__file__)))
 TEMPLATES_DIR = SOURCE_DIR / "templates"
 MONSTER_FORM_TEMPLATE = TEMPLATES_DIR / "monster_form.html.template"
@@ -152,6 +156,42 @@ class Root:
     has_items: bool
 
 
+# pylint: disable-next=too-few-public-methods
+class TimedTemplate:
+    """
+    A Jinja template that adds the time spent rendering it to the "render_templates" phase of a
+    profile.
+    """
+
+    def __init__(self, template: j2.Template, profile: profiling.Profile) -> None:
+        self.__template = template
+        self.__profile = profile
+
+    def render(self, *args: Any, **kwargs: Any) -> str:
+        with self.__profile.time("render_templates"):
+            return self.__template.render(*args, **kwargs)
+
+
+@dataclass
+class Templates:
+    monster_form: TimedTemplate
+    move: TimedTemplate
+    item: TimedTemplate
+    index: TimedTemplate
+
+
+@dataclass
+class Site:
+    config: Config
+    hoylake: cbp.Hoylake
+    templates: Templates
+    monster_forms: Dict[str, Tuple[str, cbp.MonsterForm]]
+    moves: Dict[str, Tuple[str, cbp.Move]]
+    items: Dict[str, Tuple[str, cbp.Item]]
+    roots: List[Root]
+    profile: profiling.Profile
+
+
 def main(argv: List[str]) -> int:
     logging.basicConfig(level=logging.WARN, format="%(levelname)s> %(message)s")
 
@@ -164,6 +204,26 @@ def main(argv: List[str]) -> int:
     )
     build_parser.add_argument("--config", default="docs.toml")
     build_parser.add_argument("--locale", default="en")
+    build_parser.add_argument(
+        "--animation_cache",
+        default=None,
+        help="Directory of an animation cache written by cbpickaxe_extract_animations, to load compiled animations from",
+    )
+    profiling.add_profile_argument(build_parser)
+
+    watch_parser = subparsers.add_parser(
+        "watch",
+        description="Build the documentation for the mod, and then rebuild the affected pages whenever the mod's files change.",
+    )
+    watch_parser.add_argument("--config", default="docs.toml")
+    watch_parser.add_argument("--locale", default="en")
+    watch_parser.add_argument("--interval", type=float, default=0.25)
+    watch_parser.add_argument(
+        "--animation_cache",
+        default=None,
+        help="Directory of an animation cache written by cbpickaxe_extract_animations, to load compiled animations from",
+    )
+    profiling.add_profile_argument(watch_parser)
 
     _ = subparsers.add_parser(
         "new", description="Create a configuration file for the mod's documentation."
@@ -174,13 +234,77 @@ def main(argv: List[str]) -> int:
     if args.command == "new":
         return create_new_config(pathlib.Path("docs.toml"))
     elif args.command == "build":
-        return build_documentation(pathlib.Path(args.config), args.locale)
+        return build_documentation(
+            pathlib.Path(args.config),
+            args.locale,
+            args.animation_cache,
+            profiling.start_profile(args.profile_out),
+        )
+    elif args.command == "watch":
+        return watch_documentation(
+            pathlib.Path(args.config),
+            args.locale,
+            args.interval,
+            args.animation_cache,
+            profiling.start_profile(args.profile_out),
+        )
     else:
         logging.error(f"Unrecognized command: {args.command}")
         return FAILURE
 
 
-def build_documentation(config_filepath: pathlib.Path, locale: str) -> int:
+def build_documentation(
+    config_filepath: pathlib.Path,
+    locale: str,
+    animation_cache: Optional[str],
+    profile: profiling.Profile,
+) -> int:
+    config = load_config(config_filepath)
+    if config is None:
+        return FAILURE
+
+    build_site(config, locale, animation_cache, profile)
+
+    return SUCCESS
+
+
+def watch_documentation(
+    config_filepath: pathlib.Path,
+    locale: str,
+    interval: float,
+    animation_cache: Optional[str],
+    profile: profiling.Profile,
+) -> int:
+    config = load_config(config_filepath)
+    if config is None:
+        return FAILURE
+
+    site = build_site(config, locale, animation_cache, profile)
+    print(f"Built documentation in: {config.output_directory}")
+
+    # The official files are not expected to change, so only the mod's files are watched
+    watcher = cbp.RootWatcher(
+        site.hoylake,
+        [name for name in config.roots if name != OFFICIAL_ROOT_NAME],
+        ignored_directories=[config.output_directory],
+    )
+
+    print("Watching for changes. Press Ctrl+C to stop.")
+    try:
+        for changed_paths in watcher.watch(interval):
+            with profile.time("rebuild_affected_pages") as timer:
+                num_pages = rebuild_affected_pages(site, changed_paths)
+
+            print(
+                f"Rebuilt {num_pages} page(s) in {timer.seconds * 1000:.0f}ms after changes to: {', '.join(changed_paths)}"
+            )
+    except KeyboardInterrupt:
+        pass
+
+    return SUCCESS
+
+
+def load_config(config_filepath: pathlib.Path) -> Optional[Config]:
     if not pathlib.Path(config_filepath).exists():
         logging.error(
             f"Could not find documentation configuration file: {config_filepath}"
@@ -188,49 +312,253 @@ def build_documentation(config_filepath: pathlib.Path, locale: str) -> int:
         logging.error(
             "If you do not already have one, you should run `cbpickaxe_generate_docs new` to create one."
         )
-        return FAILURE
+        return None
 
     with open(config_filepath, "rb") as input_stream:
         toml_data = tomllib.load(input_stream)
         try:
-            config = Config.from_dict(toml_data)
+            return Config.from_dict(toml_data)
         except ValueError:
             logging.error("Failed to load configration file. See error(s) above.")
-            return FAILURE
+            return None
 
-    env = j2.Environment(
-        loader=j2.PackageLoader("cbpickaxe_scripts"),
-        autoescape=j2.select_autoescape(),
+
+def build_site(
+    config: Config,
+    locale: str,
+    animation_cache: Optional[str],
+    profile: profiling.Profile,
+) -> Site:
+    with profile.time("load_templates"):
+        env = j2.Environment(
+            loader=j2.PackageLoader("cbpickaxe_scripts"),
+            autoescape=j2.select_autoescape(),
+        )
+        templates = Templates(
+            monster_form=TimedTemplate(env.get_template("monster_form.html"), profile),
+            move=TimedTemplate(env.get_template("move.html"), profile),
+            item=TimedTemplate(env.get_template("item.html"), profile),
+            index=TimedTemplate(env.get_template("index.html"), profile),
+        )
+
+    hoylake = cbp.Hoylake(default_locale=locale)
+    profile.track(hoylake)
+    with profile.time("load_roots"):
+        for name, root in config.roots.items():
+            hoylake.load_root(name, pathlib.Path(root))
+
+        if animation_cache is not None:
+            hoylake.load_animation_cache(animation_cache)
+
+    site = Site(
+        config=config,
+        hoylake=hoylake,
+        templates=templates,
+        monster_forms={},
+        moves={},
+        items={},
+        roots=[],
+        profile=profile,
     )
-    monster_form_template = env.get_template("monster_form.html")
-    move_template = env.get_template("move.html")
-    item_template = env.get_template("item.html")
-    index_template = env.get_template("index.html")
+    build_all_pages(site)
+
+    return site
+
+
+def build_all_pages(site: Site) -> int:
+    config = site.config
+    hoylake = site.hoylake
+    profile = site.profile
 
     if config.output_directory.exists():
         shutil.rmtree(config.output_directory)
     config.output_directory.mkdir()
 
-    hoylake = cbp.Hoylake(default_locale=locale)
-    for name, root in config.roots.items():
-        hoylake.load_root(name, pathlib.Path(root))
+    with profile.time("load_entities"):
+        site.monster_forms = load_monster_forms(config, hoylake)
+        site.moves = load_moves(config, hoylake)
+        site.items = load_items(config, hoylake)
+
+    with profile.time("copy_item_images"):
+        copy_item_images(config, hoylake, site.items)
+
+    # Includes loading in the animations and sprites that the pages show, as well as rendering the
+    # templates
+    with profile.time("generate_index_page"):
+        site.roots = generate_index_page(
+            config,
+            hoylake,
+            site.templates.index,
+            site.monster_forms,
+            site.moves,
+            site.items,
+        )
+    with profile.time("generate_monster_form_pages"):
+        generate_monster_form_pages(
+            config,
+            hoylake,
+            site.templates.monster_form,
+            site.monster_forms,
+            site.roots,
+        )
+    with profile.time("generate_move_pages"):
+        generate_move_pages(
+            config, hoylake, site.templates.move, site.moves, site.roots
+        )
+    with profile.time("generate_item_pages"):
+        generate_item_pages(
+            config, hoylake, site.templates.item, site.items, site.roots
+        )
+
+    return 1 + len(site.monster_forms) + len(site.moves) + len(site.items)
+
+
+def rebuild_affected_pages(site: Site, changed_paths: List[str]) -> int:
+    """
+    Re-renders only the pages affected by changes to the given files, which the Hoylake of the
+    site has already been told to forget. Returns the number of pages that were rendered.
+    """
+    config = site.config
+    hoylake = site.hoylake
+
+    # Any page can show translated text, so all of them need to be rebuilt
+    if any(path.endswith(".translation") for path in changed_paths):
+        return build_all_pages(site)
+
+    old_monster_forms, old_moves, old_items = (
+        site.monster_forms,
+        site.moves,
+        site.items,
+    )
+
+    # Unchanged files are still loaded in, so only the changed files get parsed again
+    site.monster_forms = load_monster_forms(config, hoylake)
+    site.moves = load_moves(config, hoylake)
+    site.items = load_items(config, hoylake)
+
+    changed_monster_forms = find_changed(old_monster_forms, site.monster_forms)
+    changed_moves = find_changed(old_moves, site.moves)
+    changed_items = find_changed(old_items, site.items)
+
+    monster_form_paths = set(changed_monster_forms)
+    move_paths = set(changed_moves)
+    item_paths = set(changed_items)
+
+    # Monster and move pages list each other, so they need to be rebuilt if a monster gained or
+    # lost a move or the other way around
+    for move_versions in changed_moves.values():
+        for _, move in move_versions:
+            monster_form_paths.update(
+                path
+                for path, (_, monster_form) in site.monster_forms.items()
+                if is_compatible(monster_form, move)
+            )
+    for monster_form_versions in changed_monster_forms.values():
+        for _, monster_form in monster_form_versions:
+            move_paths.update(
+                path
+                for path, (_, move) in site.moves.items()
+                if is_compatible(monster_form, move)
+            )
+
+    # Sprites and icons are not loaded into the site, so rebuild the pages that use them
+    for changed_path in changed_paths:
+        changed_dir = changed_path.rsplit("/", 1)[0]
+        monster_form_paths.update(
+            path
+            for path, (_, monster_form) in site.monster_forms.items()
+            if monster_form.battle_sprite_path.rsplit("/", 1)[0] == changed_dir
+        )
+        item_paths.update(
+            path for path, (_, item) in site.items.items() if item.icon == changed_path
+        )
+
+    # Remove the pages of entities that were removed or renamed
+    pages: List[
+        Tuple[Dict[str, Tuple[str, Any]], Dict[str, Tuple[str, Any]], pathlib.Path]
+    ] = [
+        (old_monster_forms, site.monster_forms, config.monster_forms_dir),
+        (old_moves, site.moves, config.moves_dir),
+        (old_items, site.items, config.items_dir),
+    ]
+    for old_entities, new_entities, pages_dir in pages:
+        for path, (_, old_entity) in old_entities.items():
+            old_name = hoylake.translate(old_entity.name)
+            if (
+                path in new_entities
+                and hoylake.translate(new_entities[path][1].name) == old_name
+            ):
+                continue
 
-    monster_forms = load_monster_forms(config, hoylake)
-    moves = load_moves(config, hoylake)
-    items = load_items(config, hoylake)
+            (pages_dir / (old_name + ".html")).unlink(missing_ok=True)
 
-    copy_item_images(config, hoylake, items)
+    if len(item_paths) > 0:
+        copy_item_images(config, hoylake, site.items)
 
-    roots = generate_index_page(
-        config, hoylake, index_template, monster_forms, moves, items
+    site.roots = generate_index_page(
+        config,
+        hoylake,
+        site.templates.index,
+        site.monster_forms,
+        site.moves,
+        site.items,
     )
     generate_monster_form_pages(
-        config, hoylake, monster_form_template, monster_forms, roots
+        config,
+        hoylake,
+        site.templates.monster_form,
+        select(site.monster_forms, monster_form_paths),
+        site.roots,
+    )
+    generate_move_pages(
+        config,
+        hoylake,
+        site.templates.move,
+        select(site.moves, move_paths),
+        site.roots,
+    )
+    generate_item_pages(
+        config,
+        hoylake,
+        site.templates.item,
+        select(site.items, item_paths),
+        site.roots,
     )
-    generate_move_pages(config, hoylake, move_template, moves, roots)
-    generate_item_pages(config, hoylake, item_template, items, roots)
 
-    return SUCCESS
+    return (
+        1
+        + len(select(site.monster_forms, monster_form_paths))
+        + len(select(site.moves, move_paths))
+        + len(select(site.items, item_paths))
+    )
+
+
+def find_changed(
+    old: Dict[str, Tuple[str, T]], new: Dict[str, Tuple[str, T]]
+) -> Dict[str, List[Tuple[str, T]]]:
+    """
+    Returns the entities that were added, removed, or reloaded, along with their old and/or new
+    versions.
+    """
+    changed: Dict[str, List[Tuple[str, T]]] = {}
+    for path in set(old) | set(new):
+        old_entry = old.get(path)
+        new_entry = new.get(path)
+        if old_entry is not None and new_entry is not None:
+            if old_entry[1] is new_entry[1]:
+                continue
+
+        changed[path] = [entry for entry in [old_entry, new_entry] if entry is not None]
+
+    return changed
+
+
+def is_compatible(monster_form: cbp.MonsterForm, move: cbp.Move) -> bool:
+    return any(tag == "any" or tag in monster_form.move_tags for tag in move.tags)
+
+
+def select(entities: Dict[str, T], paths: Set[str]) -> Dict[str, T]:
+    return {path: entity for path, entity in entities.items() if path in paths}
 
 
 def create_new_config(config_filepath: pathlib.Path) -> int:
@@ -357,7 +685,7 @@ def load_items(config: Config, hoylake: cbp.Hoylake) -> Dict[str, Tuple[str, cbp
 def generate_index_page(
     config: Config,
     hoylake: cbp.Hoylake,
-    template: j2.Template,
+    template: TimedTemplate,
     monster_forms: Dict[str, Tuple[str, cbp.MonsterForm]],
     moves: Dict[str, Tuple[str, cbp.Move]],
     items: Dict[str, Tuple[str, cbp.Item]],
@@ -372,7 +700,7 @@ def generate_index_page(
 def generate_monster_form_pages(
     config: Config,
     hoylake: cbp.Hoylake,
-    monster_form_template: j2.Template,
+    monster_form_template: TimedTemplate,
     monster_forms: Dict[str, Tuple[str, cbp.MonsterForm]],
     roots: List[Root],
 ) -> None:
@@ -409,7 +737,7 @@ def generate_monster_form_pages(
 def generate_move_pages(
     config: Config,
     hoylake: cbp.Hoylake,
-    move_template: j2.Template,
+    move_template: TimedTemplate,
     moves: Dict[str, Tuple[str, cbp.Move]],
     roots: List[Root],
 ) -> None:
@@ -436,7 +764,7 @@ def generate_move_pages(
 def generate_item_pages(
     config: Config,
     hoylake: cbp.Hoylake,
-    item_template: j2.Template,
+    item_template: TimedTemplate,
     items: Dict[str, Tuple[str, cbp.Item]],
     roots: List[Root],
 ) -> None:
@@ -516,7 +844,7 @@ def create_monster_form_page(
     monster_root: str,
     monster_form: cbp.MonsterForm,
     hoylake: cbp.Hoylake,
-    template: j2.Template,
+    template: TimedTemplate,
     dest_dir: pathlib.Path,
     images_dir: pathlib.Path,
     roots: List[Root],
@@ -625,7 +953,7 @@ def create_move_page(
     move_root: str,
     move: cbp.Move,
     hoylake: cbp.Hoylake,
-    template: j2.Template,
+    template: TimedTemplate,
     roots: List[Root],
     output_stream: IO[str],
 ) -> None:
@@ -709,7 +1037,7 @@ def create_item_page(
     item_root: str,
     item: cbp.Item,
     hoylake: cbp.Hoylake,
-    template: j2.Template,
+    template: TimedTemplate,
     roots: List[Root],
     output_stream: IO[str],
 ) -> None:
@@ -764,7 +1092,7 @@ def create_item_page(
 def create_index_page(
     config: Config,
     hoylake: cbp.Hoylake,
-    template: j2.Template,
+    template: TimedTemplate,
     monster_forms: Dict[str, Tuple[str, cbp.MonsterForm]],
     moves: Dict[str, Tuple[str, cbp.Move]],
     items: Dict[str, Tuple[str, cbp.Item]],
@@ -1,15 +1,22 @@
 # pylint: disable=missing-module-docstring,missing-function-docstring,missing-class-docstring
-from typing import DefaultDict, List
+from dataclasses import dataclass
+from typing import DefaultDict, Dict, Iterator, List, Tuple
 
 import argparse
 import collections
+import concurrent.futures
+import functools
 import pathlib
 import sys
 
+import numpy as np
+import numpy.typing as npt
 import PIL.Image
 
 import cbpickaxe as cbp
 
+from . import animation_encoders, profiling
+
 SUCCESS = 0
 FAILURE = 1
 
@@ -28,161 +35,296 @@ def main(argv: List[str]) -> int:
         ],
     )
     parser.add_argument("--output_directory", required=True)
+    parser.add_argument(
+        "--animation_cache",
+        default=None,
+        help="Directory of an animation cache written by cbpickaxe_extract_animations, to load compiled animations from",
+    )
     parser.add_argument("--crop", default=False, action="store_true")
-    # parser.add_argument("--bootleg_type", default=None)
+    parser.add_argument("--jobs", type=int, default=1)
+    parser.add_argument(
+        "--formats",
+        nargs="+",
+        choices=list(animation_encoders.ENCODERS),
+        default=["gif"],
+    )
+    parser.add_argument("--preset", choices=animation_encoders.PRESETS, default="fast")
+    bootleg_group = parser.add_mutually_exclusive_group()
+    bootleg_group.add_argument("--bootleg_type", default=None)
+    bootleg_group.add_argument(
+        "--all_bootleg_types", default=False, action="store_true"
+    )
+    parser.add_argument("--elemental_types_path", default="res://data/elemental_types/")
+    profiling.add_profile_argument(parser)
 
     args = parser.parse_args(argv)
 
-    # Note: Disabled temporarily until the implementation is properly working
-    args.bootleg_type = None
-
-    hoylake = cbp.Hoylake()
-    for i, root in enumerate(args.roots):
-        hoylake.load_root(str(i), pathlib.Path(root))
-
-    bootleg_type = None
-    if args.bootleg_type is not None:
-        _, bootleg_type = hoylake.load_elemental_type(args.bootleg_type)
-
-    monsters = {}
-    for monsters_path in args.monster_form_paths:
-        if monsters_path.endswith(".tres"):
-            monsters[monsters_path] = hoylake.load_monster_form(monsters_path)
-        else:
-            monsters.update(hoylake.load_monster_forms(monsters_path))
-
-    output_directory = pathlib.Path(args.output_directory)
-    output_directory.mkdir(exist_ok=True)
-
-    seen_monster_names: DefaultDict[str, int] = collections.defaultdict(lambda: 0)
-    for _, (_, monster_form) in sorted(monsters.items()):
-        try:
-            animation = hoylake.load_animation(monster_form.battle_sprite_path)
-        except ValueError:
-            print(
-                f"Could not find animation JSON file at path: {monster_form.battle_sprite_path}"
-            )
-            return FAILURE
-
-        image_filepath_relative = (
-            "/".join(monster_form.battle_sprite_path.split("/")[:-1])
-            + "/"
-            + animation.image
-        )
-
-        image_filepath = hoylake.lookup_filepath(image_filepath_relative)
-        source_image = PIL.Image.open(image_filepath)
-        if bootleg_type is not None:
-            source_image = recolor_to_bootleg(source_image, monster_form, bootleg_type)
+    profile = profiling.start_profile(args.profile_out)
+
+    with profile.time("plan_tasks"):
+        hoylake = cbp.Hoylake()
+        profile.track(hoylake)
+        for i, root in enumerate(args.roots):
+            hoylake.load_root(str(i), pathlib.Path(root))
+
+        if args.animation_cache is not None:
+            hoylake.load_animation_cache(args.animation_cache)
+
+        bootleg_types: Dict[str, cbp.ElementalType] = {}
+        if args.bootleg_type is not None:
+            _, bootleg_type = hoylake.load_elemental_type(args.bootleg_type)
+            bootleg_types[get_type_name(args.bootleg_type)] = bootleg_type
+        elif args.all_bootleg_types:
+            bootleg_types = {
+                get_type_name(type_path): elemental_type
+                for type_path, (_, elemental_type) in hoylake.load_elemental_types(
+                    args.elemental_types_path
+                ).items()
+            }
+
+            if len(bootleg_types) == 0:
+                print(
+                    f"Could not find any elemental types in: {args.elemental_types_path}"
+                )
+                return FAILURE
+
+        monsters = {}
+        for monsters_path in args.monster_form_paths:
+            if monsters_path.endswith(".tres"):
+                monsters[monsters_path] = hoylake.load_monster_form(monsters_path)
+            else:
+                monsters.update(hoylake.load_monster_forms(monsters_path))
+
+        output_directory = pathlib.Path(args.output_directory)
+        output_directory.mkdir(exist_ok=True)
+
+        tasks = []
+        seen_monster_names: DefaultDict[str, int] = collections.defaultdict(lambda: 0)
+        for _, (_, monster_form) in sorted(monsters.items()):
+            try:
+                animation = hoylake.load_animation(monster_form.battle_sprite_path)
+            except ValueError:
+                print(
+                    f"Could not find animation JSON file at path: {monster_form.battle_sprite_path}"
+                )
+                return FAILURE
 
-        monster_name = hoylake.translate(monster_form.name)
-        seen_monster_names[monster_name] += 1
+            image_filepath_relative = (
+                "/".join(monster_form.battle_sprite_path.split("/")[:-1])
+                + "/"
+                + animation.image
+            )
 
-        for animation_name in animation:
-            _, frames = animation[animation_name]
+            image_filepath = hoylake.lookup_filepath(image_filepath_relative)
 
-            assert len(frames) > 0
+            monster_name = hoylake.translate(monster_form.name)
+            seen_monster_names[monster_name] += 1
 
-            images = []
-            cropped_images = []
-            combined_image = None
-            for frame in frames:
-                box = (
-                    frame.box.x,
-                    frame.box.y,
-                    frame.box.x + frame.box.width,
-                    frame.box.y + frame.box.height,
+            if len(bootleg_types) > 0:
+                color_mappings = tuple(
+                    (f"_{type_name}", tuple(color_mapping.items()))
+                    for type_name, color_mapping in cbp.get_bootleg_color_mappings(
+                        monster_form, bootleg_types
+                    ).items()
+                    # Types that do not recolor the monster (ex. since it has no swap colors) would
+                    # only write out copies of the original animations
+                    if len(color_mapping) > 0 or not args.all_bootleg_types
                 )
-                cropped_image = source_image.crop(box)
-                cropped_images.append(cropped_image)
+            else:
+                color_mappings = ()
+
+            if len(color_mappings) == 0:
+                color_mappings = (("", ()),)
+
+            for variant, _ in color_mappings:
+                for animation_name in animation:
+                    boxes = tuple(animation.get_frame_boxes(animation_name))
+
+                    assert len(boxes) > 0
+
+                    tasks.append(
+                        AnimationTask(
+                            image_filepath=image_filepath,
+                            color_mappings=color_mappings,
+                            variant=variant,
+                            boxes=boxes,
+                            crop=args.crop,
+                            formats=tuple(args.formats),
+                            preset=args.preset,
+                            output_filepath=output_directory
+                            / f"{monster_name}_{seen_monster_names[monster_name] - 1}{variant}_{animation_name}",
+                        )
+                    )
+
+    total_bytes = 0
+    format_bytes: DefaultDict[str, int] = collections.defaultdict(lambda: 0)
+    format_seconds: DefaultDict[str, float] = collections.defaultdict(lambda: 0.0)
+    with profile.time("run_tasks") as timer:
+        for i, encoded_animations in enumerate(
+            run_tasks(tasks, args.jobs, profile.stats)
+        ):
+            for encoded in encoded_animations:
+                total_bytes += encoded.num_bytes
+                format_bytes[encoded.format_name] += encoded.num_bytes
+                format_seconds[encoded.format_name] += encoded.encode_seconds
+
+                print(f"[{i + 1}/{len(tasks)}] Wrote animation to: {encoded.filepath}")
+    elapsed = timer.seconds
+
+    print(
+        f"Wrote {len(tasks)} animations ({total_bytes / 1024 / 1024:.2f} MiB) in {elapsed:.2f}s "
+        f"({len(tasks) / max(elapsed, 1e-9):.1f} animations/s, {args.jobs} job(s))"
+    )
 
-                if combined_image is None:
-                    combined_image = cropped_image.copy()
-                else:
-                    combined_image.paste(cropped_image, (0, 0), mask=cropped_image)
+    # Encode times are summed across all jobs
+    for format_name in args.formats:
+        print(
+            f"  {format_name} ({args.preset}): {format_bytes[format_name] / 1024 / 1024:.2f} MiB, "
+            f"{format_bytes[format_name] / max(1, len(tasks)) / 1024:.1f} KiB/animation, "
+            f"{format_seconds[format_name]:.2f}s encoding"
+        )
 
-            assert combined_image is not None
+    return SUCCESS
 
-            for image in cropped_images:
-                cropped_image = (
-                    image.crop(combined_image.getbbox()) if args.crop else image
-                )
-                images.append(cropped_image)
 
-            animation_filepath = (
-                output_directory
-                / f"{monster_name}_{seen_monster_names[monster_name] - 1}_{animation_name}.gif"
-            )
-            images[0].save(
-                animation_filepath,
-                save_all=True,
-                append_images=images[1:],
-                optimize=False,
-                duration=100,
-                loop=0,
-                disposal=2,  # Avoids issues with transparency leading to frame bleeding
-            )
-            print(f"Wrote animation to: {animation_filepath}")
+ColorMappings = Tuple[Tuple[str, Tuple[Tuple[cbp.Color, cbp.Color], ...]], ...]
+
+
+@dataclass(frozen=True)
+class AnimationTask:
+    """
+    A single (monster, animation) pair to be encoded into an animated image file.
+    """
+
+    image_filepath: pathlib.Path
+    color_mappings: ColorMappings  #: All of the color variants to produce from the sprite sheet.
+    variant: str  #: Which of the color variants this task encodes.
+    boxes: Tuple[int, ...]  #: x, y, width and height of each frame.
+    crop: bool
+    formats: Tuple[str, ...]  #: Formats to encode the animation in (ex. "gif").
+    preset: str  #: Encoder preset to use (ex. "fast").
+    output_filepath: pathlib.Path  #: Filepath to write to, without a file extension.
+
+
+def run_tasks(
+    tasks: List[AnimationTask], jobs: int, stats: cbp.Stats
+) -> Iterator[List[animation_encoders.EncodedAnimation]]:
+    """
+    Encodes the given animations, yielding the files written for each task as they are written.
+    The time spent loading sprite sheets, extracting frames and encoding each format is added to
+    the given stats, including the time spent in worker processes.
+
+    When more than one job is requested, the tasks are grouped by sprite sheet and each group is
+    handed to a pool of worker processes as a single unit of work, so that each sprite sheet is
+    only loaded and recolored by one worker. The largest groups are handed out first, so that the
+    workers finish at around the same time. Results are yielded one group at a time, in the order
+    that each group's sprite sheet first appears in the tasks.
+    """
+    if jobs <= 1:
+        for task in tasks:
+            yield encode_animation(task, stats)
+        return
+
+    groups = group_by_sprite_sheet(tasks)
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures: Dict[int, "concurrent.futures.Future[EncodedGroup]"] = {}
+        for i in sorted(range(0, len(groups)), key=lambda i: -len(groups[i])):
+            futures[i] = executor.submit(encode_animations, groups[i])
+
+        for i in range(0, len(groups)):
+            encoded_animations, timings = futures[i].result()
+            stats.add_timings(timings)
+
+            yield from encoded_animations
+
+
+def group_by_sprite_sheet(tasks: List[AnimationTask]) -> List[List[AnimationTask]]:
+    """
+    Groups the given tasks by the sprite sheet that they use, keeping the tasks of each group in
+    their original order.
+    """
+    groups: Dict[pathlib.Path, List[AnimationTask]] = {}
+    for task in tasks:
+        groups.setdefault(task.image_filepath, []).append(task)
+
+    return list(groups.values())
+
+
+EncodedGroup = Tuple[
+    List[List[animation_encoders.EncodedAnimation]], Dict[str, cbp.PhaseTiming]
+]
+
+
+def encode_animations(tasks: List[AnimationTask]) -> EncodedGroup:
+    # Run in worker processes, which send their timings back to be added to the profile
+    stats = cbp.Stats()
+    encoded_animations = [encode_animation(task, stats) for task in tasks]
+
+    return encoded_animations, stats.get_timings()
+
+
+@functools.lru_cache(maxsize=4)
+def load_sprite_sheets(
+    image_filepath: pathlib.Path, color_mappings: ColorMappings
+) -> Dict[str, npt.NDArray[np.uint8]]:
+    """
+    Loads the sprite sheet at the given filepath and produces each of the given color variants of
+    it in a single pass, as arrays of RGBA pixels. Cached per process, so that each worker only
+    decodes and recolors a given sprite sheet once.
+    """
+    with PIL.Image.open(image_filepath) as image:
+        image.load()
+
+        if all(len(color_mapping) == 0 for _, color_mapping in color_mappings):
+            pixels = cbp.to_rgba_array(image)
+            return {variant: pixels for variant, _ in color_mappings}
+
+        return {
+            variant: cbp.to_rgba_array(recolored)
+            for variant, recolored in cbp.recolor_many(
+                image,
+                {
+                    variant: dict(color_mapping)
+                    for variant, color_mapping in color_mappings
+                },
+            ).items()
+        }
+
+
+def encode_animation(
+    task: AnimationTask, stats: cbp.Stats
+) -> List[animation_encoders.EncodedAnimation]:
+    with stats.time("load_sprite_sheets"):
+        pixels = load_sprite_sheets(task.image_filepath, task.color_mappings)[
+            task.variant
+        ]
+
+    with stats.time("extract_frames"):
+        frames = cbp.extract_frames(pixels, task.boxes)
+
+        if task.crop:
+            bbox = cbp.get_union_alpha_bbox(frames)
+            if bbox is not None:
+                left, upper, right, lower = bbox
+                frames = [frame[upper:lower, left:right] for frame in frames]
+
+        images = [PIL.Image.fromarray(frame, "RGBA") for frame in frames]
+
+    encoded_animations = []
+    for format_name in task.formats:
+        encoded = animation_encoders.create_encoder(format_name, task.preset).encode(
+            images, task.output_filepath
+        )
+        stats.add_time(f"encode:{encoded.format_name}", encoded.encode_seconds)
 
-    return SUCCESS
+        encoded_animations.append(encoded)
+
+    return encoded_animations
 
 
-def recolor_to_bootleg(
-    image: PIL.Image.Image,
-    monster_form: cbp.MonsterForm,
-    elemental_type: cbp.ElementalType,
-) -> PIL.Image.Image:
-    # TODO: test more. Glitter Jellyton is not working. Maybe RGB rounding?
-
-    if len(monster_form.swap_colors) == 0:
-        return image
-
-    if len(elemental_type.palette) == 0:
-        return image
-
-    # TODO: handle default palette of monster form if it exists
-    source_colors = list(monster_form.swap_colors)
-    output_colors = list(monster_form.swap_colors)
-
-    # Replicating the game's approach. This loop's condition is weird. I don't know what the
-    # intent with it is.
-    i = 0
-    while i < len(output_colors) and output_colors[i] == elemental_type.palette[0]:
-        i += len(elemental_type.palette)
-
-    if i >= len(output_colors):
-        # This branch appears to never trigger. I'm not sure what the intent was in the game's code.
-        for j, type_color in enumerate(elemental_type.palette):
-            output_colors[j] = type_color
-    else:
-        # "Swap" the existing colors. If the bootleg does not have swapped colors, then the next
-        # loop will overwrite this.
-        for j in range(0, len(elemental_type.palette)):
-            output_colors[j] = output_colors[i + j]
-
-        # Apply the palette of the elemental type
-        for j, type_color in enumerate(elemental_type.palette):
-            output_colors[i + j] = type_color
-
-    assert len(source_colors) == len(output_colors)
-    color_mapping = {
-        source_colors[i].to_8bit_rgba(): output_colors[i].to_8bit_rgba()
-        for i in range(0, len(source_colors))
-    }
-
-    # This appears to be the correct way to do it in Pillow. The point method appears not to
-    # support non-greyscale images.
-    new_image = image.copy()
-    pixels = new_image.load()
-    colors = set()
-    for i in range(new_image.size[0]):
-        for j in range(new_image.size[1]):
-            new_color = color_mapping.get(pixels[i, j], None)
-            colors.add(pixels[i, j])
-            if new_color is not None:
-                pixels[i, j] = new_color
-
-    return new_image
+def get_type_name(path: str) -> str:
+    return path.split("/")[-1].split(".tres")[0]
 
 
 def main_without_args() -> int:
@@ -0,0 +1,260 @@
+# pylint: disable=missing-module-docstring,missing-function-docstring,missing-class-docstring
+from dataclasses import dataclass
+from typing import DefaultDict, Dict, List, Set, Tuple
+
+import argparse
+import collections
+import hashlib
+import json
+import pathlib
+import re
+import sys
+import unicodedata
+
+import PIL.Image
+
+import cbpickaxe as cbp
+
+from . import profiling
+
+SUCCESS = 0
+FAILURE = 1
+
+
+@dataclass(frozen=True)
+class Sprite:
+    name: str
+    image_filepath: pathlib.Path
+    box: cbp.Box
+
+
+def main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser()
+
+    parser.add_argument("--roots", nargs="+", required=True)
+    parser.add_argument(
+        "--monster_form_paths",
+        nargs="+",
+        default=[
+            "res://data/monster_forms/",
+            "res://data/monster_forms_secret/",
+        ],
+    )
+    parser.add_argument("--output_directory", required=True)
+    parser.add_argument(
+        "--animation_cache",
+        default=None,
+        help="Directory of an animation cache written by cbpickaxe_extract_animations, to load compiled animations from",
+    )
+    parser.add_argument("--animation", default="idle")
+    parser.add_argument("--frame", type=int, default=0)
+    parser.add_argument("--page_size", type=int, default=2048)
+    parser.add_argument("--padding", type=int, default=1)
+    parser.add_argument("--name", default="monsters")
+    profiling.add_profile_argument(parser)
+
+    args = parser.parse_args(argv)
+
+    profile = profiling.start_profile(args.profile_out)
+
+    hoylake = cbp.Hoylake()
+    profile.track(hoylake)
+    for i, root in enumerate(args.roots):
+        hoylake.load_root(str(i), pathlib.Path(root))
+
+    if args.animation_cache is not None:
+        hoylake.load_animation_cache(args.animation_cache)
+
+    with profile.time("find_sprites"):
+        monsters = {}
+        for monsters_path in args.monster_form_paths:
+            if monsters_path.endswith(".tres"):
+                monsters[monsters_path] = hoylake.load_monster_form(monsters_path)
+            else:
+                monsters.update(hoylake.load_monster_forms(monsters_path))
+
+        sprites = find_sprites(hoylake, monsters, args.animation, args.frame)
+    if len(sprites) == 0:
+        print("Could not find any sprites to pack.")
+        return FAILURE
+
+    try:
+        with profile.time("pack_sprites"):
+            pages, entries = cbp.pack_sprites(
+                {
+                    sprite.name: (sprite.box.width, sprite.box.height)
+                    for sprite in sprites
+                },
+                page_width=args.page_size,
+                page_height=args.page_size,
+                padding=args.padding,
+            )
+    except ValueError as e:
+        print(e)
+        return FAILURE
+
+    output_directory = pathlib.Path(args.output_directory)
+    output_directory.mkdir(exist_ok=True)
+
+    page_filenames = [f"{args.name}_{i}.png" for i in range(0, len(pages))]
+
+    # Draw one page at a time, loading each sprite sheet only while its sprites are being copied,
+    # so that at most one page and one sprite sheet are in memory at once.
+    with profile.time("draw_pages"):
+        for page_index, page in enumerate(pages):
+            page_image = PIL.Image.new("RGBA", (page.width, page.height))
+
+            page_sprites = [
+                sprite for sprite in sprites if entries[sprite.name].page == page_index
+            ]
+            for image_filepath, sheet_sprites in group_by_image(page_sprites).items():
+                with PIL.Image.open(image_filepath) as source_image:
+                    for sprite in sheet_sprites:
+                        page_image.paste(
+                            source_image.crop(
+                                (
+                                    sprite.box.x,
+                                    sprite.box.y,
+                                    sprite.box.x + sprite.box.width,
+                                    sprite.box.y + sprite.box.height,
+                                )
+                            ),
+                            (entries[sprite.name].box.x, entries[sprite.name].box.y),
+                        )
+
+            page_filepath = output_directory / page_filenames[page_index]
+            page_image.save(page_filepath)
+            page_image.close()
+
+            print(f"Wrote atlas page to: {page_filepath}")
+
+    class_names = css_class_names(list(entries))
+
+    json_filepath = output_directory / f"{args.name}.json"
+    with open(json_filepath, "w", encoding="utf-8") as output_stream:
+        json.dump(
+            {
+                "pages": [
+                    {"image": filename, "width": page.width, "height": page.height}
+                    for filename, page in zip(page_filenames, pages)
+                ],
+                "sprites": {
+                    name: {
+                        "page": entry.page,
+                        "x": entry.box.x,
+                        "y": entry.box.y,
+                        "w": entry.box.width,
+                        "h": entry.box.height,
+                        "css_class": f"{args.name}-{class_names[name]}",
+                    }
+                    for name, entry in entries.items()
+                },
+            },
+            output_stream,
+            indent=2,
+            ensure_ascii=False,
+        )
+    print(f"Wrote atlas coordinates to: {json_filepath}")
+
+    css_filepath = output_directory / f"{args.name}.css"
+    with open(css_filepath, "w", encoding="utf-8") as output_stream:
+        for name, entry in entries.items():
+            output_stream.write(
+                f".{args.name}-{class_names[name]} {{ "
+                f"background: url('{page_filenames[entry.page]}') -{entry.box.x}px -{entry.box.y}px; "
+                f"width: {entry.box.width}px; height: {entry.box.height}px; }}\n"
+            )
+    print(f"Wrote atlas stylesheet to: {css_filepath}")
+
+    print(f"Packed {len(sprites)} sprites into {len(pages)} atlas page(s).")
+
+    return SUCCESS
+
+
+def find_sprites(
+    hoylake: cbp.Hoylake,
+    monsters: Dict[str, Tuple[str, cbp.MonsterForm]],
+    animation_name: str,
+    frame_offset: int,
+) -> List[Sprite]:
+    sprites = []
+    seen_monster_names: DefaultDict[str, int] = collections.defaultdict(lambda: 0)
+    for _, (_, monster_form) in sorted(monsters.items()):
+        try:
+            animation = hoylake.load_animation(monster_form.battle_sprite_path)
+            frame_box = animation.get_frame(animation_name, frame_offset).box
+        except (KeyError, IndexError, ValueError):
+            print(
+                f"Could not find frame {frame_offset} of animation {animation_name} for: {monster_form.battle_sprite_path}"
+            )
+            continue
+
+        image_filepath_relative = (
+            "/".join(monster_form.battle_sprite_path.split("/")[:-1])
+            + "/"
+            + animation.image
+        )
+
+        monster_name = hoylake.translate(monster_form.name)
+        seen_monster_names[monster_name] += 1
+        if seen_monster_names[monster_name] > 1:
+            monster_name = f"{monster_name}_{seen_monster_names[monster_name] - 1}"
+
+        sprites.append(
+            Sprite(
+                name=monster_name,
+                image_filepath=hoylake.lookup_filepath(image_filepath_relative),
+                box=frame_box,
+            )
+        )
+
+    return sprites
+
+
+def group_by_image(sprites: List[Sprite]) -> Dict[pathlib.Path, List[Sprite]]:
+    groups: Dict[pathlib.Path, List[Sprite]] = collections.defaultdict(list)
+    for sprite in sprites:
+        groups[sprite.image_filepath].append(sprite)
+
+    return groups
+
+
+def css_class_names(names: List[str]) -> Dict[str, str]:
+    """
+    Returns a distinct CSS class name for each of the given sprite names.
+    """
+    class_names: Dict[str, str] = {}
+    used: Set[str] = set()
+    for name in names:
+        class_name = css_class_name(name)
+
+        # Names that only differ in punctuation or case (ex. "Ni-Ni" and "nini") would otherwise
+        # share a class
+        suffix = 1
+        unique_class_name = class_name
+        while unique_class_name in used:
+            suffix += 1
+            unique_class_name = f"{class_name}-{suffix}"
+
+        used.add(unique_class_name)
+        class_names[name] = unique_class_name
+
+    return class_names
+
+
+def css_class_name(name: str) -> str:
+    # Strip accents (ex. "é" to "e") rather than replacing the letters
+    ascii_name = (
+        unicodedata.normalize("NFKD", name).encode("ascii", "ignore").decode("ascii")
+    )
+
+    class_name = re.sub(r"[^a-z0-9_-]+", "-", ascii_name.lower()).strip("-")
+    if class_name == "":
+        # Ex. names written entirely in Japanese, or only made of punctuation
+        class_name = "sprite-" + hashlib.sha1(name.encode("utf-8")).hexdigest()[:8]
+
+    return class_name
+
+
+def main_without_args() -> int:
+    return main(sys.argv[1:])
@@ -1,13 +1,16 @@
 # pylint: disable=missing-module-docstring,missing-function-docstring,missing-class-docstring
-from typing import List
+from typing import Any, Dict, List
 
 import argparse
 import csv
+import os
 import pathlib
 import sys
 
 import cbpickaxe as cbp
 
+from . import profiling
+
 SUCCESS = 0
 FAILURE = 1
 
@@ -15,31 +18,62 @@ FAILURE = 1
 def main(argv: List[str]) -> int:
     parser = argparse.ArgumentParser()
 
-    parser.add_argument("--roots", nargs="+", required=True)
+    parser.add_argument("--roots", nargs="+")
     parser.add_argument("--move_paths", nargs="+", required=True)
     parser.add_argument(
         "--monster_form_paths",
         nargs="+",
         default=["res://data/monster_forms/", "res://data/monster_forms_secret/"],
     )
+    parser.add_argument(
+        "--server",
+        default=os.environ.get(cbp.SERVER_ENV_VAR),
+        help=f"Address of a running cbpickaxe_serve server to query instead of loading in the roots. Defaults to the {cbp.SERVER_ENV_VAR} environment variable.",
+    )
+
+    profiling.add_profile_argument(parser)
 
     args = parser.parse_args(argv)
 
+    profile = profiling.start_profile(args.profile_out)
+
+    writer = csv.DictWriter(sys.stdout, fieldnames=["move", "users"])
+    writer.writeheader()
+
+    if args.server:
+        client = cbp.HoylakeClient(args.server)
+        try:
+            with profile.time("query_server"):
+                write_move_users_from_server(
+                    client, args.move_paths, args.monster_form_paths, writer
+                )
+        except (ValueError, OSError) as e:
+            print(f"Failed to query server at {args.server}: {e}", file=sys.stderr)
+            return FAILURE
+        finally:
+            client.close()
+
+        return SUCCESS
+
+    if args.roots is None:
+        parser.error("--roots is required when no server is given")
+
     hoylake = cbp.Hoylake()
+    profile.track(hoylake)
     for i, root in enumerate(args.roots):
         hoylake.load_root(str(i), pathlib.Path(root))
 
-    for monsters_path in args.monster_form_paths:
-        _ = hoylake.load_monster_forms(monsters_path)
+    with profile.time("load_monster_forms"):
+        for monsters_path in args.monster_form_paths:
+            _ = hoylake.load_monster_forms(monsters_path)
 
-    writer = csv.DictWriter(sys.stdout, fieldnames=["move", "users"])
-    writer.writeheader()
     for moves_path in args.move_paths:
-        for _, move in hoylake.load_moves(moves_path).items():
+        # Write out each move as soon as it is loaded, without keeping the moves around
+        for _, _, move in hoylake.iter_moves(moves_path, cache=False):
             users = [
                 hoylake.translate(monster_form.name)
                 for _, (_, monster_form) in sorted(
-                    hoylake.get_monster_forms_by_tags(move[1].tags).items(),
+                    hoylake.get_monster_forms_by_tags(move.tags).items(),
                     key=lambda d: (
                         d[1][1].bestiary_index,
                         hoylake.translate(d[1][1].name),
@@ -48,7 +82,7 @@ def main(argv: List[str]) -> int:
             ]
             writer.writerow(
                 {
-                    "move": hoylake.translate(move[1].name),
+                    "move": hoylake.translate(move.name),
                     "users": ", ".join(users),
                 }
             )
@@ -56,5 +90,48 @@ def main(argv: List[str]) -> int:
     return SUCCESS
 
 
+def write_move_users_from_server(
+    client: cbp.HoylakeClient,
+    move_paths: List[str],
+    monster_form_paths: List[str],
+    writer: "csv.DictWriter[str]",
+) -> None:
+    # Make sure that the server has loaded in the monster forms, without sending them back
+    for monsters_path in monster_form_paths:
+        _ = client.preload("monster_form", monsters_path)
+
+    # Only ask for the fields that are used, to keep the responses small
+    for moves_path in move_paths:
+        for _, (_, move) in sorted(
+            client.load_all("move", moves_path, fields=["name", "tags"]).items()
+        ):
+            monster_forms: List[Dict[str, Any]] = [
+                monster_form
+                for _, (_, monster_form) in client.get_monster_forms_by_tags(
+                    move["tags"], fields=["name", "bestiary_index"]
+                ).items()
+            ]
+
+            # Translate all of the names in one query
+            move_name, *names = client.translate_many(
+                [move["name"]]
+                + [monster_form["name"] for monster_form in monster_forms]
+            )
+
+            users = [
+                name
+                for _, name in sorted(
+                    zip(
+                        [
+                            monster_form["bestiary_index"]
+                            for monster_form in monster_forms
+                        ],
+                        names,
+                    )
+                )
+            ]
+            writer.writerow({"move": move_name, "users": ", ".join(users)})
+
+
 def main_without_args() -> int:
     return main(sys.argv[1:])
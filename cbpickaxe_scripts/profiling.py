@@ -0,0 +1,91 @@
+# pylint: disable=missing-module-docstring,missing-function-docstring,missing-class-docstring
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, Optional
+
+import argparse
+import atexit
+import contextlib
+import json
+import pathlib
+import sys
+import time
+
+import cbpickaxe as cbp
+
+
+def add_profile_argument(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--profile_out",
+        "--profile-out",
+        default=None,
+        help="Write out the timings and counts of the work that the script did to the given JSON file when it exits",
+    )
+
+
+@dataclass(slots=True)
+class Timer:
+    seconds: float = 0.0  #: Time spent within the with block, once it has finished.
+
+
+class Profile:
+    """
+    Records how long a script spends in each of its phases, along with the stats of the Hoylakes
+    that it uses.
+    """
+
+    def __init__(self) -> None:
+        self.stats = cbp.Stats()
+        self.__hoylakes: Dict[str, cbp.Hoylake] = {}
+        self.__start_time = time.perf_counter()
+
+    # Quoted so that scripts which do not use a Hoylake do not need to import it
+    def track(self, hoylake: "cbp.Hoylake", name: str = "hoylake") -> None:
+        """
+        Includes the stats of the given Hoylake in the profile.
+        """
+        self.__hoylakes[name] = hoylake
+
+    @contextlib.contextmanager
+    def time(self, phase: str) -> Iterator[Timer]:
+        """
+        Adds the time spent within the with block to the given phase of the script. The time is
+        also available from the returned Timer once the with block has finished (ex. for
+        printing it out).
+        """
+        timer = Timer()
+        start_time = time.perf_counter()
+        try:
+            yield timer
+        finally:
+            timer.seconds = time.perf_counter() - start_time
+            self.stats.add_time(phase, timer.seconds)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "argv": sys.argv,
+            "total_seconds": time.perf_counter() - self.__start_time,
+            "script": self.stats.to_dict(),
+            "hoylakes": {
+                name: hoylake.get_stats().to_dict()
+                for name, hoylake in self.__hoylakes.items()
+            },
+        }
+
+    def write(self, filepath: pathlib.Path) -> None:
+        try:
+            with open(filepath, "w", encoding="utf-8") as output_stream:
+                json.dump(self.to_dict(), output_stream, indent=2)
+        except OSError as e:
+            print(f"Failed to write profile to {filepath}: {e}", file=sys.stderr)
+
+
+def start_profile(profile_out: Optional[str]) -> Profile:
+    """
+    Starts recording a profile of the script, which is written out to the given filepath when
+    the process exits (if a filepath is given).
+    """
+    profile = Profile()
+    if profile_out is not None:
+        atexit.register(profile.write, pathlib.Path(profile_out))
+
+    return profile
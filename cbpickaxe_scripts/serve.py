@@ -0,0 +1,76 @@
+# pylint: disable=missing-module-docstring,missing-function-docstring,missing-class-docstring
+from typing import List
+
+import argparse
+import pathlib
+import signal
+import sys
+
+import cbpickaxe as cbp
+
+from . import profiling
+
+SUCCESS = 0
+FAILURE = 1
+
+
+def main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser()
+
+    parser.add_argument("--roots", nargs="+", required=True)
+    parser.add_argument(
+        "--address",
+        default=f"127.0.0.1:{cbp.server.DEFAULT_PORT}",
+        help='"host:port" to serve on, or "unix:" followed by the filepath of a Unix domain socket to create',
+    )
+    parser.add_argument(
+        "--monster_form_paths",
+        nargs="+",
+        default=["res://data/monster_forms/", "res://data/monster_forms_secret/"],
+    )
+    parser.add_argument("--default_locale", default=None)
+    parser.add_argument("--verbose", default=False, action="store_true")
+    profiling.add_profile_argument(parser)
+
+    args = parser.parse_args(argv)
+
+    profile = profiling.start_profile(args.profile_out)
+
+    with profile.time("load") as load_timer:
+        hoylake = cbp.Hoylake(default_locale=args.default_locale, thread_safe=True)
+        profile.track(hoylake)
+        for i, root in enumerate(args.roots):
+            hoylake.load_root(str(i), pathlib.Path(root))
+
+        # Load in the monster forms up front, so that tag queries can find them
+        for monsters_path in args.monster_form_paths:
+            _ = hoylake.load_monster_forms(monsters_path)
+
+        try:
+            server = cbp.create_server(
+                cbp.QueryHandler(hoylake), args.address, verbose=args.verbose
+            )
+        except OSError as e:
+            print(f"Failed to serve on {args.address}: {e}", file=sys.stderr)
+            return FAILURE
+
+    print(
+        f"Serving on {args.address} (loaded in {load_timer.seconds:.2f}s). Set {cbp.SERVER_ENV_VAR}={args.address} to have scripts use this server.",
+        file=sys.stderr,
+    )
+
+    # Shut down cleanly when killed, so that the Unix domain socket file is removed
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(SUCCESS))
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+    return SUCCESS
+
+
+def main_without_args() -> int:
+    return main(sys.argv[1:])
@@ -0,0 +1,201 @@
+import array
+import copy
+import dataclasses
+import pickle
+import unittest
+
+import cbpickaxe as cbp
+
+FRAMES = [cbp.Frame(cbp.Box(i * 16, 0, 16, 16 + i)) for i in range(0, 5)]
+
+
+def create_animation() -> cbp.Animation:
+    return cbp.Animation(
+        cbp.FrameArray.from_frames(FRAMES),
+        [cbp.FrameTag("idle", 0, 2), cbp.FrameTag("attack", 2, 5)],
+        "monster.png",
+    )
+
+
+class TestFrameArray(unittest.TestCase):
+    def test_equality(self) -> None:
+        frames = cbp.FrameArray.from_frames(FRAMES)
+
+        self.assertEqual(frames, cbp.FrameArray.from_frames(FRAMES))
+        self.assertEqual(frames, FRAMES)
+        self.assertEqual(FRAMES, list(frames))
+        self.assertEqual(frames, tuple(FRAMES))
+
+        self.assertNotEqual(frames, FRAMES[:-1])
+        self.assertNotEqual(frames, cbp.FrameArray.from_frames(FRAMES[1:]))
+        self.assertNotEqual(frames, "not frames")
+
+    def test_indexing(self) -> None:
+        frames = cbp.FrameArray.from_frames(FRAMES)
+
+        self.assertEqual(len(FRAMES), len(frames))
+        for i in range(-len(FRAMES), len(FRAMES)):
+            self.assertEqual(FRAMES[i], frames[i])
+
+        with self.assertRaises(IndexError):
+            frames[len(FRAMES)]  # pylint: disable=pointless-statement
+        with self.assertRaises(IndexError):
+            frames[-len(FRAMES) - 1]  # pylint: disable=pointless-statement
+
+    def test_slicing(self) -> None:
+        frames = cbp.FrameArray.from_frames(FRAMES)
+
+        for index in [
+            slice(None),
+            slice(1, 3),
+            slice(-2, None),
+            slice(None, -1),
+            slice(3, 1),
+            slice(2, 100),
+            slice(None, None, 2),
+            slice(None, None, -1),
+            slice(4, 0, -2),
+        ]:
+            with self.subTest(index=index):
+                sliced = frames[index]
+
+                self.assertIsInstance(sliced, cbp.FrameArray)
+                self.assertEqual(FRAMES[index], list(sliced))
+
+    def test_get_boxes(self) -> None:
+        frames = cbp.FrameArray.from_frames(FRAMES)
+
+        self.assertEqual(
+            array.array("i", [16, 0, 16, 17, 32, 0, 16, 18]), frames.get_boxes(1, 3)
+        )
+
+    def test_pickle(self) -> None:
+        frames = cbp.FrameArray.from_frames(FRAMES)
+
+        for protocol in range(0, pickle.HIGHEST_PROTOCOL + 1):
+            with self.subTest(protocol=protocol):
+                unpickled = pickle.loads(pickle.dumps(frames, protocol=protocol))
+
+                self.assertIsInstance(unpickled, cbp.FrameArray)
+                self.assertEqual(frames, unpickled)
+
+        self.assertEqual(frames, copy.deepcopy(frames))
+
+
+class TestAnimation(unittest.TestCase):
+    def test_getitem(self) -> None:
+        animation = create_animation()
+
+        frame_tag, frames = animation["attack"]
+        self.assertEqual(cbp.FrameTag("attack", 2, 5), frame_tag)
+        self.assertEqual(FRAMES[2:5], list(frames))
+        self.assertEqual(["idle", "attack"], list(animation))
+
+        with self.assertRaises(KeyError):
+            animation["missing"]  # pylint: disable=pointless-statement
+
+    def test_frame_tag_index_after_appending(self) -> None:
+        animation = create_animation()
+        animation.get_frame_tag("idle")
+
+        animation.frame_tags.append(cbp.FrameTag("hurt", 4, 5))
+
+        self.assertEqual(cbp.FrameTag("hurt", 4, 5), animation.get_frame_tag("hurt"))
+
+    def test_frame_tag_index_after_removing(self) -> None:
+        animation = create_animation()
+        animation.get_frame_tag("attack")
+
+        del animation.frame_tags[0]
+
+        self.assertEqual("attack", animation.get_frame_tag("attack").name)
+        with self.assertRaises(KeyError):
+            animation.get_frame_tag("idle")
+
+    def test_frame_tag_index_after_reordering_and_renaming(self) -> None:
+        animation = create_animation()
+        animation.get_frame_tag("idle")
+        animation.get_frame_tag("attack")
+
+        animation.frame_tags.reverse()
+        self.assertEqual(0, animation.get_frame_tag("idle").start_frame)
+        self.assertEqual(2, animation.get_frame_tag("attack").start_frame)
+
+        animation.frame_tags[0].name = "special"
+        self.assertEqual(2, animation.get_frame_tag("special").start_frame)
+        with self.assertRaises(KeyError):
+            animation.get_frame_tag("attack")
+
+    def test_frame_tag_index_after_replacing(self) -> None:
+        animation = create_animation()
+        animation.get_frame_tag("idle")
+
+        animation.frame_tags = [cbp.FrameTag("walk", 1, 3)]
+
+        self.assertEqual(FRAMES[1:3], list(animation["walk"][1]))
+        with self.assertRaises(KeyError):
+            animation.get_frame_tag("idle")
+
+    def test_duplicate_frame_tag_names(self) -> None:
+        animation = create_animation()
+        animation.frame_tags.append(cbp.FrameTag("idle", 3, 4))
+
+        # The first frame tag with the name is used, like a scan through the frame tags would
+        self.assertEqual(0, animation.get_frame_tag("idle").start_frame)
+
+    def test_renaming_an_earlier_frame_tag_to_a_duplicate_name(self) -> None:
+        animation = create_animation()
+        self.assertEqual(2, animation.get_frame_tag("attack").start_frame)
+
+        animation.frame_tags[0].name = "attack"
+
+        self.assertEqual(0, animation.get_frame_tag("attack").start_frame)
+
+    def test_frame_tag_index_is_not_a_field(self) -> None:
+        animation = create_animation()
+        animation.get_frame_tag("idle")
+
+        self.assertEqual(
+            ["frames", "frame_tags", "image"],
+            [field.name for field in dataclasses.fields(animation)],
+        )
+        self.assertNotIn("indices", repr(animation))
+
+        # Copies start out without an index
+        for copied in [pickle.loads(pickle.dumps(animation)), copy.copy(animation)]:
+            self.assertEqual(animation, copied)
+            self.assertEqual(2, copied.get_frame_tag("attack").start_frame)
+
+    def test_get_frame_boxes(self) -> None:
+        animation = create_animation()
+        expected = cbp.FrameArray.from_frames(FRAMES[2:5]).boxes
+
+        self.assertEqual(expected, animation.get_frame_boxes("attack"))
+
+        animation.frames = list(FRAMES)
+        self.assertEqual(expected, animation.get_frame_boxes("attack"))
+
+        animation.compact()
+        self.assertIsInstance(animation.frames, cbp.FrameArray)
+        self.assertEqual(FRAMES, animation.frames)
+
+    def test_dict_round_trip(self) -> None:
+        animation = create_animation()
+        d = animation.to_dict()
+
+        # "to" is written the same way that from_dict reads it, so the frame tags and the frames
+        # of each animation come back unchanged
+        self.assertEqual(
+            [{"name": "idle", "from": 0, "to": 2, "direction": "forward"}],
+            d["meta"]["frameTags"][:1],
+        )
+        self.assertEqual(animation, cbp.Animation.from_dict(d))
+        for name in animation:
+            self.assertEqual(
+                list(animation[name][1]),
+                list(cbp.Animation.from_dict(d)[name][1]),
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+import pathlib
+import tempfile
+import unittest
+
+import cbpickaxe as cbp
+from cbpickaxe.animation_cache import write_animation_json
+
+ANIMATION = cbp.Animation(
+    [cbp.Frame(cbp.Box(0, 0, 16, 16))], [cbp.FrameTag("idle", 0, 1)], "monster.png"
+)
+
+PATH = "res://sprites/monster.json"
+SOURCE = "res://.import/monster.json-1234.scn"
+
+
+class TestAnimationCache(unittest.TestCase):
+    def setUp(self) -> None:
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+
+        self.compiled_filepath = pathlib.Path(temp_dir.name) / "monster.json-1234.scn"
+        self.compiled_filepath.write_bytes(b"compiled")
+
+        self.cache = cbp.AnimationCache(pathlib.Path(temp_dir.name) / "cache")
+        self.cache.entries[PATH] = cbp.AnimationCacheEntry.from_source(
+            SOURCE, self.compiled_filepath
+        )
+        write_animation_json(ANIMATION, self.cache.get_filepath(PATH))
+
+    def test_get(self) -> None:
+        self.assertEqual(
+            ANIMATION, self.cache.get(PATH, SOURCE, self.compiled_filepath)
+        )
+
+    def test_get_from_different_source(self) -> None:
+        # Ex. the asset was imported again under a different compiled file
+        self.assertIsNone(
+            self.cache.get(
+                PATH, "res://.import/monster.json-5678.scn", self.compiled_filepath
+            )
+        )
+
+    def test_get_changed_source(self) -> None:
+        self.compiled_filepath.write_bytes(b"compiled again")
+
+        self.assertIsNone(self.cache.get(PATH, SOURCE, self.compiled_filepath))
+
+    def test_save_and_load(self) -> None:
+        self.cache.save()
+
+        loaded = cbp.AnimationCache.load(self.cache.directory)
+        self.assertEqual(self.cache.entries, loaded.entries)
+        self.assertEqual(ANIMATION, loaded.get(PATH, SOURCE, self.compiled_filepath))
+
+
+if __name__ == "__main__":
+    unittest.main()
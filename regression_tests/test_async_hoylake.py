@@ -0,0 +1,87 @@
+import asyncio
+import concurrent.futures
+import pickle
+import sys
+import unittest
+
+import cbpickaxe as cbp
+from cbpickaxe import async_hoylake
+
+from .util import rel_data
+
+MOVE_PATH = "res://mods/mod_with_monster_and_move/battle_moves/fire_spit.tres"
+
+
+class TestAsyncHoylake(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.hoylake = cbp.AsyncHoylake(
+            parse_executor=concurrent.futures.ThreadPoolExecutor(1)
+        )
+        await self.hoylake.load_root("mod", rel_data("mod_with_monster_and_move"))
+
+    async def asyncTearDown(self) -> None:
+        await self.hoylake.close()
+
+    async def test_concurrent_loads_share_one_parse(self) -> None:
+        results = await asyncio.gather(
+            *(self.hoylake.load_move(MOVE_PATH) for _ in range(0, 5))
+        )
+
+        self.assertEqual(1, len({id(move) for _, move in results}))
+        self.assertEqual(1, self.hoylake.hoylake.get_stats().files_parsed["Move"])
+
+    async def test_cancelling_one_load_does_not_cancel_the_others(self) -> None:
+        first = asyncio.ensure_future(self.hoylake.load_move(MOVE_PATH))
+        second = asyncio.ensure_future(self.hoylake.load_move(MOVE_PATH))
+
+        # Let both of them start waiting on the shared load
+        await asyncio.sleep(0)
+        first.cancel()
+
+        root_name, move = await second
+        self.assertEqual("mod", root_name)
+        self.assertEqual("MOVE_FIRE_SPIT_NAME", move.name)
+
+        with self.assertRaises(asyncio.CancelledError):
+            await first
+
+    async def test_parsed_resources_are_counted_and_interned(self) -> None:
+        _, move = await self.hoylake.load_move(MOVE_PATH)
+
+        stats = self.hoylake.hoylake.get_stats()
+        self.assertEqual(1, stats.files_parsed["Move"])
+        self.assertGreater(stats.bytes_read, 0)
+        self.assertIn("parse", stats.timings)
+
+        # The same fields are interned as when the Hoylake parses the file itself
+        move_filepath = rel_data(
+            "mod_with_monster_and_move/" + MOVE_PATH.removeprefix("res://")
+        )
+        with open(move_filepath, "r", encoding="utf-8") as input_stream:
+            parsed = cbp.Move.from_tres(input_stream)
+
+        self.assertIs(sys.intern("fire"), move.tags[0])
+        self.assertIs(parsed.category_name, move.category_name)
+        self.assertIsNot(parsed.name, move.name)
+
+        # Like a resource sent back from a worker process
+        unpickled = pickle.loads(pickle.dumps(move))
+        self.assertIsNot(move.tags[0], unpickled.tags[0])
+
+        async_hoylake._intern_shared(unpickled)
+        self.assertEqual(move, unpickled)
+        self.assertIs(move.tags[0], unpickled.tags[0])
+        self.assertIs(move.elemental_types[0], unpickled.elemental_types[0])
+        self.assertIsNot(move.name, unpickled.name)
+
+    async def test_load_animation(self) -> None:
+        with self.assertRaises(ValueError):
+            await self.hoylake.load_animation("res://sprites/missing.json")
+
+        # Failed loads are not kept around
+        with self.assertRaises(ValueError):
+            await self.hoylake.load_animation("res://sprites/missing.json")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,151 @@
+from typing import List
+
+import threading
+import unittest
+
+from cbpickaxe.cache import LRUCache
+
+
+class TestLRUCache(unittest.TestCase):
+    def test_evicts_least_recently_used(self) -> None:
+        cache: LRUCache[str, int] = LRUCache(max_entries=2)
+        cache["a"] = 1
+        cache["b"] = 2
+
+        # Using "a" makes "b" the least recently used entry
+        self.assertEqual(1, cache["a"])
+        cache["c"] = 3
+
+        self.assertEqual(["a", "c"], sorted(cache))
+        self.assertEqual(1, cache.info().evictions)
+
+        # Peeking does not count as using an entry
+        self.assertEqual(1, cache.peek("a"))
+        cache["d"] = 4
+
+        self.assertEqual(["c", "d"], sorted(cache))
+
+    def test_set_max_entries_evicts(self) -> None:
+        cache: LRUCache[str, int] = LRUCache()
+        for i, key in enumerate(["a", "b", "c", "d"]):
+            cache[key] = i
+
+        cache.set_max_entries(1)
+
+        self.assertEqual(["d"], list(cache))
+        self.assertEqual(3, cache.info().evictions)
+
+    def test_pinned_entries_are_not_evicted(self) -> None:
+        cache: LRUCache[str, int] = LRUCache(
+            max_entries=1, is_pinned=lambda key, _: key.startswith("pinned")
+        )
+        cache["pinned_a"] = 1
+        cache["pinned_b"] = 2
+        cache["c"] = 3
+        cache["d"] = 4
+
+        self.assertEqual(["d", "pinned_a", "pinned_b"], sorted(cache))
+
+        info = cache.info()
+        self.assertEqual(3, info.entries)
+        self.assertEqual(2, info.pinned_entries)
+        self.assertEqual(1, info.evictions)
+
+    def test_repin(self) -> None:
+        pinned = {"a"}
+        cache: LRUCache[str, int] = LRUCache(
+            max_entries=1, is_pinned=lambda key, _: key in pinned
+        )
+        cache["a"] = 1
+        cache["b"] = 2
+
+        pinned.clear()
+        pinned.add("b")
+        cache.repin()
+
+        # "a" is no longer pinned, so it now counts towards the limit
+        self.assertEqual(["a", "b"], sorted(cache))
+        self.assertEqual(1, cache.info().pinned_entries)
+
+        cache["c"] = 3
+        self.assertEqual(["b", "c"], sorted(cache))
+
+    def test_hits_and_misses(self) -> None:
+        cache: LRUCache[str, int] = LRUCache()
+        cache["a"] = 1
+
+        self.assertEqual(1, cache.get("a"))
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(5, cache.get("b", 5))
+
+        info = cache.info()
+        self.assertEqual(1, info.hits)
+        self.assertEqual(2, info.misses)
+
+    def test_pop(self) -> None:
+        cache: LRUCache[str, int] = LRUCache(is_pinned=lambda key, _: key == "a")
+        cache["a"] = 1
+        cache["b"] = 2
+
+        self.assertEqual(1, cache.pop("a"))
+        self.assertEqual(2, cache.pop("b", None))
+        self.assertIsNone(cache.pop("b", None))
+        with self.assertRaises(KeyError):
+            cache.pop("b")
+
+    def test_unlimited_hits_do_not_wait_on_the_lock(self) -> None:
+        unlimited: LRUCache[str, int] = LRUCache()
+        limited: LRUCache[str, int] = LRUCache(max_entries=2)
+        for cache in [unlimited, limited]:
+            cache["a"] = 1
+
+        results: List[int] = []
+
+        def look_up(cache: LRUCache[str, int]) -> None:
+            results.append(cache["a"])
+
+        for cache, expected in [(unlimited, [1]), (limited, [])]:
+            with self.subTest(max_entries=cache.max_entries):
+                results.clear()
+
+                # Hold the lock, as if another thread were changing the cache
+                lock: threading.Lock = getattr(cache, "_LRUCache__lock")
+                with lock:
+                    thread = threading.Thread(target=look_up, args=(cache,))
+                    thread.start()
+                    thread.join(timeout=0.2)
+
+                    self.assertEqual(expected, results)
+
+                thread.join()
+                self.assertEqual([1], results)
+
+    def test_threads(self) -> None:
+        cache: LRUCache[int, int] = LRUCache(
+            max_entries=8, is_pinned=lambda key, _: key % 10 == 0
+        )
+        errors: List[BaseException] = []
+
+        def work(offset: int) -> None:
+            try:
+                for i in range(0, 2000):
+                    key = (i * 7 + offset) % 50
+                    cache[key] = i
+                    cache.get((key + 1) % 50)
+                    cache.pop((key + 2) % 50, None)
+                    list(cache)
+            except BaseException as e:  # pylint: disable=broad-exception-caught
+                errors.append(e)
+
+        threads = [threading.Thread(target=work, args=(i,)) for i in range(0, 8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual([], errors)
+        self.assertLessEqual(cache.info().entries - cache.info().pinned_entries, 8)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,39 @@
+import unittest
+
+from cbpickaxe_scripts.generate_sprite_atlas import css_class_names
+
+
+class TestCssClassNames(unittest.TestCase):
+    def test_ascii_names(self) -> None:
+        self.assertEqual(
+            {"Traffikrab": "traffikrab", "Mr. Mime": "mr-mime", "Ni_Ni": "ni_ni"},
+            css_class_names(["Traffikrab", "Mr. Mime", "Ni_Ni"]),
+        )
+
+    def test_accents_are_removed(self) -> None:
+        self.assertEqual({"Pokémon": "pokemon"}, css_class_names(["Pokémon"]))
+
+    def test_names_without_usable_characters(self) -> None:
+        class_names = css_class_names(["ナガ", "トラフィクラブ", "???"])
+
+        self.assertEqual(3, len(set(class_names.values())))
+        for class_name in class_names.values():
+            self.assertRegex(class_name, r"^sprite-[0-9a-f]{8}$")
+
+        # The same name always gets the same class
+        self.assertEqual(class_names["ナガ"], css_class_names(["ナガ"])["ナガ"])
+
+    def test_shared_class_names_are_numbered(self) -> None:
+        self.assertEqual(
+            {
+                "Ni-Ni": "ni-ni",
+                "ni ni": "ni-ni-2",
+                "Ni-Ni-2": "ni-ni-2-2",
+                "NI!NI": "ni-ni-3",
+            },
+            css_class_names(["Ni-Ni", "ni ni", "Ni-Ni-2", "NI!NI"]),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,197 @@
+from typing import Any, Dict, List
+
+import json
+import os
+import pathlib
+import random
+import shutil
+import tempfile
+import threading
+import unittest
+
+import cbpickaxe as cbp
+
+from .util import rel_data
+
+MOVE_PATH = "res://mods/mod_with_monster_and_move/battle_moves/fire_spit.tres"
+
+ANIMATION = cbp.Animation(
+    cbp.FrameArray.from_frames(
+        [cbp.Frame(cbp.Box(0, 0, 16, 16)), cbp.Frame(cbp.Box(16, 0, 16, 16))]
+    ),
+    [cbp.FrameTag("idle", 0, 2)],
+    "monster.png",
+)
+
+
+class TestHoylake(unittest.TestCase):
+    def setUp(self) -> None:
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+
+        self.root = pathlib.Path(temp_dir.name) / "root"
+
+        sprites_dir = self.root / "sprites"
+        sprites_dir.mkdir(parents=True)
+        with open(sprites_dir / "monster.json", "w", encoding="utf-8") as output_stream:
+            json.dump(ANIMATION.to_dict(), output_stream)
+
+        # An imported asset, which only needs to be looked at for animations without JSON files
+        (sprites_dir / "other.json.import").write_text(
+            '[remap]\n\nimporter="scene"\npath="res://.import/other.json-1234.scn"\n'
+        )
+
+    def test_load_json_animation_without_reading_import_files(self) -> None:
+        hoylake = cbp.Hoylake()
+        hoylake.load_root("root", self.root)
+
+        animation = hoylake.load_animation("res://sprites/monster.json")
+
+        self.assertEqual(ANIMATION, animation)
+        self.assertNotIn("import_paths", hoylake.get_stats().timings)
+
+    def test_load_missing_animation(self) -> None:
+        hoylake = cbp.Hoylake()
+        hoylake.load_root("root", self.root)
+
+        with self.assertRaises(ValueError):
+            hoylake.load_animation("res://sprites/missing.json")
+        self.assertNotIn("import_paths", hoylake.get_stats().timings)
+
+        # The compiled file that the import file points to does not exist
+        with self.assertRaises(ValueError):
+            hoylake.load_animation("res://sprites/other.json")
+        self.assertIn("import_paths", hoylake.get_stats().timings)
+
+
+class TestThreadSafe(unittest.TestCase):
+    def setUp(self) -> None:
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+
+        self.root = pathlib.Path(temp_dir.name) / "root"
+        shutil.copytree(rel_data("mod_with_monster_and_move"), self.root)
+
+        move_filepath = self.root / MOVE_PATH.removeprefix("res://")
+        self.move_paths = [MOVE_PATH]
+        for i in range(0, 7):
+            shutil.copy(move_filepath, move_filepath.with_name(f"move_{i}.tres"))
+            self.move_paths.append(MOVE_PATH.replace("fire_spit", f"move_{i}"))
+
+        sprites_dir = self.root / "sprites"
+        sprites_dir.mkdir()
+        with open(sprites_dir / "monster.json", "w", encoding="utf-8") as output_stream:
+            json.dump(ANIMATION.to_dict(), output_stream)
+
+    def test_each_file_is_parsed_once(self) -> None:
+        hoylake = cbp.Hoylake(thread_safe=True)
+        hoylake.load_root("mod", self.root)
+
+        num_threads = 16
+        barrier = threading.Barrier(num_threads)
+        results: List[Dict[str, Any]] = []
+        errors: List[BaseException] = []
+
+        def load(seed: int) -> None:
+            paths = list(self.move_paths)
+            random.Random(seed).shuffle(paths)
+
+            try:
+                # Start all of the threads at once, so that they race for the same files
+                barrier.wait()
+
+                loaded: Dict[str, Any] = {
+                    path: hoylake.load_move(path)[1] for path in paths
+                }
+                loaded["animation"] = hoylake.load_animation(
+                    "res://sprites/monster.json"
+                )
+                results.append(loaded)
+            except BaseException as e:  # pylint: disable=broad-exception-caught
+                errors.append(e)
+
+        threads = [
+            threading.Thread(target=load, args=(i,)) for i in range(0, num_threads)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual([], errors)
+        self.assertEqual(num_threads, len(results))
+
+        # Every thread got the same objects
+        for key, value in results[0].items():
+            for result in results[1:]:
+                self.assertIs(value, result[key])
+
+        stats = hoylake.get_stats()
+        self.assertEqual(len(self.move_paths), stats.files_parsed["Move"])
+        self.assertEqual(1, stats.files_parsed["Animation"])
+
+
+class TestSnapshot(unittest.TestCase):
+    def setUp(self) -> None:
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+
+        self.root = pathlib.Path(temp_dir.name) / "root"
+        shutil.copytree(rel_data("mod_with_monster_and_move"), self.root)
+
+        self.snapshot = pathlib.Path(temp_dir.name) / "hoylake.snapshot"
+
+        self.hoylake = cbp.Hoylake()
+        self.hoylake.load_root("mod", self.root)
+        self.hoylake.load_move(MOVE_PATH)
+        self.hoylake.save_snapshot(self.snapshot)
+
+    def test_round_trip(self) -> None:
+        restored = cbp.Hoylake.from_snapshot(self.snapshot)
+
+        self.assertEqual(self.hoylake.get_roots(), restored.get_roots())
+        self.assertEqual(
+            self.hoylake.get_loaded(cbp.Move, MOVE_PATH),
+            restored.get_loaded(cbp.Move, MOVE_PATH),
+        )
+        self.assertEqual(
+            self.hoylake.translate("MOVE_FIRE_SPIT_NAME"),
+            restored.translate("MOVE_FIRE_SPIT_NAME"),
+        )
+
+    def test_modified_file(self) -> None:
+        move_filepath = self.root / MOVE_PATH.removeprefix("res://")
+        stat = move_filepath.stat()
+        os.utime(move_filepath, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        with self.assertRaisesRegex(ValueError, "fire_spit.tres"):
+            cbp.Hoylake.from_snapshot(self.snapshot)
+
+        # Still usable if the caller does not want it checked
+        restored = cbp.Hoylake.from_snapshot(self.snapshot, validate=False)
+        self.assertIsNotNone(restored.get_loaded(cbp.Move, MOVE_PATH))
+
+    def test_added_file(self) -> None:
+        move_filepath = self.root / MOVE_PATH.removeprefix("res://")
+        shutil.copy(move_filepath, move_filepath.with_name("new_move.tres"))
+
+        with self.assertRaisesRegex(ValueError, "new_move.tres"):
+            cbp.Hoylake.from_snapshot(self.snapshot)
+
+    def test_added_translation_file(self) -> None:
+        (translation_filepath,) = self.root.glob("**/*.translation")
+        shutil.copy(
+            translation_filepath, translation_filepath.with_name("new.translation")
+        )
+
+        with self.assertRaisesRegex(ValueError, "new.translation"):
+            cbp.Hoylake.from_snapshot(self.snapshot)
+
+    def test_unrelated_file(self) -> None:
+        (self.root / "notes.txt").write_text("Not loaded by Hoylake")
+
+        cbp.Hoylake.from_snapshot(self.snapshot)
+
+
+if __name__ == "__main__":
+    unittest.main()
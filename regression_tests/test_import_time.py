@@ -0,0 +1,73 @@
+from typing import List, Tuple
+
+import subprocess
+import sys
+import unittest
+
+# Modules that are slow to import, and so should only be imported when they are needed
+SLOW_MODULES = ["asyncio", "godot_parser", "jinja2", "numpy", "PIL"]
+
+# Generous limit on the time to import cbpickaxe itself, so that the test is not flaky
+MAX_IMPORT_MICROSECONDS = 100_000
+
+
+def run_import(statements: str) -> Tuple[List[str], int]:
+    """
+    Runs the given import statements in a fresh Python process. Returns the slow modules that
+    were imported, and the total time in microseconds that it took to import cbpickaxe.
+    """
+    completed = subprocess.run(
+        [
+            sys.executable,
+            "-X",
+            "importtime",
+            "-c",
+            f"import sys; {statements}; print(' '.join(m for m in {SLOW_MODULES!r} if m in sys.modules))",
+        ],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+
+    cumulative_microseconds = 0
+    for line in completed.stderr.splitlines():
+        parts = [part.strip() for part in line.removeprefix("import time:").split("|")]
+        if len(parts) == 3 and parts[2] == "cbpickaxe":
+            cumulative_microseconds = int(parts[1])
+
+    return completed.stdout.split(), cumulative_microseconds
+
+
+class TestImportTime(unittest.TestCase):
+    def test_import_cbpickaxe(self) -> None:
+        slow_modules, microseconds = run_import("import cbpickaxe")
+
+        self.assertEqual([], slow_modules)
+        self.assertLess(microseconds, MAX_IMPORT_MICROSECONDS)
+
+    def test_import_translation_table(self) -> None:
+        slow_modules, _ = run_import("import cbpickaxe; cbpickaxe.TranslationTable")
+
+        self.assertEqual([], slow_modules)
+
+    def test_import_extract_translation_script(self) -> None:
+        slow_modules, _ = run_import(
+            "import cbpickaxe_scripts; cbpickaxe_scripts.extract_translation_main"
+        )
+
+        self.assertEqual([], slow_modules)
+
+    def test_import_client(self) -> None:
+        slow_modules, _ = run_import("import cbpickaxe; cbpickaxe.HoylakeClient")
+
+        self.assertEqual([], slow_modules)
+
+    def test_import_hoylake(self) -> None:
+        slow_modules, _ = run_import("import cbpickaxe; cbpickaxe.Hoylake")
+
+        self.assertNotIn("jinja2", slow_modules)
+        self.assertNotIn("asyncio", slow_modules)
+
+
+if __name__ == "__main__":
+    unittest.main()
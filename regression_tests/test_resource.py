@@ -0,0 +1,186 @@
+from typing import Any, List, Literal
+
+import io
+import math
+import pathlib
+import struct
+import sys
+import unittest
+
+from cbpickaxe.misc_types import (
+    AABB,
+    Basis,
+    Color,
+    Plane,
+    Quat,
+    Rect2,
+    Transform,
+    Transform2D,
+    Vector2,
+    Vector3,
+)
+from cbpickaxe.resource import (
+    ExternalResource,
+    ExternalResourceIndex,
+    InternalResourceIndex,
+    NodePath,
+    read_variant,
+    skip_variant,
+)
+
+# The writer lives with the benchmarks, which are scripts rather than a package
+sys.path.append(str(pathlib.Path(__file__).parent.parent / "benchmarks"))
+
+# pylint: disable-next=wrong-import-position
+import godot_writer
+
+ENDIANS: List[Literal["big", "little"]] = ["little", "big"]
+
+BASIS = Basis((Vector3(1.0, 0.0, 0.0), Vector3(0.0, 0.5, -2.0), Vector3(0.0, 3.0, 1.0)))
+
+# Each value to write, along with the value that it should be read back in as. Strings are read
+# in along with their null terminators.
+ROUND_TRIPS: List[tuple[Any, Any]] = [
+    (None, None),
+    (True, True),
+    (False, False),
+    (0, 0),
+    (-7, -7),
+    (2**31 - 1, 2**31 - 1),
+    (2**40, 2**40),
+    (-(2**40), -(2**40)),
+    (1.5, 1.5),
+    (-0.25, -0.25),
+    ("héllo", "héllo\x00"),
+    (b"", b""),
+    (b"abcde", b"abcde"),
+    (b"abcd", b"abcd"),
+    (Vector2(1.0, -2.0), Vector2(1.0, -2.0)),
+    (
+        Rect2(Vector2(1.0, 2.0), Vector2(3.0, 4.0)),
+        Rect2(Vector2(1.0, 2.0), Vector2(3.0, 4.0)),
+    ),
+    (Vector3(1.0, 2.0, 3.0), Vector3(1.0, 2.0, 3.0)),
+    (Plane(Vector3(0.0, 1.0, 0.0), 2.5), Plane(Vector3(0.0, 1.0, 0.0), 2.5)),
+    (Quat(0.0, 0.5, 0.0, 1.0), Quat(0.0, 0.5, 0.0, 1.0)),
+    (
+        AABB(Vector3(1.0, 2.0, 3.0), Vector3(4.0, 5.0, 6.0)),
+        AABB(Vector3(1.0, 2.0, 3.0), Vector3(4.0, 5.0, 6.0)),
+    ),
+    (BASIS, BASIS),
+    (
+        Transform(BASIS, Vector3(7.0, 8.0, 9.0)),
+        Transform(BASIS, Vector3(7.0, 8.0, 9.0)),
+    ),
+    (
+        Transform2D(Vector2(1.0, 0.0), Vector2(0.0, 1.0), Vector2(5.0, 6.0)),
+        Transform2D(Vector2(1.0, 0.0), Vector2(0.0, 1.0), Vector2(5.0, 6.0)),
+    ),
+    (Color(0.5, 0.25, 1.0, 0.0), Color(0.5, 0.25, 1.0, 0.0)),
+    (
+        NodePath(["Sprite", "Body"], ["region_rect"]),
+        NodePath(["Sprite\x00", "Body\x00"], ["region_rect\x00"]),
+    ),
+    (NodePath(["root"], [], True), NodePath(["root\x00"], [], True)),
+    (
+        ExternalResource("Texture", "res://a.png"),
+        ExternalResource("Texture\x00", "res://a.png\x00"),
+    ),
+    (ExternalResourceIndex(3), ExternalResourceIndex(3)),
+    (InternalResourceIndex(4), InternalResourceIndex(4)),
+    (godot_writer.Int32Array([-1, 0, 2**31 - 1]), [-1, 0, 2**31 - 1]),
+    (godot_writer.Int32Array([]), []),
+    (godot_writer.RealArray([0.5, -1.5]), [0.5, -1.5]),
+    (godot_writer.StringArray(["x", "yy"]), ["x\x00", "yy\x00"]),
+    (
+        godot_writer.Vector2Array([Vector2(1.0, 2.0), Vector2(3.0, 4.0)]),
+        [Vector2(1.0, 2.0), Vector2(3.0, 4.0)],
+    ),
+    (godot_writer.Vector3Array([Vector3(1.0, 2.0, 3.0)]), [Vector3(1.0, 2.0, 3.0)]),
+    (
+        godot_writer.ColorArray([Color(1.0, 0.0, 0.0, 1.0)]),
+        [Color(1.0, 0.0, 0.0, 1.0)],
+    ),
+    (
+        {"key": [1, "two", {"nested": None}]},
+        {"key\x00": [1, "two\x00", {"nested\x00": None}]},
+    ),
+    ([1, [2.0, [True]]], [1, [2.0, [True]]]),
+]
+
+
+def read_all(
+    data: bytes, endian: Literal["big", "little"], string_map: List[str]
+) -> List[Any]:
+    input_stream = io.BytesIO(data)
+
+    values = []
+    while input_stream.tell() < len(data):
+        values.append(read_variant(input_stream, endian, string_map))
+
+    return values
+
+
+class TestReadVariant(unittest.TestCase):
+    def test_round_trip(self) -> None:
+        for endian in ENDIANS:
+            for written, expected in ROUND_TRIPS:
+                with self.subTest(endian=endian, value=written):
+                    data, string_map = godot_writer.write_variants([written], endian)
+
+                    self.assertEqual([expected], read_all(data, endian, string_map))
+
+    def test_round_trip_all_at_once(self) -> None:
+        for endian in ENDIANS:
+            data, string_map = godot_writer.write_variants(
+                [written for written, _ in ROUND_TRIPS], endian
+            )
+
+            self.assertEqual(
+                [expected for _, expected in ROUND_TRIPS],
+                read_all(data, endian, string_map),
+            )
+
+    def test_skip_variant(self) -> None:
+        for endian in ENDIANS:
+            for written, _ in ROUND_TRIPS:
+                with self.subTest(endian=endian, value=written):
+                    data, _ = godot_writer.write_variants([written, 12345], endian)
+
+                    input_stream = io.BytesIO(data)
+                    skip_variant(input_stream, endian)
+
+                    self.assertEqual(12345, read_variant(input_stream, endian, []))
+
+    def test_inline_node_path_names(self) -> None:
+        node_path = NodePath(["Sprite", "Body"], ["region_rect"])
+        for endian in ENDIANS:
+            with self.subTest(endian=endian):
+                data, string_map = godot_writer.write_variants(
+                    [node_path, 5], endian, inline_strings=True
+                )
+                self.assertEqual([], string_map)
+
+                self.assertEqual(
+                    [NodePath(["Sprite\x00", "Body\x00"], ["region_rect\x00"]), 5],
+                    read_all(data, endian, string_map),
+                )
+
+                input_stream = io.BytesIO(data)
+                skip_variant(input_stream, endian)
+                self.assertEqual(5, read_variant(input_stream, endian, string_map))
+
+    def test_double(self) -> None:
+        for endian in ENDIANS:
+            prefix = "<" if endian == "little" else ">"
+            data = struct.pack(prefix + "Id", 41, math.pi)
+
+            self.assertEqual([math.pi], read_all(data, endian, []))
+
+    def test_unknown_type(self) -> None:
+        with self.assertRaises(NotImplementedError):
+            read_variant(io.BytesIO(b"\xff\x00\x00\x00"), "little", [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,172 @@
+from typing import Any, Callable, List
+
+import os
+import pathlib
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+import unittest.mock
+
+import cbpickaxe as cbp
+from cbpickaxe import server
+
+from .util import rel_data
+
+MOVE_PATH = "res://mods/mod_with_monster_and_move/battle_moves/fire_spit.tres"
+
+
+class TestServer(unittest.TestCase):
+    def setUp(self) -> None:
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+
+        self.root = pathlib.Path(temp_dir.name) / "root"
+        shutil.copytree(rel_data("mod_with_monster_and_move"), self.root)
+
+        # A file outside of the root, which queries should not be able to read
+        self.secret = pathlib.Path(temp_dir.name) / "secret.tres"
+        shutil.copy(self.root / MOVE_PATH.removeprefix("res://"), self.secret)
+
+        self.hoylake = cbp.Hoylake(thread_safe=True)
+        self.hoylake.load_root("mod", self.root)
+
+        self.server = cbp.create_server(cbp.QueryHandler(self.hoylake), "127.0.0.1:0")
+        thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+        port = getattr(self.server, "server_address")[1]
+        self.client = cbp.HoylakeClient(f"127.0.0.1:{port}", timeout=10.0)
+        self.addCleanup(self.client.close)
+
+    def count_calls(self, name: str) -> List[int]:
+        calls = [0]
+        original: Callable[..., Any] = getattr(self.hoylake, name)
+
+        def counted(*args: Any, **kwargs: Any) -> Any:
+            calls[0] += 1
+            return original(*args, **kwargs)
+
+        setattr(self.hoylake, name, counted)
+        return calls
+
+    def test_load(self) -> None:
+        root_name, move = self.client.load("move", MOVE_PATH)
+
+        self.assertEqual("mod", root_name)
+        self.assertEqual("MOVE_FIRE_SPIT_NAME", move["name"])
+
+    def test_preload(self) -> None:
+        moves_path = "res://mods/mod_with_monster_and_move/battle_moves"
+
+        self.assertEqual(1, self.client.preload("move", moves_path))
+        self.assertIsNotNone(self.hoylake.get_loaded(cbp.Move, MOVE_PATH))
+
+    def test_load_all_fields(self) -> None:
+        moves_path = "res://mods/mod_with_monster_and_move/battle_moves"
+
+        moves = self.client.load_all("move", moves_path, fields=["name", "tags"])
+        _, move = moves[MOVE_PATH]
+        self.assertEqual(["name", "tags"], sorted(move))
+        self.assertEqual("MOVE_FIRE_SPIT_NAME", move["name"])
+
+        with self.assertRaisesRegex(ValueError, "Unknown fields: missing"):
+            self.client.load_all("move", moves_path, fields=["name", "missing"])
+
+    def test_paths_outside_of_roots_are_rejected(self) -> None:
+        calls = self.count_calls("load_move")
+
+        for path in [
+            "res://../secret.tres",
+            "res://mods/../../secret.tres",
+            f"res://{self.secret}",
+            "res://..\\secret.tres",
+        ]:
+            with self.assertRaises(ValueError):
+                self.client.load("move", path)
+            with self.assertRaises(ValueError):
+                self.client.load_all("move", path)
+            with self.assertRaises(ValueError):
+                self.client.is_compatible(path, path)
+
+        self.assertEqual(0, calls[0])
+
+    def test_symlinks_outside_of_roots_are_rejected(self) -> None:
+        try:
+            os.symlink(self.secret.parent, self.root / "link")
+        except OSError:
+            self.skipTest("Symlinks are not supported")
+
+        with self.assertRaises(ValueError):
+            self.client.load("move", "res://link/secret.tres")
+
+    def test_failing_queries_return_errors(self) -> None:
+        (self.root / "mods" / "broken.tres").write_text("[resource\nname = ")
+
+        with self.assertRaises(ValueError):
+            self.client.load("move", "res://mods/broken.tres")
+        with self.assertRaises(ValueError):
+            self.client.query("monster_forms_by_tags", tags=5)
+        with self.assertRaises(ValueError):
+            self.client.query(["unhashable"])  # type: ignore[arg-type]
+        with self.assertRaises(ValueError):
+            self.client.query("load", type=["move"], path=MOVE_PATH)
+
+        # The connection is still usable afterwards
+        self.assertEqual("mod", self.client.load("move", MOVE_PATH)[0])
+
+    def test_failing_queries_are_not_retried(self) -> None:
+        calls = self.count_calls("get_monster_forms_by_tags")
+
+        with self.assertRaises(ValueError):
+            self.client.query("monster_forms_by_tags", tags=5)
+
+        self.assertEqual(1, calls[0])
+
+    def test_reconnects_after_idle_connection_is_closed(self) -> None:
+        calls = self.count_calls("translate")
+
+        with unittest.mock.patch.object(server._RequestHandler, "timeout", 0.2):
+            self.client.translate_many(["MOVE_FIRE_SPIT_NAME"])
+
+            # Wait for the server to close the idle connection
+            time.sleep(1.0)
+
+            self.client.translate_many(["MOVE_FIRE_SPIT_NAME"])
+
+        self.assertEqual(2, calls[0])
+
+
+class TestUnixSocketsNotSupported(unittest.TestCase):
+    def test_unix_addresses_are_rejected(self) -> None:
+        hoylake = cbp.Hoylake(thread_safe=True)
+
+        with unittest.mock.patch.object(server, "_UNIX_SOCKETS_SUPPORTED", False):
+            with self.assertRaisesRegex(ValueError, "not supported"):
+                cbp.create_server(cbp.QueryHandler(hoylake), "unix:cbpickaxe.sock")
+            with self.assertRaisesRegex(ValueError, "not supported"):
+                cbp.HoylakeClient("unix:cbpickaxe.sock")
+
+
+class TestParseHostAndPort(unittest.TestCase):
+    def test_parse(self) -> None:
+        self.assertEqual(("127.0.0.1", 8765), server._parse_host_and_port("8765"))
+        self.assertEqual(
+            ("localhost", 9000), server._parse_host_and_port("localhost:9000")
+        )
+        self.assertEqual(
+            ("localhost", 9000), server._parse_host_and_port("http://localhost:9000/")
+        )
+        self.assertEqual(
+            ("localhost", server.DEFAULT_PORT), server._parse_host_and_port("localhost")
+        )
+        self.assertEqual(
+            ("127.0.0.1", server.DEFAULT_PORT), server._parse_host_and_port("")
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
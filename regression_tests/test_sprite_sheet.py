@@ -0,0 +1,116 @@
+import unittest
+
+import numpy as np
+import PIL.Image
+
+import cbpickaxe as cbp
+
+WIDTH = 8
+HEIGHT = 6
+
+
+def create_sheet() -> PIL.Image.Image:
+    # Every pixel has a different color, and only the pixels in column 2 to 4 and row 1 to 2 are
+    # not transparent
+    pixels = np.zeros((HEIGHT, WIDTH, 4), dtype=np.uint8)
+    pixels[:, :, 0] = np.arange(WIDTH)[np.newaxis, :] * 10
+    pixels[:, :, 1] = np.arange(HEIGHT)[:, np.newaxis] * 10
+    pixels[1:3, 2:5, 3] = 255
+
+    return PIL.Image.fromarray(pixels, "RGBA")
+
+
+class TestExtractFrames(unittest.TestCase):
+    def test_matches_crop(self) -> None:
+        sheet = create_sheet()
+        pixels = cbp.to_rgba_array(sheet)
+
+        for box in [
+            (0, 0, WIDTH, HEIGHT),
+            (2, 1, 3, 2),
+            (WIDTH - 3, HEIGHT - 2, 3, 2),
+            (-2, -1, 4, 3),
+            (WIDTH - 2, HEIGHT - 1, 4, 3),
+            (-1, -1, WIDTH + 2, HEIGHT + 2),
+            (WIDTH, HEIGHT, 2, 2),
+            (-5, 0, 3, 3),
+        ]:
+            with self.subTest(box=box):
+                x, y, width, height = box
+                (frame,) = cbp.extract_frames(pixels, box)
+
+                expected = np.asarray(sheet.crop((x, y, x + width, y + height)))
+                self.assertEqual((height, width, 4), frame.shape)
+                np.testing.assert_array_equal(expected, frame)
+
+    def test_frames_within_sheet_are_views(self) -> None:
+        pixels = cbp.to_rgba_array(create_sheet())
+
+        inside, outside = cbp.extract_frames(pixels, [1, 1, 2, 2, -1, 0, 2, 2])
+
+        self.assertTrue(np.shares_memory(pixels, inside))
+        self.assertFalse(np.shares_memory(pixels, outside))
+
+    def test_no_boxes(self) -> None:
+        pixels = cbp.to_rgba_array(create_sheet())
+
+        self.assertEqual([], cbp.extract_frames(pixels, []))
+
+
+class TestGetUnionAlphaBbox(unittest.TestCase):
+    def test_union(self) -> None:
+        first = np.zeros((4, 4, 4), dtype=np.uint8)
+        first[1, 1, 3] = 255
+        second = np.zeros((4, 4, 4), dtype=np.uint8)
+        second[2, 3, 3] = 1
+
+        self.assertEqual((1, 1, 4, 3), cbp.get_union_alpha_bbox([first, second]))
+
+    def test_matches_getbbox(self) -> None:
+        sheet = create_sheet()
+        pixels = cbp.to_rgba_array(sheet)
+
+        self.assertEqual(
+            sheet.getchannel("A").getbbox(), cbp.get_union_alpha_bbox([pixels])
+        )
+
+    def test_fully_transparent(self) -> None:
+        transparent = np.zeros((4, 4, 4), dtype=np.uint8)
+
+        # Color without any alpha does not count
+        transparent[:, :, :3] = 255
+
+        self.assertIsNone(cbp.get_union_alpha_bbox([]))
+        self.assertIsNone(cbp.get_union_alpha_bbox([transparent]))
+        self.assertIsNone(cbp.get_union_alpha_bbox([transparent, transparent.copy()]))
+
+        opaque = np.zeros((4, 4, 4), dtype=np.uint8)
+        opaque[0, 3, 3] = 255
+        self.assertEqual((3, 0, 4, 1), cbp.get_union_alpha_bbox([transparent, opaque]))
+
+    def test_frames_outside_of_sheet(self) -> None:
+        pixels = cbp.to_rgba_array(create_sheet())
+
+        # Frames that only cover the transparent edges of the sheet, or lie entirely past it
+        frames = cbp.extract_frames(
+            pixels, [0, 3, WIDTH, 3, WIDTH, 0, 4, 4, -4, -4, 4, 4]
+        )
+        self.assertIsNone(cbp.get_union_alpha_bbox(frames))
+
+        # Frames that hang off the edge of the sheet
+        frames = cbp.extract_frames(pixels, [-1, -1, 4, 4, 3, 0, 6, 4])
+        self.assertEqual((0, 1, 4, 4), cbp.get_union_alpha_bbox(frames))
+
+    def test_frames_of_different_sizes(self) -> None:
+        small = np.zeros((2, 2, 4), dtype=np.uint8)
+        small[1, 0, 3] = 255
+        large = np.zeros((4, 4, 4), dtype=np.uint8)
+        large[0, 1, 3] = 255
+
+        # Relative to the first frame, ignoring the parts of later frames outside of it
+        large[3, 3, 3] = 255
+        self.assertEqual((0, 0, 2, 2), cbp.get_union_alpha_bbox([small, large]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,134 @@
+import os
+import pathlib
+import shutil
+import tempfile
+import unittest
+import unittest.mock
+
+import cbpickaxe as cbp
+
+from .util import rel_data
+
+TRANSLATION_PATH = (
+    "res://mods/mod_with_monster_and_move/translations/mod_keys.en.translation"
+)
+
+# An hour ago, so that the directories are not listed again just for having been changed recently
+PAST_NS = 3600 * 10**9
+
+
+def make_old(directory: pathlib.Path) -> None:
+    for dirpath, _, _ in os.walk(directory):
+        stat = os.stat(dirpath)
+        os.utime(dirpath, ns=(stat.st_atime_ns, stat.st_mtime_ns - PAST_NS))
+
+
+class TestFileWatcher(unittest.TestCase):
+    def setUp(self) -> None:
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+
+        self.directory = pathlib.Path(temp_dir.name) / "watched"
+        (self.directory / "data" / "moves").mkdir(parents=True)
+        (self.directory / "output").mkdir()
+        (self.directory / ".git").mkdir()
+
+        self.move = self.directory / "data" / "moves" / "move.tres"
+        self.move.write_text("first")
+
+        make_old(self.directory)
+
+        self.watcher = cbp.FileWatcher(
+            [self.directory], ignored_directories=[self.directory / "output"]
+        )
+
+    def test_no_changes(self) -> None:
+        with unittest.mock.patch(
+            "cbpickaxe.watcher.os.scandir", wraps=os.scandir
+        ) as scandir:
+            self.assertEqual([], self.watcher.poll())
+
+        # None of the directories needed to be listed again
+        self.assertEqual(0, scandir.call_count)
+
+    def test_changed_in_place(self) -> None:
+        self.move.write_text("second!")
+        make_old(self.directory)
+
+        self.assertEqual([self.move], self.watcher.poll())
+        self.assertEqual([], self.watcher.poll())
+
+    def test_added_and_removed(self) -> None:
+        added = self.move.with_name("added.tres")
+        added.write_text("added")
+
+        with unittest.mock.patch(
+            "cbpickaxe.watcher.os.scandir", wraps=os.scandir
+        ) as scandir:
+            self.assertEqual([added], self.watcher.poll())
+
+        # Only the directory that the file was added to was listed again
+        self.assertEqual(1, scandir.call_count)
+
+        self.move.unlink()
+        self.assertEqual([self.move], self.watcher.poll())
+
+    def test_added_directory(self) -> None:
+        new_directory = self.directory / "data" / "items"
+        new_directory.mkdir()
+        (new_directory / "item.tres").write_text("item")
+
+        self.assertEqual([new_directory / "item.tres"], self.watcher.poll())
+
+        shutil.rmtree(new_directory)
+        self.assertEqual([new_directory / "item.tres"], self.watcher.poll())
+
+    def test_ignored_directories(self) -> None:
+        (self.directory / "output" / "index.html").write_text("output")
+        (self.directory / ".git" / "HEAD").write_text("head")
+
+        self.assertEqual([], self.watcher.poll())
+
+
+class TestRootWatcher(unittest.TestCase):
+    def setUp(self) -> None:
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+
+        self.base = pathlib.Path(temp_dir.name) / "base"
+        self.mod = pathlib.Path(temp_dir.name) / "mod"
+        shutil.copytree(rel_data("mod_with_monster_and_move"), self.base)
+        shutil.copytree(rel_data("mod_with_monster_and_move"), self.mod)
+
+        self.hoylake = cbp.Hoylake()
+        self.hoylake.load_root("base", self.base)
+        self.hoylake.load_root("mod", self.mod)
+
+    def test_changed_translation_only_reloads_its_root(self) -> None:
+        watcher = cbp.RootWatcher(self.hoylake, ["mod"])
+        num_parsed = self.hoylake.get_stats().files_parsed["TranslationTable"]
+
+        translation_filepath = self.mod / TRANSLATION_PATH.removeprefix("res://")
+        stat = translation_filepath.stat()
+        os.utime(
+            translation_filepath, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9)
+        )
+
+        self.assertEqual([TRANSLATION_PATH], watcher.poll())
+        self.assertEqual(
+            num_parsed + 1,
+            self.hoylake.get_stats().files_parsed["TranslationTable"],
+        )
+        self.assertEqual("Fire Spit", self.hoylake.translate("MOVE_FIRE_SPIT_NAME"))
+
+    def test_removed_translation(self) -> None:
+        (self.base / TRANSLATION_PATH.removeprefix("res://")).unlink()
+        (self.mod / TRANSLATION_PATH.removeprefix("res://")).unlink()
+
+        self.hoylake.invalidate(TRANSLATION_PATH)
+
+        self.assertEqual(set(), self.hoylake.get_locales())
+
+
+if __name__ == "__main__":
+    unittest.main()